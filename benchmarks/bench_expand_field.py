@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Benchmark field expansion dispatch.
+
+Times :func:`unihan_etl.expansion.expand_field` against the dispatch it
+replaced, which looked up ``expand_<field>`` with :func:`eval` and recompiled
+each expander's regular expressions on every call, over the field values of the
+bundled quick dataset.
+
+Run from the repository root::
+
+    $ uv run python benchmarks/bench_expand_field.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+import typing as t
+
+from unihan_etl import core, expansion
+from unihan_etl.constants import (
+    INDEX_FIELDS,
+    SPACE_DELIMITED_FIELDS,
+    UNIHAN_FIELDS,
+)
+from unihan_etl.pytest_plugin import QUICK_FIXTURE_PATH
+
+if t.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def legacy_expand_field(field: str, fvalue: str | list[str]) -> t.Any:
+    """Expand a field the way expand_field did before the registry."""
+    if field in SPACE_DELIMITED_FIELDS and fvalue:
+        assert isinstance(fvalue, str)
+        fvalue = fvalue.split(" ")
+
+    try:
+        expansion_func = eval(f"expand_{field}", vars(expansion))
+    except NameError:
+        return fvalue
+    # Each expander compiled its patterns per call, served by the re cache.
+    for pattern in _LEGACY_PATTERNS.get(field, ()):
+        re.compile(pattern.pattern, pattern.flags)
+    return expansion_func(fvalue)
+
+
+#: The module-level patterns of each field's expander, per the
+#: ``_<FIELD>_*PATTERN`` naming. Shared expanders, such as kIRG_GSource's,
+#: aren't matched, which understates the legacy cost.
+_LEGACY_PATTERNS: dict[str, list[re.Pattern[str]]] = {
+    field: [
+        value
+        for name, value in vars(expansion).items()
+        if name.startswith(f"_{field.upper()}_") and isinstance(value, re.Pattern)
+    ]
+    for field in UNIHAN_FIELDS
+}
+
+
+def load_values() -> list[tuple[str, str]]:
+    """Return the (field, value) pairs of the quick dataset."""
+    files = sorted(QUICK_FIXTURE_PATH.glob("Unihan*.txt"))
+    fields = (*INDEX_FIELDS, *UNIHAN_FIELDS)
+    return [
+        (field, value)
+        for record in core.stream_normalize(core.load_data_streams(files), fields)
+        for field, value in record.items()
+        if value and field in UNIHAN_FIELDS
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print the per-call time of each dispatch."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    values = load_values()
+
+    dispatchers: list[tuple[str, t.Callable[[str, str], t.Any]]] = [
+        ("eval dispatch", legacy_expand_field),
+        ("EXPANDERS registry", expansion.expand_field),
+    ]
+    for name, fn in dispatchers:
+
+        def run(fn: t.Callable[[str, str], t.Any] = fn) -> None:
+            for field, value in values:
+                fn(field, value)
+
+        seconds = min(timeit.repeat(run, number=args.number, repeat=3))
+        per_call = seconds / (args.number * len(values)) * 1e9
+        print(f"{name:>20}: {per_call:8.1f} ns/call ({len(values)} values)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Benchmark expanding records through an expansion memo.
+
+Times :func:`unihan_etl.core.expand_record` with and without an
+:class:`unihan_etl.expansion.ExpansionMemo`, over the records of the
+downloaded UNIHAN zip, and measures the memory the expanded records hold with
+:mod:`tracemalloc`. Each run starts from an empty memo, as an export does.
+
+Run from the repository root, after a download (``unihan-etl download``)::
+
+    $ uv run python benchmarks/bench_expansion_memo.py
+
+Pass ``--quick`` to use the bundled quick dataset instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import time
+import tracemalloc
+import typing as t
+
+from unihan_etl import core, expansion
+from unihan_etl.constants import (
+    INDEX_FIELDS,
+    UNIHAN_FIELDS,
+    UNIHAN_FILES,
+    UNIHAN_ZIP_PATH,
+)
+from unihan_etl.pytest_plugin import QUICK_FIXTURE_PATH
+
+if t.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def load_records(zip_path: pathlib.Path | None) -> list[dict[str, t.Any]]:
+    """Return the sparse, unexpanded records of the zip, or the quick dataset."""
+    fields = (*INDEX_FIELDS, *UNIHAN_FIELDS)
+    if zip_path is None:
+        streams = core.load_data_streams(sorted(QUICK_FIXTURE_PATH.glob("Unihan*.txt")))
+    else:
+        streams = core.load_zip_streams(zip_path, UNIHAN_FILES)
+    return list(core.stream_normalize(streams, fields, sparse=True))
+
+
+def expand_all(
+    records: list[dict[str, t.Any]],
+    memo: expansion.ExpansionMemo | None,
+) -> list[dict[str, t.Any]]:
+    """Return expanded copies of ``records``."""
+    return [core.expand_record(dict(record), memo=memo) for record in records]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print the expansion time and retained memory with and without a memo."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-z", "--zip-path", type=pathlib.Path, default=UNIHAN_ZIP_PATH)
+    parser.add_argument("--quick", action="store_true", help="Use the quick dataset.")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    records = load_records(None if args.quick else args.zip_path)
+    values = sum(len(record) - len(INDEX_FIELDS) for record in records)
+    print(f"{len(records)} records, {values} values")
+
+    for name, make_memo in (
+        ("expand_field", lambda: None),
+        ("ExpansionMemo", expansion.ExpansionMemo),
+    ):
+        seconds = []
+        for _ in range(args.repeat):
+            memo = make_memo()
+            start = time.perf_counter()
+            expand_all(records, memo)
+            seconds.append(time.perf_counter() - start)
+
+        memo = make_memo()
+        tracemalloc.start()
+        expanded = expand_all(records, memo)
+        retained, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del expanded
+
+        print(
+            f"{name:>14}: {min(seconds):7.3f} s, {retained / 2**20:8.1f} MiB retained",
+        )
+        if memo is not None:
+            stats = memo.stats().values()
+            hits = sum(s.hits for s in stats)
+            misses = sum(s.misses for s in stats)
+            print(
+                f"{'':>14}  {hits} hits, {misses} misses "
+                f"({hits / max(hits + misses, 1):.0%} hit rate)",
+            )
+
+
+if __name__ == "__main__":
+    main()
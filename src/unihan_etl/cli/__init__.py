@@ -6,6 +6,8 @@ This package provides the CLI implementation with subcommands for:
 - fields: List available UNIHAN fields
 - files: List available UNIHAN source files
 - search: Look up character(s) in UNIHAN database
+- convert: Convert text between simplified and traditional characters
+- serve: Serve character lookups over local HTTP
 """
 
 from __future__ import annotations
@@ -18,11 +20,13 @@ import typing as t
 from unihan_etl.__about__ import __version__
 from unihan_etl.cli._colors import build_description
 from unihan_etl.cli._formatter import create_themed_formatter
+from unihan_etl.cli.convert import command_convert, create_convert_subparser
 from unihan_etl.cli.download import command_download, create_download_subparser
 from unihan_etl.cli.export import command_export, create_export_subparser
 from unihan_etl.cli.fields import command_fields, create_fields_subparser
 from unihan_etl.cli.files import command_files, create_files_subparser
 from unihan_etl.cli.search import command_search, create_search_subparser
+from unihan_etl.cli.serve import command_serve, create_serve_subparser
 from unihan_etl.core import setup_logger
 
 if t.TYPE_CHECKING:
@@ -59,6 +63,13 @@ Download and export Unicode Han character database.""",
                 "unihan-etl fields",
                 "unihan-etl files",
                 "unihan-etl search 好",
+                "unihan-etl serve",
+            ],
+        ),
+        (
+            "convert",  # Colorized as category inside examples block
+            [
+                "unihan-etl convert --to hans < traditional.txt",
             ],
         ),
     ),
@@ -111,6 +122,8 @@ def create_parser() -> argparse.ArgumentParser:
     create_fields_subparser(subparsers, formatter_class)
     create_files_subparser(subparsers, formatter_class)
     create_search_subparser(subparsers, formatter_class)
+    create_convert_subparser(subparsers, formatter_class)
+    create_serve_subparser(subparsers, formatter_class)
 
     return parser
 
@@ -152,6 +165,8 @@ def cli(args: list[str] | None = None) -> _ExitCode:
         "fields": command_fields,
         "files": command_files,
         "search": command_search,
+        "convert": command_convert,
+        "serve": command_serve,
     }
 
     command_fn = commands.get(parsed.subparser_name)
@@ -28,6 +28,8 @@ import json
 import sys
 import typing as t
 
+from unihan_etl.util import json_default
+
 if t.TYPE_CHECKING:
     from argparse import ArgumentParser
     from typing import TextIO
@@ -122,6 +124,9 @@ def format_table(
 def format_json(data: list[dict[str, t.Any]] | dict[str, t.Any]) -> str:
     """Format data as pretty-printed JSON.
 
+    Enums in expanded values, such as kRSUnicode's, encode as their value, per
+    :func:`~unihan_etl.util.json_default`.
+
     Parameters
     ----------
     data : list[dict[str, Any]] | dict[str, Any]
@@ -141,14 +146,15 @@ def format_json(data: list[dict[str, t.Any]] | dict[str, t.Any]) -> str:
     >>> result.startswith("[")
     True
     """
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, indent=2, ensure_ascii=False, default=json_default)
 
 
 def format_ndjson(data: list[dict[str, t.Any]]) -> str:
     r"""Format data as newline-delimited JSON (NDJSON).
 
     Each record is serialized as a single-line JSON object,
-    with one record per line. This format is ideal for:
+    with one record per line, encoded as by :func:`format_json`. This format is
+    ideal for:
     - Streaming processing
     - Unix pipe composability
     - LLM consumption
@@ -172,7 +178,9 @@ def format_ndjson(data: list[dict[str, t.Any]]) -> str:
     >>> '{"name": "a"}' in result
     True
     """
-    lines = [json.dumps(record, ensure_ascii=False) for record in data]
+    lines = [
+        json.dumps(record, ensure_ascii=False, default=json_default) for record in data
+    ]
     return "\n".join(lines) + "\n" if lines else ""
 
 
@@ -0,0 +1,176 @@
+"""Convert subcommand for unihan-etl CLI.
+
+This module provides the convert subcommand that converts text between
+simplified and traditional characters, streaming it from stdin or files to
+stdout.
+"""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import sys
+import typing as t
+
+from unihan_etl.cli._colors import build_description
+from unihan_etl.convert import CONVERSION_FIELDS, Converter, default_converter
+
+if t.TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace, _SubParsersAction
+    from collections.abc import Iterable
+
+    from unihan_etl.convert import ConversionTarget
+
+log = logging.getLogger(__name__)
+
+
+CONVERT_DESCRIPTION = build_description(
+    """Convert text between simplified and traditional characters.
+
+Read text from stdin, or from files, and write it converted to stdout, using
+kTraditionalVariant to convert to traditional characters (hant) and
+kSimplifiedVariant to convert to simplified ones (hans). Characters with
+several variants are converted to the first one UNIHAN lists, unless they are
+among their own variants; --ambiguous reports them. Requires UNIHAN data to be
+downloaded (will download if not cached).""",
+    (
+        (
+            None,
+            [
+                'echo "头发" | unihan-etl convert',
+                "unihan-etl convert --to hans < traditional.txt",
+                "unihan-etl convert --ambiguous simplified.txt > traditional.txt",
+            ],
+        ),
+    ),
+)
+
+
+def create_convert_subparser(
+    subparsers: _SubParsersAction[ArgumentParser],
+    formatter_class: type[t.Any] | None = None,
+) -> ArgumentParser:
+    """Create and configure the convert subcommand parser.
+
+    Parameters
+    ----------
+    subparsers : _SubParsersAction
+        Subparser action from parent parser.
+    formatter_class : type | None
+        Optional formatter class for help output.
+
+    Returns
+    -------
+    ArgumentParser
+        Configured convert subcommand parser.
+    """
+    parser_kwargs: dict[str, t.Any] = {
+        "help": "Convert text between simplified and traditional characters",
+        "description": CONVERT_DESCRIPTION,
+    }
+    if formatter_class is not None:
+        parser_kwargs["formatter_class"] = formatter_class
+
+    parser = subparsers.add_parser("convert", **parser_kwargs)
+
+    parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="Files to convert, in order. Reads stdin by default.",
+    )
+    parser.add_argument(
+        "-t",
+        "--to",
+        dest="to",
+        choices=list(CONVERSION_FIELDS),
+        default="hant",
+        help="Convert to traditional (hant) or simplified (hans). Default: hant",
+    )
+    parser.add_argument(
+        "-a",
+        "--ambiguous",
+        dest="ambiguous",
+        action="store_true",
+        help="Report characters with several variants on stderr.",
+    )
+
+    return parser
+
+
+def _load_converter() -> Converter:
+    """Return the converter, downloading UNIHAN on first use."""
+    return default_converter()
+
+
+def _convert_lines(
+    lines: Iterable[str],
+    name: str,
+    converter: Converter,
+    to: ConversionTarget,
+    report_ambiguous: bool,
+) -> None:
+    """Write ``lines`` converted to stdout, reporting ambiguities of ``name``."""
+    table = converter.table(to)
+    write = sys.stdout.write
+    if not report_ambiguous:
+        for line in lines:
+            write(line.translate(table))
+        return
+    for lineno, line in enumerate(lines, start=1):
+        for ambiguity in converter.ambiguities(line, to=to):
+            candidates = " ".join(ambiguity.candidates)
+            print(
+                f"{name}:{lineno}:{ambiguity.position + 1}: "
+                f"{ambiguity.char} -> {candidates}",
+                file=sys.stderr,
+            )
+        write(line.translate(table))
+
+
+def command_convert(
+    args: Namespace,
+    parser: ArgumentParser,
+) -> int:
+    """Execute the convert command.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command-line arguments.
+    parser : ArgumentParser
+        The argument parser (for error handling).
+
+    Returns
+    -------
+    int
+        Exit code (0 for success, non-zero for failure).
+    """
+    to: ConversionTarget = getattr(args, "to", "hant")
+    report_ambiguous = getattr(args, "ambiguous", False)
+
+    try:
+        converter = _load_converter()
+    except Exception as e:
+        log.exception("Loading variants failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if not args.files:
+            _convert_lines(sys.stdin, "<stdin>", converter, to, report_ambiguous)
+        for path in args.files:
+            with pathlib.Path(path).open(encoding="utf-8") as f:
+                _convert_lines(f, path, converter, to, report_ambiguous)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+__all__ = [
+    "CONVERT_DESCRIPTION",
+    "command_convert",
+    "create_convert_subparser",
+]
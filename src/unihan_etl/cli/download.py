@@ -29,14 +29,16 @@ log = logging.getLogger(__name__)
 DOWNLOAD_DESCRIPTION = build_description(
     """Download and cache UNIHAN database.
 
-Download the Unicode Han database without processing or exporting.
-Use this to pre-cache the data for later export commands.""",
+Download the Unicode Han database without exporting it.
+Use this to pre-cache the data for later export commands. The codepoint
+index used by search is built too, unless --no-index is given.""",
     (
         (
             None,
             [
                 "unihan-etl download",
                 "unihan-etl download --no-cache",
+                "unihan-etl download --no-index",
                 "unihan-etl download -z /tmp/Unihan.zip",
             ],
         ),
@@ -95,6 +97,18 @@ def create_download_subparser(
         action="store_false",
         help="Force re-download even if cached.",
     )
+    parser.add_argument(
+        "--no-extract",
+        dest="extract",
+        action="store_false",
+        help="Don't extract the zip. Exports and indexing read it directly.",
+    )
+    parser.add_argument(
+        "--no-index",
+        dest="index",
+        action="store_false",
+        help="Don't build the codepoint index used by search.",
+    )
 
     return parser
 
@@ -123,7 +137,9 @@ def command_download(
         option_kwargs = {
             k: v
             for k, v in vars(args).items()
-            if v is not None and v != [] and k not in ("subparser_name", "log_level")
+            if v is not None
+            and v != []
+            and k not in ("subparser_name", "log_level", "index")
         }
 
         packager = Packager(Options(**option_kwargs))
@@ -131,9 +147,14 @@ def command_download(
 
         # Print success message with privacy-masked path
         zip_path = PrivatePath(packager.options.zip_path)
-        work_dir = PrivatePath(packager.options.work_dir)
         print(f"Downloaded to: {zip_path}")
-        print(f"Extracted to: {work_dir}")
+        if packager.options.extract:
+            work_dir = PrivatePath(packager.options.work_dir)
+            print(f"Extracted to: {work_dir}")
+
+        if getattr(args, "index", True):
+            index_path = PrivatePath(packager.build_index())
+            print(f"Indexed to: {index_path}")
     except Exception as e:
         log.exception("Download failed")
         print(f"Error: {e}", file=sys.stderr)
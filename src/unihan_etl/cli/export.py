@@ -13,6 +13,7 @@ import typing as t
 from unihan_etl.cli._colors import build_description
 from unihan_etl.constants import (
     ALLOWED_EXPORT_TYPES,
+    CJK_BLOCKS,
     DESTINATION_DIR,
     UNIHAN_FIELDS,
     UNIHAN_FILES,
@@ -22,6 +23,7 @@ from unihan_etl.constants import (
 )
 from unihan_etl.core import DEFAULT_OPTIONS, Packager
 from unihan_etl.options import Options
+from unihan_etl.util import parse_codepoint_range, parse_condition
 
 if t.TYPE_CHECKING:
     from argparse import ArgumentParser, Namespace, _SubParsersAction
@@ -32,7 +34,8 @@ log = logging.getLogger(__name__)
 EXPORT_DESCRIPTION = build_description(
     """Export UNIHAN data to CSV, JSON, or YAML.
 
-Download, process, and export Unicode Han character database.""",
+Download, process, and export Unicode Han character database. With --index,
+the codepoint index used by search is built too, which parses the data again.""",
     (
         (
             None,
@@ -41,6 +44,7 @@ Download, process, and export Unicode Han character database.""",
                 "unihan-etl export -F json",
                 "unihan-etl export -F json -f kDefinition kMandarin",
                 "unihan-etl export -d /tmp/unihan.csv",
+                "unihan-etl export --index",
             ],
         ),
         (
@@ -51,6 +55,14 @@ Download, process, and export Unicode Han character database.""",
                 "unihan-etl export -F yaml --no-prune",
             ],
         ),
+        (
+            "Filter examples",
+            [
+                "unihan-etl export -F json --block uro --where kIICore",
+                "unihan-etl export -F ndjson --codepoint-range U+4E00-U+4FFF",
+                "unihan-etl export -f kDefinition --where kMandarin=hǎo",
+            ],
+        ),
     ),
 )
 
@@ -98,7 +110,10 @@ def create_export_subparser(
         "-d",
         "--destination",
         dest="destination",
-        help=f"Output file. Default: {DESTINATION_DIR}/unihan.{{json,csv,yaml}}",
+        help=(
+            "Output file. "
+            f"Default: {DESTINATION_DIR}/unihan.{{json,ndjson,csv,yaml,sqlite}}"
+        ),
     )
     parser.add_argument(
         "-w",
@@ -134,6 +149,49 @@ def create_export_subparser(
         action="store_false",
         help="Don't reuse the cached UNIHAN zip (force re-download and re-extract).",
     )
+    parser.add_argument(
+        "--index",
+        dest="index",
+        action="store_true",
+        help=(
+            "Also build the codepoint index used by search, if missing. "
+            "Parses the data files a second time."
+        ),
+    )
+    parser.add_argument(
+        "--compact",
+        dest="compact",
+        action="store_true",
+        help="Write JSON and NDJSON without indentation or spaces.",
+    )
+    parser.add_argument(
+        "--export-cache",
+        dest="export_cache",
+        action="store_true",
+        help=(
+            "Reuse the output of an earlier export of the same zip with the "
+            "same options, and keep this one for later."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="workers",
+        type=int,
+        help=(
+            "Parse data files in this many processes. 0 uses one per CPU. "
+            f"Default: {DEFAULT_OPTIONS.workers}"
+        ),
+    )
+    parser.add_argument(
+        "--no-extract",
+        dest="extract",
+        action="store_false",
+        help=(
+            "Read data straight from the zip instead of extracting it to the "
+            "working directory."
+        ),
+    )
     parser.add_argument(
         "-f",
         "--fields",
@@ -154,6 +212,37 @@ def create_export_subparser(
             f"All files used by default. Files: {', '.join(UNIHAN_FILES)}"
         ),
     )
+    parser.add_argument(
+        "--where",
+        dest="where",
+        action="append",
+        type=parse_condition,
+        metavar="FIELD[=VALUE]",
+        help=(
+            "Export only characters with FIELD, or where a value of FIELD is "
+            "VALUE. Matched on raw values, before expansion, so unlike "
+            "search --where, dotted paths into expanded values don't apply; "
+            "FIELD needn't be exported. Repeat to require several."
+        ),
+    )
+    parser.add_argument(
+        "--codepoint-range",
+        dest="codepoint_ranges",
+        action="append",
+        type=parse_codepoint_range,
+        metavar="FIRST-LAST",
+        help=(
+            "Export only characters in a codepoint range, e.g. U+4E00-U+9FFF. "
+            "Repeatable."
+        ),
+    )
+    parser.add_argument(
+        "--block",
+        dest="blocks",
+        action="append",
+        choices=list(CJK_BLOCKS),
+        help="Export only characters in a CJK block. Repeatable.",
+    )
 
     return parser
 
@@ -182,12 +271,16 @@ def command_export(
         option_kwargs = {
             k: v
             for k, v in vars(args).items()
-            if v is not None and v != [] and k not in ("subparser_name", "log_level")
+            if v is not None
+            and v != []
+            and k not in ("subparser_name", "log_level", "index")
         }
 
         packager = Packager(Options(**option_kwargs))
         packager.download()
         packager.export()
+        if getattr(args, "index", False):
+            packager.build_index()
     except Exception as e:
         log.exception("Export failed")
         print(f"Error: {e}", file=sys.stderr)
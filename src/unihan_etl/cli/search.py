@@ -1,12 +1,14 @@
 """Search subcommand for unihan-etl CLI.
 
 This module provides the search subcommand that looks up UNIHAN
-character data by character, UCN, or hex codepoint.
+character data by character, UCN, or hex codepoint, and characters by
+field value.
 """
 
 from __future__ import annotations
 
 import logging
+import pathlib
 import re
 import sys
 import typing as t
@@ -15,12 +17,14 @@ from unihan_etl.cli._colors import build_description
 from unihan_etl.cli._output import (
     OutputFormat,
     add_output_arguments,
+    format_ndjson,
     get_output_format_from_args,
     print_output,
 )
 from unihan_etl.core import Packager
+from unihan_etl.index import UnihanIndex, parse_text_query
 from unihan_etl.options import Options
-from unihan_etl.util import ucn_to_unicode
+from unihan_etl.util import parse_condition, split_pinyin_tone, ucn_to_unicode
 
 if t.TYPE_CHECKING:
     from argparse import ArgumentParser, Namespace, _SubParsersAction
@@ -31,8 +35,13 @@ log = logging.getLogger(__name__)
 SEARCH_DESCRIPTION = build_description(
     """Search and look up UNIHAN characters.
 
-Look up character data by character, UCN (U+XXXX), or hex codepoint.
-Requires UNIHAN data to be downloaded (will download if not cached).""",
+Look up character data by character, UCN (U+XXXX), or hex codepoint, for
+one character or many, including every character of a text read using
+--file, or find the characters with a field value using --where, with a
+pinyin reading using --pinyin, or with words in their definition using
+--text. Requires UNIHAN data to be downloaded (will download if not cached).
+The first search builds a codepoint index of the download; later searches
+read from it.""",
     (
         (
             None,
@@ -42,6 +51,25 @@ Requires UNIHAN data to be downloaded (will download if not cached).""",
                 "unihan-etl search 597D",
             ],
         ),
+        (
+            "Batch examples",
+            [
+                "unihan-etl search 好 U+4E00 4E2D --ndjson",
+                "unihan-etl search --file document.txt --ndjson",
+                "cat document.txt | unihan-etl search --file - --ndjson",
+            ],
+        ),
+        (
+            "Reverse lookup examples",
+            [
+                "unihan-etl search --where kMandarin=hǎo",
+                "unihan-etl search --where kTotalStrokes=6 --where kMandarin=hǎo",
+                "unihan-etl search --where kRSUnicode.radical=38",
+                "unihan-etl search --pinyin hao3",
+                "unihan-etl search --pinyin hǎo",
+                'unihan-etl search --text "wild hors*"',
+            ],
+        ),
         (
             "Output format examples",
             [
@@ -87,8 +115,51 @@ def create_search_subparser(
     parser = subparsers.add_parser("search", **parser_kwargs)
 
     parser.add_argument(
-        "char",
-        help="Character, UCN (U+XXXX), or hex codepoint to look up.",
+        "chars",
+        nargs="*",
+        metavar="char",
+        help="Characters, UCNs (U+XXXX), or hex codepoints to look up.",
+    )
+    parser.add_argument(
+        "--file",
+        dest="file",
+        metavar="FILE",
+        help=(
+            "Look up every distinct character of the text in FILE, "
+            "or of stdin if FILE is -."
+        ),
+    )
+    parser.add_argument(
+        "--where",
+        dest="where",
+        action="append",
+        metavar="FIELD=VALUE",
+        help=(
+            "Find characters with VALUE in FIELD, or a dotted path into it "
+            "such as kRSUnicode.radical, matched on expanded values. Unlike "
+            "export --where, which matches raw values, VALUE is required. "
+            "Repeat to require several."
+        ),
+    )
+    parser.add_argument(
+        "-p",
+        "--pinyin",
+        dest="pinyin",
+        metavar="READING",
+        help=(
+            "Find characters read READING, most frequent first. Give a tone "
+            "mark (hǎo) or number (hao3), or neither to match any tone."
+        ),
+    )
+    parser.add_argument(
+        "-t",
+        "--text",
+        dest="text",
+        metavar="QUERY",
+        help=(
+            "Find characters with every word of QUERY in their kDefinition, "
+            "best match first. End a word with * to match it as a prefix."
+        ),
     )
     parser.add_argument(
         "-f",
@@ -150,6 +221,81 @@ def normalize_char_input(char_input: str) -> str:
     raise ValueError(msg)
 
 
+def parse_where(conditions: list[str]) -> dict[str, str]:
+    """Parse ``FIELD=VALUE`` conditions, per :func:`~unihan_etl.util.parse_condition`.
+
+    Unlike ``export --where``, a value is required: the index holds no
+    postings of a field's presence.
+
+    Parameters
+    ----------
+    conditions : list[str]
+        Conditions as given to ``--where``.
+
+    Returns
+    -------
+    dict[str, str]
+        Values to look for, by field.
+
+    Raises
+    ------
+    ValueError
+        If a condition has no ``=``, or no field.
+
+    Examples
+    --------
+    >>> parse_where(["kMandarin=hǎo", "kTotalStrokes=6"])
+    {'kMandarin': 'hǎo', 'kTotalStrokes': '6'}
+    """
+    where: dict[str, str] = {}
+    for condition in conditions:
+        try:
+            field, value = parse_condition(condition)
+        except ValueError:
+            value = None
+        if value is None:
+            msg = f"Expected FIELD=VALUE, got: {condition!r}"
+            raise ValueError(msg)
+        where[field] = value
+    return where
+
+
+def filter_fields(
+    record: dict[str, t.Any],
+    fields_filter: list[str] | None,
+) -> dict[str, t.Any]:
+    """Return ``record`` narrowed to ``fields_filter``.
+
+    ``char`` and ``ucn`` are always kept. Without a filter, empty fields are
+    dropped for cleaner output.
+
+    Examples
+    --------
+    >>> filter_fields(
+    ...     {"ucn": "U+597D", "char": "好", "kCantonese": "hou2", "kMandarin": "hǎo"},
+    ...     ["kMandarin"],
+    ... )
+    {'char': '好', 'ucn': 'U+597D', 'kMandarin': 'hǎo'}
+    """
+    if not fields_filter:
+        return {k: v for k, v in record.items() if v is not None}
+    filtered: dict[str, t.Any] = {
+        "char": record.get("char"),
+        "ucn": record.get("ucn"),
+    }
+    for field in fields_filter:
+        if field in record:
+            filtered[field] = record[field]
+    return filtered
+
+
+def _open_index() -> UnihanIndex:
+    """Open the codepoint index, downloading and building it on first use."""
+    packager = Packager(Options(format="python"))
+    packager.download()
+    return UnihanIndex(packager.build_index())
+
+
 def char_to_ucn(char: str) -> str:
     """Convert a character to UCN format.
 
@@ -184,10 +330,31 @@ def command_search(
     int
         Exit code (0 for success, non-zero for failure).
     """
-    char_input = args.char
+    char_inputs = getattr(args, "chars", None) or []
+    file = getattr(args, "file", None)
     fields_filter = getattr(args, "fields", None)
     output_format = get_output_format_from_args(args)
 
+    where = getattr(args, "where", None)
+    pinyin = getattr(args, "pinyin", None)
+    text = getattr(args, "text", None)
+    if sum(bool(mode) for mode in (char_inputs or file, where, pinyin, text)) != 1:
+        print(
+            "Error: give one of characters to look up, --file, --where, --pinyin "
+            "or --text",
+            file=sys.stderr,
+        )
+        return 1
+    if where:
+        return _command_where(where, fields_filter, output_format)
+    if pinyin:
+        return _command_pinyin(pinyin, fields_filter, output_format)
+    if text:
+        return _command_text(text, fields_filter, output_format)
+    if file is not None or len(char_inputs) > 1:
+        return _command_batch(char_inputs, file, fields_filter, output_format)
+    (char_input,) = char_inputs
+
     # Normalize character input
     try:
         char = normalize_char_input(char_input)
@@ -198,40 +365,15 @@ def command_search(
     ucn = char_to_ucn(char)
 
     try:
-        # Load UNIHAN data using Packager
-        # Use python format to get data in memory
-        packager = Packager(Options(format="python"))
-        packager.download()
-        data = packager.export()
-
-        if data is None:
-            print("Error: Failed to load UNIHAN data", file=sys.stderr)
-            return 1
-
-        # Find the character in the data
-        char_data = None
-        for record in data:
-            if record.get("char") == char or record.get("ucn") == ucn:
-                char_data = record
-                break
+        # Open the codepoint index, building it on first use
+        with _open_index() as index:
+            char_data = index.get(char)
 
         if char_data is None:
             print(f"Character not found: {char} ({ucn})", file=sys.stderr)
             return 1
 
-        # Filter fields if specified
-        if fields_filter:
-            filtered_data: dict[str, t.Any] = {
-                "char": char_data.get("char"),
-                "ucn": char_data.get("ucn"),
-            }
-            for field in fields_filter:
-                if field in char_data:
-                    filtered_data[field] = char_data[field]
-            char_data = filtered_data
-        else:
-            # Remove empty fields for cleaner output
-            char_data = {k: v for k, v in char_data.items() if v is not None}
+        char_data = filter_fields(char_data, fields_filter)
 
     except Exception as e:
         log.exception("Search failed")
@@ -261,10 +403,217 @@ def command_search(
     return 0
 
 
+def read_chars(char_inputs: list[str], text: str = "") -> list[str]:
+    """Return the distinct characters of ``char_inputs`` and ``text``.
+
+    Parameters
+    ----------
+    char_inputs : list[str]
+        Characters, UCNs, or hex codepoints, per :func:`normalize_char_input`.
+    text : str
+        Text whose characters, except whitespace, are looked up too.
+
+    Returns
+    -------
+    list[str]
+        Characters, in the order first given.
+
+    Raises
+    ------
+    ValueError
+        If any of ``char_inputs`` cannot be converted to a character.
+
+    Examples
+    --------
+    >>> read_chars(["U+597D", "4E00"], "好好 学习 一")
+    ['好', '一', '学', '习']
+    """
+    chars = dict.fromkeys(normalize_char_input(c) for c in char_inputs)
+    chars.update(dict.fromkeys(char for char in text if not char.isspace()))
+    return list(chars)
+
+
+def _command_batch(
+    char_inputs: list[str],
+    file: str | None,
+    fields_filter: list[str] | None,
+    output_format: OutputFormat,
+) -> int:
+    """Print the records of many characters, from one index open.
+
+    NDJSON records are written as they are read.
+    """
+    try:
+        if file == "-":
+            text = sys.stdin.read()
+        elif file is not None:
+            text = pathlib.Path(file).read_text(encoding="utf-8")
+        else:
+            text = ""
+        chars = read_chars(char_inputs, text)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    records: list[dict[str, t.Any]] = []
+    missing: list[str] = []
+    found = False
+    try:
+        with _open_index() as index:
+            for char, record in index.get_many(chars):
+                if record is None:
+                    missing.append(char)
+                    continue
+                found = True
+                if output_format == OutputFormat.NDJSON:
+                    sys.stdout.write(
+                        format_ndjson([filter_fields(record, fields_filter)])
+                    )
+                else:
+                    records.append(record)
+    except Exception as e:
+        log.exception("Search failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if output_format != OutputFormat.NDJSON and records:
+        _print_records(
+            records,
+            ["kMandarin", "kDefinition"],
+            fields_filter,
+            output_format,
+        )
+    if missing:
+        not_found = ", ".join(f"{char} ({char_to_ucn(char)})" for char in missing)
+        print(f"Characters not found: {not_found}", file=sys.stderr)
+    return 0 if found else 1
+
+
+def _command_where(
+    conditions: list[str],
+    fields_filter: list[str] | None,
+    output_format: OutputFormat,
+) -> int:
+    """Print the characters matching every ``--where`` condition."""
+    try:
+        where = parse_where(conditions)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        with _open_index() as index:
+            records = index.find(where)
+    except Exception as e:
+        log.exception("Search failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not records:
+        conditions_str = " ".join(conditions)
+        print(f"No characters match: {conditions_str}", file=sys.stderr)
+        return 1
+
+    _print_records(records, list(where), fields_filter, output_format)
+    return 0
+
+
+def _command_pinyin(
+    reading: str,
+    fields_filter: list[str] | None,
+    output_format: OutputFormat,
+) -> int:
+    """Print the characters read ``reading``, most frequent first."""
+    try:
+        split_pinyin_tone(reading)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        with _open_index() as index:
+            records = [index.get(chr(codepoint)) for codepoint in index.pinyin(reading)]
+    except Exception as e:
+        log.exception("Search failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not records:
+        print(f"No characters read: {reading}", file=sys.stderr)
+        return 1
+
+    _print_records(
+        [record for record in records if record is not None],
+        ["kMandarin", "kHanyuPinlu"],
+        fields_filter,
+        output_format,
+    )
+    return 0
+
+
+def _command_text(
+    query: str,
+    fields_filter: list[str] | None,
+    output_format: OutputFormat,
+) -> int:
+    """Print the characters whose definitions match ``query``, best first."""
+    try:
+        parse_text_query(query)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        with _open_index() as index:
+            records = [index.get(chr(codepoint)) for codepoint in index.text(query)]
+    except Exception as e:
+        log.exception("Search failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not records:
+        print(f"No definitions match: {query}", file=sys.stderr)
+        return 1
+
+    _print_records(
+        [record for record in records if record is not None],
+        ["kDefinition"],
+        fields_filter,
+        output_format,
+    )
+    return 0
+
+
+def _print_records(
+    records: list[dict[str, t.Any]],
+    table_fields: list[str],
+    fields_filter: list[str] | None,
+    output_format: OutputFormat,
+) -> None:
+    """Print matched records, as a table of ``table_fields`` by default."""
+    if output_format == OutputFormat.TABLE:
+        # One row per character, with the queried or requested fields
+        fields = (field.partition(".")[0] for field in fields_filter or table_fields)
+        columns = ["char", "ucn", *dict.fromkeys(fields)]
+        print_output(
+            [filter_fields(record, columns) for record in records],
+            output_format,
+            headers=columns,
+        )
+    else:
+        print_output(
+            [filter_fields(record, fields_filter) for record in records],
+            output_format,
+        )
+
+
 __all__ = [
     "SEARCH_DESCRIPTION",
     "char_to_ucn",
     "command_search",
     "create_search_subparser",
+    "filter_fields",
     "normalize_char_input",
+    "parse_where",
+    "read_chars",
 ]
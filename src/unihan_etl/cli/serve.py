@@ -0,0 +1,396 @@
+"""Serve subcommand for unihan-etl CLI.
+
+This module provides the serve subcommand that opens the codepoint index
+once and answers character lookups as JSON over local HTTP, on a TCP port or
+a UNIX socket, so repeated lookups skip the start-up cost of a process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import http
+import http.server
+import json
+import logging
+import pathlib
+import socketserver
+import sys
+import threading
+import typing as t
+import urllib.parse
+
+from unihan_etl.cli import search
+from unihan_etl.cli._colors import build_description
+from unihan_etl.cli._output import OutputFormat, format_output
+from unihan_etl.cli.search import filter_fields, normalize_char_input
+
+if t.TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace, _SubParsersAction
+
+    from unihan_etl.index import UnihanIndex
+
+log = logging.getLogger(__name__)
+
+#: Port ``unihan-etl serve`` listens on by default.
+DEFAULT_PORT = 8470
+
+#: Largest request body accepted, in bytes.
+MAX_BODY_SIZE = 1 << 20
+
+#: Media type of NDJSON responses, requested through ``Accept``.
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+SERVE_DESCRIPTION = build_description(
+    """Serve UNIHAN character lookups over local HTTP.
+
+Open the codepoint index once and answer lookups as JSON, on a TCP port or a
+UNIX socket. GET /lookup/CHAR returns a character's record; POST /lookup with
+a JSON list of characters, or {"chars": [...], "fields": [...]}, returns a
+list of records, null for characters without data. Characters are given as in
+search: the character, its UCN (U+XXXX), or hex codepoint. Send
+Accept: application/x-ndjson for one record per line.""",
+    (
+        (
+            None,
+            [
+                "unihan-etl serve",
+                "unihan-etl serve --port 8080 -f kDefinition kMandarin",
+                "unihan-etl serve --socket /tmp/unihan.sock",
+            ],
+        ),
+        (
+            "Request examples",
+            [
+                "curl localhost:8470/lookup/U+597D",
+                "curl localhost:8470/lookup/好?fields=kDefinition",
+                'curl -d \'["好", "U+4E00"]\' localhost:8470/lookup',
+            ],
+        ),
+    ),
+)
+
+
+def create_serve_subparser(
+    subparsers: _SubParsersAction[ArgumentParser],
+    formatter_class: type[t.Any] | None = None,
+) -> ArgumentParser:
+    """Create and configure the serve subcommand parser.
+
+    Parameters
+    ----------
+    subparsers : _SubParsersAction
+        Subparser action from parent parser.
+    formatter_class : type | None
+        Optional formatter class for help output.
+
+    Returns
+    -------
+    ArgumentParser
+        Configured serve subcommand parser.
+    """
+    parser_kwargs: dict[str, t.Any] = {
+        "help": "Serve UNIHAN character lookups over local HTTP",
+        "description": SERVE_DESCRIPTION,
+    }
+    if formatter_class is not None:
+        parser_kwargs["formatter_class"] = formatter_class
+
+    parser = subparsers.add_parser("serve", **parser_kwargs)
+
+    parser.add_argument(
+        "--host",
+        dest="host",
+        default="127.0.0.1",
+        help="Address to listen on. Default: 127.0.0.1",
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on. Default: {DEFAULT_PORT}",
+    )
+    parser.add_argument(
+        "--socket",
+        dest="socket",
+        metavar="PATH",
+        help="Listen on a UNIX socket at PATH instead of a TCP port.",
+    )
+    parser.add_argument(
+        "-f",
+        "--fields",
+        dest="fields",
+        nargs="*",
+        help=(
+            "Fields to include in responses, unless a request asks for others. "
+            "Shows all non-empty fields by default."
+        ),
+    )
+
+    return parser
+
+
+class RequestError(Exception):
+    """A lookup request that can't be answered, with its HTTP status."""
+
+    def __init__(self, status: http.HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class LookupHandler(http.server.BaseHTTPRequestHandler):
+    """Answer ``/lookup`` requests from the server's index.
+
+    Connections are kept alive between requests, so a client pays for its
+    connection once. Responses are buffered and sent in one write, rather than
+    headers and body apart, which would stall on delayed acknowledgements.
+    """
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    server: LookupServer | UnixLookupServer
+
+    def do_GET(self) -> None:
+        """Look up the character of ``/lookup/CHAR``."""
+        url = urllib.parse.urlsplit(self.path)
+        prefix = "/lookup/"
+        if not url.path.startswith(prefix):
+            self._send_error(http.HTTPStatus.NOT_FOUND, f"Not found: {url.path}")
+            return
+        char_input = urllib.parse.unquote(url.path.removeprefix(prefix))
+        fields = urllib.parse.parse_qs(url.query).get("fields")
+        fields_filter = (
+            [field for value in fields for field in value.split(",") if field]
+            if fields
+            else None
+        )
+        try:
+            (record,) = self.server.lookup([char_input], fields_filter)
+        except RequestError as e:
+            self._send_error(e.status, str(e))
+            return
+        if record is None:
+            self._send_error(
+                http.HTTPStatus.NOT_FOUND,
+                f"Character not found: {char_input}",
+            )
+            return
+        self._send(http.HTTPStatus.OK, record)
+
+    def do_POST(self) -> None:
+        """Look up each character of the JSON body of ``/lookup``."""
+        if urllib.parse.urlsplit(self.path).path != "/lookup":
+            self._send_error(http.HTTPStatus.NOT_FOUND, f"Not found: {self.path}")
+            return
+        try:
+            chars, fields_filter = self._read_batch()
+            records = self.server.lookup(chars, fields_filter)
+        except RequestError as e:
+            self._send_error(e.status, str(e))
+            return
+        self._send(http.HTTPStatus.OK, records)
+
+    def _read_batch(self) -> tuple[list[str], list[str] | None]:
+        """Return the characters and fields of a batched request body."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            # The unread body would be taken for the next request
+            self.close_connection = True
+            msg = f"Request body exceeds {MAX_BODY_SIZE} bytes"
+            raise RequestError(http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE, msg)
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            msg = f"Invalid JSON: {e}"
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, msg) from e
+
+        fields_filter = None
+        if isinstance(body, dict):
+            fields_filter = body.get("fields")
+            body = body.get("chars")
+        if not isinstance(body, list) or not all(isinstance(c, str) for c in body):
+            msg = 'Expected a list of characters, or {"chars": [...]}'
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, msg)
+        if fields_filter is not None and not (
+            isinstance(fields_filter, list)
+            and all(isinstance(field, str) for field in fields_filter)
+        ):
+            msg = "Expected fields to be a list of field names"
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, msg)
+        return body, fields_filter
+
+    def _send(
+        self,
+        status: http.HTTPStatus,
+        data: list[t.Any] | dict[str, t.Any],
+    ) -> None:
+        """Send ``data`` as JSON, or NDJSON if the client accepts it."""
+        if NDJSON_MEDIA_TYPE in self.headers.get("Accept", ""):
+            content_type = NDJSON_MEDIA_TYPE
+            output = format_output(data, OutputFormat.NDJSON)
+        else:
+            content_type = "application/json"
+            output = format_output(data, OutputFormat.JSON) + "\n"
+        body = output.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: http.HTTPStatus, message: str) -> None:
+        self._send(status, {"error": message})
+
+    def log_message(self, format: str, *args: t.Any) -> None:  # noqa: A002
+        """Log requests at debug level rather than to stderr."""
+        log.debug(format, *args)
+
+
+class _LookupMixin:
+    """Lookups shared by the TCP and UNIX socket servers."""
+
+    index: UnihanIndex
+    fields_filter: list[str] | None
+    _lock: threading.Lock
+
+    def lookup(
+        self,
+        chars: list[str],
+        fields_filter: list[str] | None = None,
+    ) -> list[dict[str, t.Any] | None]:
+        """Return the record of each of ``chars``, None for those without data.
+
+        Parameters
+        ----------
+        chars : list[str]
+            Characters, UCNs (U+XXXX), or hex codepoints.
+        fields_filter : list[str] | None
+            Fields to include, the server's by default.
+
+        Returns
+        -------
+        list[dict | None]
+            Records, in the order of ``chars``.
+
+        Raises
+        ------
+        RequestError
+            If any of ``chars`` can't be parsed.
+        """
+        try:
+            normalized = [normalize_char_input(char) for char in chars]
+        except ValueError as e:
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, str(e)) from e
+
+        fields_filter = fields_filter or self.fields_filter
+        with self._lock:
+            records = [self.index.get(char) for char in normalized]
+        return [
+            None if record is None else filter_fields(record, fields_filter)
+            for record in records
+        ]
+
+
+class LookupServer(_LookupMixin, http.server.ThreadingHTTPServer):
+    """HTTP server answering lookups from ``index`` on a TCP port."""
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        index: UnihanIndex,
+        fields_filter: list[str] | None = None,
+    ) -> None:
+        """Listen on ``address``, answering from ``index``."""
+        self.index = index
+        self.fields_filter = fields_filter
+        self._lock = threading.Lock()
+        super().__init__(address, LookupHandler)
+
+
+class UnixLookupServer(
+    _LookupMixin,
+    socketserver.ThreadingMixIn,
+    socketserver.UnixStreamServer,
+):
+    """HTTP server answering lookups from ``index`` on a UNIX socket."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        index: UnihanIndex,
+        fields_filter: list[str] | None = None,
+    ) -> None:
+        """Listen on a UNIX socket at ``path``, answering from ``index``."""
+        self.index = index
+        self.fields_filter = fields_filter
+        self._lock = threading.Lock()
+        self.socket_path = pathlib.Path(path)
+        super().__init__(path, LookupHandler)
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def command_serve(
+    args: Namespace,
+    parser: ArgumentParser,
+) -> int:
+    """Execute the serve command.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command-line arguments.
+    parser : ArgumentParser
+        The argument parser (for error handling).
+
+    Returns
+    -------
+    int
+        Exit code (0 for success, non-zero for failure).
+    """
+    fields_filter = getattr(args, "fields", None) or None
+    socket_path = getattr(args, "socket", None)
+
+    try:
+        index = search._open_index()
+    except Exception as e:
+        log.exception("Opening the index failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    server: LookupServer | UnixLookupServer
+    try:
+        if socket_path:
+            server = UnixLookupServer(socket_path, index, fields_filter)
+            print(f"Serving on unix:{socket_path}", file=sys.stderr)
+        else:
+            server = LookupServer((args.host, args.port), index, fields_filter)
+            print(
+                f"Serving on http://{args.host}:{server.server_port}",
+                file=sys.stderr,
+            )
+    except OSError as e:
+        index.close()
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    with index, server, contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return 0
+
+
+__all__ = [
+    "DEFAULT_PORT",
+    "SERVE_DESCRIPTION",
+    "LookupHandler",
+    "LookupServer",
+    "UnixLookupServer",
+    "command_serve",
+    "create_serve_subparser",
+]
@@ -253,8 +253,27 @@ DESTINATION_DIR = app_dirs.user_data_dir
 UNIHAN_ZIP_PATH = WORK_DIR / "Unihan.zip"
 #: Default Unihan fields
 UNIHAN_FIELDS: ColumnDataTuple = tuple(get_fields(UNIHAN_MANIFEST))
+#: Map each field to the file holding it, the reverse of :data:`UNIHAN_MANIFEST`
+UNIHAN_FIELD_FILES: dict[str, str] = {
+    field: file_ for file_, fields in UNIHAN_MANIFEST.items() for field in fields
+}
+#: CJK ideograph blocks, by name, as ``(first, last)`` codepoints
+CJK_BLOCKS: dict[str, tuple[int, int]] = {
+    "uro": (0x4E00, 0x9FFF),
+    "ext-a": (0x3400, 0x4DBF),
+    "ext-b": (0x20000, 0x2A6DF),
+    "ext-c": (0x2A700, 0x2B73F),
+    "ext-d": (0x2B740, 0x2B81F),
+    "ext-e": (0x2B820, 0x2CEAF),
+    "ext-f": (0x2CEB0, 0x2EBEF),
+    "ext-g": (0x30000, 0x3134F),
+    "ext-h": (0x31350, 0x323AF),
+    "ext-i": (0x2EBF0, 0x2EE5F),
+    "compat": (0xF900, 0xFAFF),
+    "compat-sup": (0x2F800, 0x2FA1F),
+}
 #: Allowed export types
-ALLOWED_EXPORT_TYPES = ["json", "csv"]
+ALLOWED_EXPORT_TYPES = ["json", "ndjson", "csv", "sqlite", "mmap"]
 
 if importlib.util.find_spec("yaml"):
     ALLOWED_EXPORT_TYPES += ["yaml"]
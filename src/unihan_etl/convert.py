@@ -0,0 +1,233 @@
+"""Convert text between simplified and traditional Chinese characters.
+
+:class:`Converter` compiles ``kSimplifiedVariant`` and ``kTraditionalVariant``
+into :meth:`str.translate` tables, so converting text runs at C speed rather
+than looking up characters one by one in Python.
+
+A character with a single variant in the target script maps to it. One with
+several, such as 么 (``U+5E7A U+9EBC U+9EBD``), is ambiguous: it's kept as is
+when it's itself among its variants, else it maps to the first variant UNIHAN
+lists. Its variants are kept in an ambiguity table, which
+:meth:`Converter.ambiguities` checks text against.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import typing as t
+
+from unihan_etl.core import Packager
+from unihan_etl.options import Options
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from unihan_etl.variants import VariantGraph
+
+#: Scripts text converts to: simplified (``hans``) or traditional (``hant``).
+ConversionTarget = t.Literal["hans", "hant"]
+
+#: Field giving a character's variants in each target script.
+CONVERSION_FIELDS: dict[ConversionTarget, str] = {
+    "hans": "kSimplifiedVariant",
+    "hant": "kTraditionalVariant",
+}
+
+
+class Ambiguity(t.NamedTuple):
+    """A character of some text with several variants in the target script."""
+
+    #: Position of the character in the text.
+    position: int
+    #: The character.
+    char: str
+    #: Its variants, in UNIHAN's order.
+    candidates: tuple[str, ...]
+
+
+class Converter:
+    """Convert text between simplified and traditional characters.
+
+    Build one with :meth:`from_graph` or :meth:`from_options`.
+
+    Parameters
+    ----------
+    variants : dict
+        for each target, the variants of each character in the target script
+
+    Examples
+    --------
+    >>> converter = Converter(
+    ...     {
+    ...         "hans": {"說": ("说",), "髮": ("发",), "發": ("发",)},
+    ...         "hant": {"说": ("說",), "发": ("發", "髮"), "台": ("台", "臺", "颱")},
+    ...     },
+    ... )
+    >>> converter.convert("头发说台", to="hant")
+    '头發說台'
+    >>> converter.convert("頭髮說", to="hans")
+    '頭发说'
+    >>> converter.ambiguities("头发说台", to="hant")
+    [Ambiguity(position=1, char='发', candidates=('發', '髮')),
+     Ambiguity(position=3, char='台', candidates=('台', '臺', '颱'))]
+    """
+
+    def __init__(
+        self,
+        variants: Mapping[ConversionTarget, Mapping[str, tuple[str, ...]]],
+    ) -> None:
+        """Compile the translation and ambiguity tables of ``variants``."""
+        self._tables: dict[str, dict[int, str]] = {}
+        self._ambiguous: dict[str, dict[str, tuple[str, ...]]] = {}
+        self._ambiguous_pattern: dict[str, re.Pattern[str] | None] = {}
+        for target in CONVERSION_FIELDS:
+            table: dict[int, str] = {}
+            ambiguous: dict[str, tuple[str, ...]] = {}
+            for char, candidates in variants.get(target, {}).items():
+                if len(candidates) > 1:
+                    ambiguous[char] = candidates
+                    if char in candidates:
+                        continue
+                if candidates and candidates[0] != char:
+                    table[ord(char)] = candidates[0]
+            self._tables[target] = table
+            self._ambiguous[target] = ambiguous
+            self._ambiguous_pattern[target] = (
+                re.compile(f"[{re.escape(''.join(ambiguous))}]") if ambiguous else None
+            )
+
+    @classmethod
+    def from_graph(cls, graph: VariantGraph) -> Converter:
+        """Build a converter from the edges of a variant graph.
+
+        Parameters
+        ----------
+        graph : :class:`~unihan_etl.variants.VariantGraph`
+            graph holding ``kSimplifiedVariant`` and ``kTraditionalVariant``
+
+        Returns
+        -------
+        :class:`Converter` :
+            the converter
+        """
+        variants: dict[ConversionTarget, dict[str, tuple[str, ...]]] = {
+            target: {} for target in CONVERSION_FIELDS
+        }
+        for target, field in CONVERSION_FIELDS.items():
+            for edge in graph:
+                if edge.field == field:
+                    candidates = variants[target].setdefault(edge.char, ())
+                    variants[target][edge.char] = (*candidates, edge.variant)
+        return cls(variants)
+
+    @classmethod
+    def from_options(cls, options: Options) -> Converter:
+        """Build a converter from the UNIHAN download of ``options``.
+
+        The download is fetched first, if missing.
+        """
+        return cls.from_graph(Packager(options).export_variants())
+
+    def table(self, to: ConversionTarget = "hant") -> dict[int, str]:
+        """Return the :meth:`str.translate` table converting to ``to``."""
+        return self._tables[self._check_target(to)]
+
+    def ambiguous(self, to: ConversionTarget = "hant") -> dict[str, tuple[str, ...]]:
+        """Return the characters with several variants in ``to``, by character."""
+        return self._ambiguous[self._check_target(to)]
+
+    def convert(self, text: str, to: ConversionTarget = "hant") -> str:
+        """Return ``text`` converted to simplified or traditional characters.
+
+        Parameters
+        ----------
+        text : str
+            text to convert
+        to : str
+            ``hans`` for simplified characters, ``hant`` for traditional ones
+
+        Returns
+        -------
+        str :
+            the converted text; characters without variants are kept
+
+        Raises
+        ------
+        ValueError :
+            if ``to`` isn't a conversion target
+        """
+        return text.translate(self.table(to))
+
+    def ambiguities(self, text: str, to: ConversionTarget = "hant") -> list[Ambiguity]:
+        """Return the characters of ``text`` whose conversion is ambiguous.
+
+        Parameters
+        ----------
+        text : str
+            text, before conversion
+        to : str
+            ``hans`` or ``hant``
+
+        Returns
+        -------
+        list of :class:`Ambiguity` :
+            in text order
+        """
+        pattern = self._ambiguous_pattern[self._check_target(to)]
+        if pattern is None:
+            return []
+        ambiguous = self._ambiguous[to]
+        return [
+            Ambiguity(match.start(), match[0], ambiguous[match[0]])
+            for match in pattern.finditer(text)
+        ]
+
+    def _check_target(self, to: str) -> str:
+        if to not in CONVERSION_FIELDS:
+            msg = f"Unknown conversion target: {to!r}, expected one of: " + ", ".join(
+                CONVERSION_FIELDS,
+            )
+            raise ValueError(msg)
+        return to
+
+
+@functools.cache
+def default_converter() -> Converter:
+    """Return the converter of the default UNIHAN download, built once."""
+    return Converter.from_options(Options(format="python"))
+
+
+def convert(
+    text: str,
+    to: ConversionTarget = "hant",
+    converter: Converter | None = None,
+) -> str:
+    """Return ``text`` converted to simplified or traditional characters.
+
+    Parameters
+    ----------
+    text : str
+        text to convert
+    to : str
+        ``hans`` for simplified characters, ``hant`` for traditional ones
+    converter : :class:`Converter`, optional
+        converter to use, :func:`default_converter` by default
+
+    Returns
+    -------
+    str :
+        the converted text
+    """
+    return (converter or default_converter()).convert(text, to=to)
+
+
+def convert_lines(
+    lines: Iterable[str],
+    to: ConversionTarget = "hant",
+    converter: Converter | None = None,
+) -> Iterator[str]:
+    """Yield each of ``lines`` converted, for streaming large inputs."""
+    table = (converter or default_converter()).table(to)
+    for line in lines:
+        yield line.translate(table)
@@ -4,13 +4,23 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import concurrent.futures
 import csv
 import dataclasses
+import enum
 import fileinput
 import functools
+import hashlib
+import heapq
+import io
+import itertools
 import json
 import logging
+import operator
+import os
 import pathlib
+import pickle
 import shutil
 import sys
 import typing as t
@@ -25,8 +35,10 @@ from unihan_etl.__about__ import (
 )
 from unihan_etl.constants import (
     ALLOWED_EXPORT_TYPES,
+    CJK_BLOCKS,
     DESTINATION_DIR,
     INDEX_FIELDS,
+    UNIHAN_FIELD_FILES,
     UNIHAN_FIELDS,
     UNIHAN_FILES,
     UNIHAN_MANIFEST,
@@ -34,18 +46,33 @@ from unihan_etl.constants import (
     UNIHAN_ZIP_PATH,
     WORK_DIR,
 )
+from unihan_etl.index import UnihanIndex, get_index_path
+from unihan_etl.interning import Interner
+from unihan_etl.mmap_export import export_mmap
 from unihan_etl.options import Options
-from unihan_etl.util import _dl_progress, get_fields, ucn_to_unicode
+from unihan_etl.sqlite_export import export_sqlite
+from unihan_etl.table import UnihanTable
+from unihan_etl.util import (
+    _dl_progress,
+    get_fields,
+    json_default,
+    parse_codepoint_range,
+    parse_condition,
+    ucn_to_unicode,
+)
+from unihan_etl.variants import VARIANT_FIELDS, VariantGraph, get_variants_path
 
 if t.TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
     from typing import TypeGuard
 
+    from unihan_etl.interning import InternStats
     from unihan_etl.types import (
         ColumnData,
         ExpandedExport,
         ListifiedExport,
         LogLevel,
+        ParsedLine,
         ReportHookFn,
         StrPath,
         UntypedNormalizedData,
@@ -67,7 +94,7 @@ def in_fields(
     fields: Sequence[str],
 ) -> bool:
     """Return True if string is in the default fields."""
-    return c in tuple(fields) + INDEX_FIELDS
+    return c in fields or c in INDEX_FIELDS
 
 
 def filter_manifest(
@@ -96,20 +123,90 @@ class FileNotSupported(Exception):
         super().__init__(f"File not supported: '{field}'")
 
 
+class BlockNotFound(Exception):
+    """Raise if block requested is not in :data:`~unihan_etl.constants.CJK_BLOCKS`."""
+
+    def __init__(self, block: str) -> None:
+        super().__init__(f"Block not found: '{block}'")
+
+
+class InvalidWorkers(Exception):
+    """Raise if the number of worker processes requested is negative."""
+
+    def __init__(self, workers: int) -> None:
+        super().__init__(
+            f"Invalid number of workers: {workers} (use 0 for one per CPU)",
+        )
+
+
 #: Return list of files from list of fields.
 def get_files(fields: Sequence[str]) -> list[str]:
-    """Return list of files required by fields. Simple dependency resolver."""
+    """Return list of files required by fields, in :data:`UNIHAN_FILES` order.
+
+    Each field is resolved through :data:`~unihan_etl.constants.UNIHAN_FIELD_FILES`.
+    """
     files = set()
 
     for field in fields:
-        if field in UNIHAN_FIELDS:
-            for file_, file_fields in UNIHAN_MANIFEST.items():
-                if any(file_ for h in fields if h in file_fields):
-                    files.add(file_)
-        else:
+        if field not in UNIHAN_FIELD_FILES:
             raise FieldNotFound(str(field))
+        files.add(UNIHAN_FIELD_FILES[field])
+
+    return [file_ for file_ in UNIHAN_FILES if file_ in files]
+
 
-    return list(files)
+class ProjectionPlan(t.NamedTuple):
+    """The files and lines to read for a set of fields, per :func:`plan_projection`."""
+
+    #: Fields of the records, in column order.
+    fields: tuple[str, ...]
+    #: Fields whose lines are kept; lines of any other field are rejected.
+    wanted: frozenset[str]
+    #: Files to read, those holding a wanted field.
+    files: tuple[str, ...]
+
+
+def plan_projection(
+    fields: Sequence[str],
+    files: Sequence[str],
+) -> ProjectionPlan:
+    """Return which of ``files`` to read, and which lines to keep, for ``fields``.
+
+    Files known to :data:`~unihan_etl.constants.UNIHAN_MANIFEST` without any
+    of ``fields`` are skipped without being opened. Files it doesn't list are
+    kept, as their fields are unknown.
+
+    Parameters
+    ----------
+    fields : list of str
+        fields to pull, index fields included or not
+    files : list of str
+        UNIHAN data file names to choose from
+
+    Returns
+    -------
+    :class:`ProjectionPlan` :
+        the plan
+
+    Examples
+    --------
+    >>> plan = plan_projection(["ucn", "char", "kDefinition"], UNIHAN_FILES)
+    >>> plan.files
+    ('Unihan_Readings.txt',)
+    >>> sorted(plan.wanted)
+    ['kDefinition']
+    """
+    wanted = frozenset(fields).difference(INDEX_FIELDS)
+    return ProjectionPlan(
+        fields=tuple(fields),
+        wanted=wanted,
+        files=tuple(
+            file_
+            for file_ in files
+            if file_ not in UNIHAN_MANIFEST
+            or not wanted.isdisjoint(UNIHAN_MANIFEST[file_])
+        ),
+    )
 
 
 DEFAULT_OPTIONS = Options()
@@ -147,7 +244,10 @@ def get_parser() -> argparse.ArgumentParser:
         "-d",
         "--destination",
         dest="destination",
-        help=f"Output of .csv. Default: {DESTINATION_DIR}/unihan.{{json,csv,yaml}}",
+        help=(
+            "Output of .csv. "
+            f"Default: {DESTINATION_DIR}/unihan.{{json,ndjson,csv,yaml,sqlite}}"
+        ),
     )
     parser.add_argument(
         "-w",
@@ -183,6 +283,31 @@ def get_parser() -> argparse.ArgumentParser:
         action="store_false",
         help="Don't reuse the cached UNIHAN zip (force re-download and re-extract).",
     )
+    parser.add_argument(
+        "--no-extract",
+        dest="extract",
+        action="store_false",
+        help="Read data straight from the zip instead of extracting to work dir.",
+    )
+    parser.add_argument(
+        "--compact",
+        dest="compact",
+        action="store_true",
+        help="Write JSON and NDJSON without whitespace.",
+    )
+    parser.add_argument(
+        "--export-cache",
+        dest="export_cache",
+        action="store_true",
+        help="Reuse the output of an identical earlier export.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="workers",
+        type=int,
+        help="Processes to parse data files in. 0 uses one per CPU. Default: 1",
+    )
     parser.add_argument(
         "-f",
         "--fields",
@@ -203,6 +328,32 @@ def get_parser() -> argparse.ArgumentParser:
             f"All files used by default. Files: {', '.join(UNIHAN_FILES)}"
         ),
     )
+    parser.add_argument(
+        "--where",
+        dest="where",
+        action="append",
+        type=parse_condition,
+        metavar="FIELD[=VALUE]",
+        help=(
+            "Export only characters with FIELD, or where a value of FIELD is "
+            "VALUE, matched on raw values. Repeat to require several."
+        ),
+    )
+    parser.add_argument(
+        "--codepoint-range",
+        dest="codepoint_ranges",
+        action="append",
+        type=parse_codepoint_range,
+        metavar="FIRST-LAST",
+        help="Export only characters in a range, e.g. U+4E00-U+9FFF. Repeatable.",
+    )
+    parser.add_argument(
+        "--block",
+        dest="blocks",
+        action="append",
+        choices=list(CJK_BLOCKS),
+        help="Export only characters in a CJK block. Repeatable.",
+    )
     parser.add_argument(
         "-l",
         "--log_level",
@@ -261,6 +412,45 @@ def has_valid_zip(zip_path: StrPath) -> bool:
     return _zip_integrity_ok(str(zip_path), st.st_mtime_ns, st.st_size)
 
 
+@functools.lru_cache(maxsize=256)
+def _zip_fingerprint(zip_path: str, mtime_ns: int, size: int) -> str:
+    """Return the hex fingerprint of a zip's member names, sizes, and CRCs.
+
+    Memoized on the file's ``(path, mtime_ns, size)`` like
+    :func:`_zip_integrity_ok`. Only the central directory is read; no member is
+    decompressed.
+    """
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in sorted(zf.infolist(), key=lambda i: i.filename):
+            digest.update(
+                f"{info.filename}\t{info.file_size}\t{info.CRC:08x}\n".encode(),
+            )
+    return digest.hexdigest()[:16]
+
+
+def zip_fingerprint(zip_path: StrPath) -> str:
+    """Return a fingerprint identifying the contents of the zip at ``zip_path``.
+
+    Two archives holding the same members with the same CRCs share a
+    fingerprint, wherever they live and whenever they were downloaded. Artifacts
+    derived from the zip, such as the codepoint index, are keyed by it.
+
+    Parameters
+    ----------
+    zip_path : str or pathlib.Path
+        absolute path to zip
+
+    Returns
+    -------
+    str :
+        16 hex digits
+    """
+    zip_path = pathlib.Path(zip_path)
+    st = zip_path.stat()
+    return _zip_fingerprint(str(zip_path), st.st_mtime_ns, st.st_size)
+
+
 def zip_has_files(files: list[str], zip_file: zipfile.ZipFile) -> bool:
     """Return True if zip has the files inside.
 
@@ -345,6 +535,66 @@ def load_data(
     return raw_data
 
 
+def _iter_file_lines(path: pathlib.Path | str) -> Iterator[str]:
+    with pathlib.Path(path).open(encoding="utf-8") as f:
+        yield from f
+
+
+def load_data_streams(
+    files: Sequence[pathlib.Path | str],
+) -> list[Iterator[str]]:
+    """Return one lazily opened line stream per UNIHAN data file.
+
+    Unlike :func:`load_data`, the files are kept apart, so
+    :func:`stream_normalize` can merge them by codepoint. Each file is opened on
+    first read and closed once exhausted.
+
+    Parameters
+    ----------
+    files : list of str or pathlib.Path
+
+    Returns
+    -------
+    list :
+        line iterators, in the order of ``files``
+    """
+    log.info(f"Loading data: {', '.join([str(s) for s in files])}")
+    return [_iter_file_lines(f) for f in files]
+
+
+def _iter_zip_member_lines(zip_path: pathlib.Path | str, member: str) -> Iterator[str]:
+    with (
+        zipfile.ZipFile(zip_path) as zf,
+        io.TextIOWrapper(zf.open(member), encoding="utf-8") as f,
+    ):
+        yield from f
+
+
+def load_zip_streams(
+    zip_path: pathlib.Path | str,
+    files: Sequence[str],
+) -> list[Iterator[str]]:
+    """Return one line stream per UNIHAN data file, read straight from the zip.
+
+    The members are decompressed as they are read; nothing is extracted to
+    disk. Each member is opened on first read and closed once exhausted.
+
+    Parameters
+    ----------
+    zip_path : str or pathlib.Path
+        the UNIHAN zip
+    files : list of str
+        members of the zip, e.g. ``["Unihan_Readings.txt"]``
+
+    Returns
+    -------
+    list :
+        line iterators, in the order of ``files``
+    """
+    log.info(f"Loading data from {zip_path}: {', '.join(files)}")
+    return [_iter_zip_member_lines(zip_path, f) for f in files]
+
+
 def extract_zip(zip_path: pathlib.Path, dest_dir: pathlib.Path) -> zipfile.ZipFile:
     """Extract zip file. Return :class:`zipfile.ZipFile` instance.
 
@@ -370,6 +620,7 @@ def extract_zip(zip_path: pathlib.Path, dest_dir: pathlib.Path) -> zipfile.ZipFi
 def normalize(
     raw_data: fileinput.FileInput[t.Any],
     fields: Sequence[str],
+    sparse: bool = False,
 ) -> UntypedNormalizedData:
     """Return normalized data from a UNIHAN data files.
 
@@ -379,6 +630,10 @@ def normalize(
         combined text files from UNIHAN
     fields : list of str
         list of columns to pull
+    sparse : bool
+        hold only the fields a character has data for, rather than every one
+        of ``fields`` with ``None`` for those missing. See :func:`listify` for
+        a dense view.
 
     Returns
     -------
@@ -386,15 +641,16 @@ def normalize(
         list of unihan character information
     """
     log.info("Collecting field data...")
+    wanted = frozenset(fields).union(INDEX_FIELDS)
     items = {}
     for line in raw_data:
         if not_junk(line):
             line = line.strip().split("\t")
-            if in_fields(line[1], fields):
+            if line[1] in wanted:
                 item = dict(zip(["ucn", "field", "value"], line, strict=False))
                 char = ucn_to_unicode(item["ucn"])
                 if char not in items:
-                    items[char] = {}.fromkeys(fields)
+                    items[char] = {} if sparse else {}.fromkeys(fields)
                     items[char]["ucn"] = item["ucn"]
                     items[char]["char"] = char
                 items[char][item["field"]] = str(item["value"])
@@ -409,6 +665,380 @@ def normalize(
     return list(items.values())
 
 
+def merge_codepoint_ranges(
+    ranges: Iterable[tuple[int, int]],
+) -> tuple[tuple[int, int], ...]:
+    """Return ``(first, last)`` codepoint ranges sorted, with overlaps merged.
+
+    >>> merge_codepoint_ranges([(0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0x9000, 0xA000)])
+    ((13312, 19903), (19968, 40960))
+    """
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(last, merged[-1][1]))
+        else:
+            merged.append((first, last))
+    return tuple(merged)
+
+
+def _parse_lines(
+    lines: Iterable[str],
+    fields: frozenset[str],
+    codepoint_ranges: Sequence[tuple[int, int]] | None = None,
+) -> Iterator[ParsedLine]:
+    """Yield the lines of one UNIHAN file whose field is in ``fields``.
+
+    Lines are split at their first two tabs only, and those of other fields, as
+    well as comments and blank lines, rejected before the value is touched.
+    With ``codepoint_ranges``, sorted and merged per
+    :func:`merge_codepoint_ranges`, lines of other codepoints are rejected too,
+    and the file is left unread past the last range: files are sorted by
+    codepoint.
+    """
+    starts = [first for first, _ in codepoint_ranges or ()]
+    end = codepoint_ranges[-1][1] if codepoint_ranges else sys.maxunicode
+    for line in lines:
+        parts = line.split("\t", 2)
+        if len(parts) < 3 or parts[1] not in fields or line[0] == "#":
+            continue
+        ucn, field, value = parts
+        codepoint = int(ucn.removeprefix("U+"), 16)
+        if codepoint_ranges:
+            if codepoint > end:
+                return
+            i = bisect.bisect_right(starts, codepoint) - 1
+            if i < 0 or codepoint > codepoint_ranges[i][1]:
+                continue
+        yield codepoint, ucn, field, value.rstrip()
+
+
+def _check_sorted(parsed: Iterable[ParsedLine]) -> Iterator[ParsedLine]:
+    """Pass through the parsed lines of one file, checking their order.
+
+    Raises
+    ------
+    ValueError :
+        if the file is not sorted by codepoint, which the merge relies on
+    """
+    last_codepoint = -1
+    for parsed_line in parsed:
+        if parsed_line[0] < last_codepoint:
+            msg = (
+                f"UNIHAN data is not sorted by codepoint at {parsed_line[1]}; "
+                "sort the data files, or read them with normalize()"
+            )
+            raise ValueError(msg)
+        last_codepoint = parsed_line[0]
+        yield parsed_line
+
+
+def _merge_parsed(
+    parsed_streams: Iterable[Iterable[ParsedLine]],
+    fields: Sequence[str],
+    sparse: bool = False,
+) -> Iterator[dict[str, t.Any]]:
+    """K-way merge the parsed lines of each file into one record per character.
+
+    Sparse records skip empty values and keep their fields in the order of
+    ``fields``, as a dense record with its empty fields pruned would.
+    """
+    merged = heapq.merge(
+        *(_check_sorted(parsed) for parsed in parsed_streams),
+        key=operator.itemgetter(0),
+    )
+    position = {field: i for i, field in enumerate(fields)}
+
+    def field_position(field: str) -> int:
+        return position.get(field, len(position))
+
+    for codepoint, group in itertools.groupby(merged, key=operator.itemgetter(0)):
+        record: dict[str, t.Any]
+        if sparse:
+            lines = list(group)
+            record = {field: value for _, _, field, value in lines if value}
+            record["ucn"] = lines[0][1]
+            record["char"] = chr(codepoint)
+            yield {field: record[field] for field in sorted(record, key=field_position)}
+            continue
+
+        record = {}.fromkeys(fields)
+        for _, ucn, field, value in group:
+            record[field] = value
+            record["ucn"] = ucn
+        record["char"] = chr(codepoint)
+        yield record
+
+
+def stream_normalize(
+    raw_streams: Iterable[Iterable[str]],
+    fields: Sequence[str],
+    sparse: bool = False,
+    codepoint_ranges: Sequence[tuple[int, int]] | None = None,
+) -> Iterator[dict[str, t.Any]]:
+    """Yield normalized records one character at a time, in codepoint order.
+
+    Each UNIHAN file is sorted by codepoint, so the per-file line streams are
+    k-way merged rather than collected up front like :func:`normalize` does.
+    Only the record of the current character is held in memory.
+
+    Parameters
+    ----------
+    raw_streams : list of iterables of str
+        one line stream per UNIHAN file, per :func:`load_data_streams`
+    fields : list of str
+        list of columns to pull
+    sparse : bool
+        hold only the fields a character has data for, per :func:`normalize`
+    codepoint_ranges : list of tuple, optional
+        read only characters in these ``(first, last)`` codepoint ranges
+
+    Returns
+    -------
+    iterator of dict :
+        records shaped like :func:`normalize`'s
+
+    Raises
+    ------
+    ValueError :
+        if a file is not sorted by codepoint
+    """
+    wanted = frozenset(fields)
+    ranges = merge_codepoint_ranges(codepoint_ranges) if codepoint_ranges else None
+    return _merge_parsed(
+        (_parse_lines(lines, wanted, ranges) for lines in raw_streams),
+        fields,
+        sparse=sparse,
+    )
+
+
+def filter_records(
+    records: Iterable[dict[str, t.Any]],
+    where: Sequence[tuple[str, str | None]],
+    drop: Sequence[str] = (),
+) -> Iterator[dict[str, t.Any]]:
+    """Yield the normalized records meeting every condition of ``where``.
+
+    Conditions are checked on raw values, before expansion, so records that
+    fail them are never expanded.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        records from :func:`stream_normalize`, unexpanded
+    where : list of tuple
+        ``(field, value)`` conditions: a value of the field, or one of its
+        space-separated items, equals ``value``; or, if ``value`` is None,
+        the field has any value
+    drop : list of str
+        fields read only to check conditions, removed from matching records;
+        records without data for any other field are dropped whole
+
+    Returns
+    -------
+    iterator of dict :
+        the matching records
+
+    Examples
+    --------
+    >>> records = [
+    ...     {"char": "丘", "kMandarin": "qiū", "kTotalStrokes": "5"},
+    ...     {"char": "好", "kMandarin": "hǎo hào", "kTotalStrokes": "6"},
+    ... ]
+    >>> list(filter_records(records, [("kMandarin", "hào")], drop=["kMandarin"]))
+    [{'char': '好', 'kTotalStrokes': '6'}]
+    """
+    for record in records:
+        for field, value in where:
+            raw = record.get(field)
+            if not raw:
+                break
+            if value is not None and raw != value and value not in raw.split(" "):
+                break
+        else:
+            if not drop:
+                yield record
+                continue
+            for field in drop:
+                record.pop(field, None)
+            if any(v for k, v in record.items() if k not in INDEX_FIELDS):
+                yield record
+
+
+#: Size of the byte ranges :func:`parallel_normalize` splits data files into.
+PARALLEL_CHUNK_BYTES = 2 * 1024 * 1024
+
+
+def _finish_chunk(parsed: Iterable[ParsedLine], expand: bool) -> list[ParsedLine]:
+    if not expand:
+        return list(parsed)
+    return [
+        (codepoint, ucn, field, expansion.expand_field(field, value))
+        for codepoint, ucn, field, value in parsed
+    ]
+
+
+def _parse_file_chunk(
+    path: str,
+    start: int,
+    end: int,
+    fields: frozenset[str],
+    expand: bool,
+    codepoint_ranges: Sequence[tuple[int, int]] | None = None,
+) -> list[ParsedLine]:
+    """Parse the lines of a data file starting within bytes ``[start, end)``."""
+    lines: list[str] = []
+    with pathlib.Path(path).open("rb") as f:
+        if start:
+            # A line straddling ``start`` belongs to the chunk before.
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.decode("utf-8"))
+    return _finish_chunk(_parse_lines(lines, fields, codepoint_ranges), expand)
+
+
+def _parse_zip_member(
+    zip_path: str,
+    member: str,
+    fields: frozenset[str],
+    expand: bool,
+    codepoint_ranges: Sequence[tuple[int, int]] | None = None,
+) -> list[ParsedLine]:
+    """Parse a whole data file of the zip; compressed members can't be split."""
+    lines = _iter_zip_member_lines(zip_path, member)
+    return _finish_chunk(_parse_lines(lines, fields, codepoint_ranges), expand)
+
+
+def parallel_normalize(
+    files: Sequence[pathlib.Path | str],
+    fields: Sequence[str],
+    workers: int,
+    expand: bool = False,
+    zip_path: pathlib.Path | str | None = None,
+    sparse: bool = False,
+    codepoint_ranges: Sequence[tuple[int, int]] | None = None,
+) -> Iterator[dict[str, t.Any]]:
+    """Yield the records of :func:`stream_normalize`, parsed in a process pool.
+
+    Data files are split into line-aligned byte ranges of
+    :data:`PARALLEL_CHUNK_BYTES`, each parsed (and optionally expanded) in a
+    worker process. The chunks of each file are chained in order and the files
+    merged by codepoint, as in :func:`stream_normalize`. Parsed chunks are held
+    until they are merged, trading the streaming memory bound for speed.
+
+    Parameters
+    ----------
+    files : list of str or pathlib.Path
+        data files, or names of members of ``zip_path``
+    fields : list of str
+        list of columns to pull
+    workers : int
+        number of worker processes
+    expand : bool
+        expand values in the workers, per :func:`expand_record`
+    zip_path : str or pathlib.Path, optional
+        read ``files`` out of this zip. Each member is parsed whole by one
+        worker.
+    sparse : bool
+        hold only the fields a character has data for, per :func:`normalize`.
+        Fields left empty by expansion are dropped too.
+    codepoint_ranges : list of tuple, optional
+        read only characters in these ``(first, last)`` codepoint ranges
+
+    Returns
+    -------
+    iterator of dict :
+        records shaped like :func:`normalize`'s, expanded if ``expand``
+
+    Raises
+    ------
+    ValueError :
+        if a file is not sorted by codepoint
+    """
+    wanted = frozenset(fields)
+    ranges = merge_codepoint_ranges(codepoint_ranges) if codepoint_ranges else None
+    log.info(f"Parsing data files in {workers} processes")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        file_chunks: list[list[concurrent.futures.Future[list[ParsedLine]]]] = []
+        for f in files:
+            if zip_path is not None:
+                file_chunks.append(
+                    [
+                        executor.submit(
+                            _parse_zip_member,
+                            str(zip_path),
+                            str(f),
+                            wanted,
+                            expand,
+                            ranges,
+                        ),
+                    ],
+                )
+                continue
+            size = pathlib.Path(f).stat().st_size
+            file_chunks.append(
+                [
+                    executor.submit(
+                        _parse_file_chunk,
+                        str(f),
+                        start,
+                        start + PARALLEL_CHUNK_BYTES,
+                        wanted,
+                        expand,
+                        ranges,
+                    )
+                    for start in range(0, max(size, 1), PARALLEL_CHUNK_BYTES)
+                ],
+            )
+
+        yield from _merge_parsed(
+            (
+                itertools.chain.from_iterable(chunk.result() for chunk in chunks)
+                for chunks in file_chunks
+            ),
+            fields,
+            sparse=sparse,
+        )
+
+
+def expand_record(
+    record: dict[str, t.Any],
+    prune_empty: bool = False,
+    memo: expansion.ExpansionMemo | None = None,
+) -> dict[str, t.Any]:
+    """Expand the multi-value fields of one record in place and return it.
+
+    Parameters
+    ----------
+    record : dict
+        a record per :func:`normalize` or :func:`stream_normalize`
+    prune_empty : bool
+        also drop fields that are empty, before or after expansion, in the
+        same pass
+    memo : :class:`~unihan_etl.expansion.ExpansionMemo`, optional
+        expand through this memo, sharing frozen values between records
+
+    Returns
+    -------
+    dict :
+        the same record, per :func:`expand_delimiters`
+    """
+    expand_field = expansion.expand_field if memo is None else memo.expand
+    empty: list[str] = []
+    for field, value in record.items():
+        if value:
+            value = record[field] = expand_field(field, value)
+        if prune_empty and not value:
+            empty.append(field)
+    for field in empty:
+        del record[field]
+    return record
+
+
 def expand_delimiters(normalized_data: UntypedNormalizedData) -> ExpandedExport:
     """Return expanded multi-value fields in UNIHAN.
 
@@ -425,11 +1055,8 @@ def expand_delimiters(normalized_data: UntypedNormalizedData) -> ExpandedExport:
         (so all fields stay consistent).
     """
     for char in normalized_data:
-        for field in char:
-            assert isinstance(char, dict)
-            if not char[field]:
-                continue
-            char[field] = expansion.expand_field(field, char[field])
+        assert isinstance(char, dict)
+        expand_record(char)
 
     return normalized_data
 
@@ -443,41 +1070,146 @@ def listify(
     Parameters
     ----------
     data : list of dict
+        records, dense or sparse
     params : list of str
         keys/columns, e.g. ['kDictionary']
+
+    Returns
+    -------
+    list of list :
+        the header, then one row per record with a cell per column. Fields a
+        sparse record lacks are ``None``.
     """
     list_data = [list(fields)]  # Add fields to first row
-    list_data += [list(r.values()) for r in list(data)]
+    list_data += [_dense_row(r, fields) for r in data]
     return list_data
 
 
+def _dense_row(record: Mapping[str, t.Any], fields: Sequence[str]) -> list[t.Any]:
+    return [record.get(field) for field in fields]
+
+
 def export_csv(
-    data: UntypedNormalizedData,
+    data: Iterable[UntypedUnihanData],
     destination: StrPath,
     fields: ColumnData,
 ) -> None:
-    """Export UNIHAN in flattened, CSV format."""
-    listified_data = listify(data, fields)
+    """Export UNIHAN in flattened, CSV format.
 
+    Rows are written as ``data`` yields them, as :func:`listify` would lay
+    them out.
+    """
     with pathlib.Path(destination).open("w", encoding="utf-8") as f:
         csvwriter = csv.writer(f)
-        csvwriter.writerows(listified_data)
+        csvwriter.writerow(list(fields))
+        csvwriter.writerows(_dense_row(r, fields) for r in data)
+        log.info("Saved output to: %s", destination)
+
+
+def export_json(
+    data: Iterable[UntypedUnihanData],
+    destination: StrPath,
+    compact: bool = False,
+) -> None:
+    """Export UNIHAN in JSON format.
+
+    Records are encoded and written one at a time, as ``data`` yields them,
+    into a JSON array. The document is the same as dumping the whole list at
+    once with :func:`json.dump`.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        records
+    destination : str or pathlib.Path
+        file to write
+    compact : bool
+        write without indentation or spaces after separators
+    """
+    if compact:
+        encoder = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=json_default,
+        )
+        opening, separator, closing = "[", ",", "]"
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2, default=json_default)
+        opening, separator, closing = "[\n  ", ",\n  ", "\n]"
+
+    with pathlib.Path(destination).open("w", encoding="utf-8") as f:
+        written = False
+        for record in data:
+            f.write(separator if written else opening)
+            encoded = encoder.encode(record)
+            f.write(encoded if compact else encoded.replace("\n", "\n  "))
+            written = True
+        f.write(closing if written else "[]")
         log.info("Saved output to: %s", destination)
 
 
-def export_json(data: UntypedNormalizedData, destination: StrPath) -> None:
-    """Export UNIHAN in JSON format."""
+def export_ndjson(
+    data: Iterable[UntypedUnihanData],
+    destination: StrPath,
+    compact: bool = False,
+) -> None:
+    """Export UNIHAN in newline-delimited JSON, one record per line.
+
+    Lines are written as ``data`` yields records, so the file can be split on
+    newlines and its chunks processed independently.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        records
+    destination : str or pathlib.Path
+        file to write
+    compact : bool
+        write without spaces after separators
+    """
+    encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        separators=(",", ":") if compact else None,
+        default=json_default,
+    )
     with pathlib.Path(destination).open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.writelines(f"{encoder.encode(record)}\n" for record in data)
         log.info("Saved output to: %s", destination)
 
 
-def export_yaml(data: UntypedNormalizedData, destination: StrPath) -> None:
-    """Export UNIHAN in YAML format."""
+def export_yaml(data: Iterable[UntypedUnihanData], destination: StrPath) -> None:
+    """Export UNIHAN in YAML format.
+
+    Each record is dumped as a one-item block sequence as ``data`` yields it;
+    the concatenation is the same document as dumping the whole list at once.
+    Values frozen by an :class:`~unihan_etl.expansion.ExpansionMemo` are
+    dumped as lists and mappings, and enums as their value.
+    """
     import yaml
 
+    class Dumper(yaml.SafeDumper):
+        """Safe dumper representing expanded values as plain YAML."""
+
+    Dumper.add_representer(expansion.FrozenDict, yaml.SafeDumper.represent_dict)
+    Dumper.add_representer(tuple, yaml.SafeDumper.represent_list)
+    Dumper.add_multi_representer(
+        enum.Enum,
+        lambda dumper, value: dumper.represent_data(value.value),
+    )
+
     with pathlib.Path(destination).open("w", encoding="utf-8") as f:
-        yaml.safe_dump(data, stream=f, allow_unicode=True, default_flow_style=False)
+        empty = True
+        for record in data:
+            yaml.dump(
+                [record],
+                stream=f,
+                Dumper=Dumper,
+                allow_unicode=True,
+                default_flow_style=False,
+            )
+            empty = False
+        if empty:
+            yaml.safe_dump([], stream=f)
         log.info("Saved output to: %s", destination)
 
 
@@ -504,7 +1236,9 @@ def validate_options(
         options.input_files,
     ):
         # Filter files when only field specified.
-        options.input_files = get_files(options.fields)
+        options.input_files = get_files(
+            [*options.fields, *(field for field, _ in options.where)],
+        )
     elif not is_default_option("fields", options.fields) and not is_default_option(
         "input_files",
         options.input_files,
@@ -517,9 +1251,91 @@ def validate_options(
         ]
         if not_in_field:
             raise FieldNotFound(", ".join(not_in_field))
+
+    not_found = [field for field, _ in options.where if field not in UNIHAN_FIELDS]
+    if not_found:
+        raise FieldNotFound(", ".join(not_found))
+    if not is_default_option("input_files", options.input_files):
+        fields_in_files = get_fields(filter_manifest(options.input_files))
+        not_in_files = [f for f, _ in options.where if f not in fields_in_files]
+        if not_in_files:
+            raise FieldNotFound(", ".join(not_in_files))
+    for block in options.blocks:
+        if block not in CJK_BLOCKS:
+            raise BlockNotFound(block)
+    if options.workers < 0:
+        raise InvalidWorkers(options.workers)
     return True
 
 
+def _link_or_copy(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """Hard link ``src`` to ``dst``, replacing it; copy across file systems."""
+    tmp_path = dst.parent / (dst.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copyfile(src, tmp_path)
+    tmp_path.replace(dst)
+
+
+#: Pickle protocol of python export snapshots in the export cache.
+SNAPSHOT_PROTOCOL = 5
+
+
+def write_snapshot(data: UntypedNormalizedData, destination: StrPath) -> None:
+    """Pickle records of a ``python`` export to ``destination``.
+
+    The snapshot is written to a sibling temp file and moved over
+    ``destination``, so a reader never sees a partial one.
+
+    Parameters
+    ----------
+    data : list of dict
+        records, as returned by :meth:`Packager.export`
+    destination : str or pathlib.Path
+        file to write
+    """
+    destination = pathlib.Path(destination)
+    tmp_path = destination.parent / (destination.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(data, f, protocol=SNAPSHOT_PROTOCOL)
+    tmp_path.replace(destination)
+
+
+def load_snapshot(path: StrPath) -> UntypedNormalizedData | None:
+    """Return the records pickled by :func:`write_snapshot`.
+
+    Snapshots are only read from the export cache, which is trusted like the
+    zip next to it; unpickling runs code named in the file.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        snapshot file
+
+    Returns
+    -------
+    list of dict or None :
+        the records, or None if the snapshot is missing or unreadable
+    """
+    try:
+        with pathlib.Path(path).open("rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (
+        OSError,
+        EOFError,
+        ImportError,
+        AttributeError,
+        pickle.UnpicklingError,
+    ) as e:
+        log.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+    return t.cast("UntypedNormalizedData", data)
+
+
 class Packager:
     """Download, ETL, and customize an export of UNIHAN.
 
@@ -527,6 +1343,10 @@ class Packager:
     """
 
     options: Options
+    #: Memo values are expanded through, if ``memoize_expansion`` is on.
+    expansion_memo: expansion.ExpansionMemo | None
+    #: What the last ``python`` export shared, if ``intern_values`` is on.
+    intern_stats: InternStats | None = None
 
     def __init__(
         self,
@@ -552,10 +1372,16 @@ class Packager:
         )
 
         self.options = merged_options
+        self.expansion_memo = (
+            expansion.ExpansionMemo() if merged_options.memoize_expansion else None
+        )
 
     def download(self, urlretrieve_fn: t.Any = urlretrieve) -> None:
         """Download raw UNIHAN data if not exists.
 
+        The zip is extracted into ``work_dir`` unless ``extract`` is off, in
+        which case :meth:`iter_records` reads the zip directly.
+
         Parameters
         ----------
         urlretrieve_fn : function
@@ -570,22 +1396,242 @@ class Packager:
                 cache=self.options.cache,
             )
 
+        if not self.options.extract:
+            return
+
         if (
             not files_exist(self.options.work_dir, self.options.input_files)
             or not self.options.cache
         ):
             extract_zip(self.options.zip_path, self.options.work_dir)
 
-    def export(self) -> UntypedNormalizedData | None:
-        """Extract zip and process information into CSV's."""
+    def build_index(self) -> pathlib.Path:
+        """Build the codepoint index of the downloaded zip if it is missing.
+
+        The index holds every field of every character, expanded and pruned,
+        whatever fields, files and row filters these options select. It is keyed by
+        :func:`zip_fingerprint`, so a new UNIHAN release gets a fresh index and
+        indexes of earlier zips at the same location are removed.
+
+        Returns
+        -------
+        pathlib.Path :
+            path of the index, for :class:`~unihan_etl.index.UnihanIndex`
+        """
+        zip_path = pathlib.Path(self.options.zip_path)
+        index_path = get_index_path(zip_path, zip_fingerprint(zip_path))
+        if index_path.exists() and self.options.cache:
+            return index_path
+
+        # Filters and ways of holding records in memory don't carry over: the
+        # index serves every search of the zip
+        packager = Packager(
+            dataclasses.replace(
+                self.options,
+                fields=DEFAULT_OPTIONS.fields,
+                input_files=DEFAULT_OPTIONS.input_files,
+                format="python",
+                expand=True,
+                prune_empty=True,
+                where=DEFAULT_OPTIONS.where,
+                codepoint_ranges=DEFAULT_OPTIONS.codepoint_ranges,
+                blocks=DEFAULT_OPTIONS.blocks,
+                memoize_expansion=DEFAULT_OPTIONS.memoize_expansion,
+                lazy_expansion=DEFAULT_OPTIONS.lazy_expansion,
+                intern_values=DEFAULT_OPTIONS.intern_values,
+            ),
+        )
+        packager.download()
+        data = packager.export()
+        assert data is not None
+        UnihanIndex.build(data, index_path).close()
+
+        for stale in index_path.parent.glob("unihan-index-*.sqlite3"):
+            if stale != index_path:
+                log.info("Removing stale index: %s", stale)
+                stale.unlink(missing_ok=True)
+
+        return index_path
+
+    def _get_fields(self) -> list[str]:
+        """Return the export's columns: the selected fields, index fields first."""
         fields = list(self.options.fields)
         for k in INDEX_FIELDS:
             if k not in fields:
                 fields.insert(0, k)
+        return fields
+
+    def _get_codepoint_ranges(self) -> tuple[tuple[int, int], ...]:
+        """Return the codepoint ranges and blocks to export, merged."""
+        return merge_codepoint_ranges(
+            [
+                *self.options.codepoint_ranges,
+                *(CJK_BLOCKS[block] for block in self.options.blocks),
+            ],
+        )
 
-        files = [
-            pathlib.Path(self.options.work_dir) / f for f in self.options.input_files
-        ]
+    def iter_records(self) -> Iterator[MutableMapping[str, t.Any]]:
+        """Yield processed records one character at a time, in codepoint order.
+
+        Records are normalized by :func:`stream_normalize` and, unless the
+        format is CSV, expanded and pruned per the options as they are
+        produced. Data is read from ``work_dir``, or from the zip itself when
+        ``extract`` is off. With ``workers`` other than 1, files are parsed and
+        expanded in a process pool by :func:`parallel_normalize`.
+
+        Records are sparse, holding only the fields a character has data for,
+        unless unpruned fields are to be exported: CSV rows are laid out from
+        sparse records, and pruning a sparse record is a no-op.
+
+        Only the input files holding a selected field are read, per
+        :func:`plan_projection`. Lines outside ``codepoint_ranges`` and
+        ``blocks`` are rejected as they are read, and records failing ``where``
+        are dropped by :func:`filter_records` before they are expanded.
+
+        With ``memoize_expansion``, values are expanded through
+        :attr:`expansion_memo`, in this process. With ``lazy_expansion``,
+        ``python`` records are yielded unexpanded, as
+        :class:`~unihan_etl.expansion.LazyRecord`.
+
+        Returns
+        -------
+        iterator of dict :
+            records as :meth:`export` writes them
+
+        Raises
+        ------
+        ValueError :
+            if a data file is not sorted by codepoint, as the merge requires
+        """
+        fields = self._get_fields()
+        where = self.options.where
+        where_only = list(dict.fromkeys(f for f, _ in where if f not in fields))
+        plan = plan_projection([*fields, *where_only], self.options.input_files)
+        ranges = self._get_codepoint_ranges() or None
+        files: list[pathlib.Path | str]
+        if self.options.extract:
+            files = [pathlib.Path(self.options.work_dir) / f for f in plan.files]
+        else:
+            files = list(plan.files)
+        expand = self.options.expand and self.options.format != "csv"
+        prune_empty = expand and self.options.prune_empty
+        sparse = prune_empty or self.options.format == "csv"
+        workers = self.options.workers or os.cpu_count() or 1
+
+        # Conditions are checked on raw values, so workers mustn't expand them;
+        # values expanded in workers couldn't be shared through the memo
+        memo = self.expansion_memo
+        lazy = self.options.lazy_expansion and self.options.format == "python"
+        expand_in_workers = workers > 1 and not where and memo is None and not lazy
+        records: Iterator[dict[str, t.Any]]
+        if workers > 1:
+            records = parallel_normalize(
+                files,
+                plan.fields,
+                workers=workers,
+                expand=expand_in_workers and expand,
+                zip_path=None if self.options.extract else self.options.zip_path,
+                sparse=sparse,
+                codepoint_ranges=ranges,
+            )
+        elif self.options.extract:
+            records = stream_normalize(
+                load_data_streams(files),
+                plan.fields,
+                sparse=sparse,
+                codepoint_ranges=ranges,
+            )
+        else:
+            records = stream_normalize(
+                load_zip_streams(self.options.zip_path, plan.files),
+                plan.fields,
+                sparse=sparse,
+                codepoint_ranges=ranges,
+            )
+
+        if where:
+            records = filter_records(records, where, drop=where_only)
+
+        if not expand or expand_in_workers:
+            yield from records
+            return
+
+        if lazy:
+            expand_field = expansion.expand_field if memo is None else memo.expand
+            for record in records:
+                yield expansion.LazyRecord(record, expand_field)
+            return
+
+        for record in records:
+            # expand data hierarchically
+            yield expand_record(record, prune_empty=prune_empty, memo=memo)
+
+        if memo is not None:
+            log.debug("Expansion memo: %s", memo.stats())
+
+    def export_cache_path(self) -> pathlib.Path:
+        """Return where the export cache keeps the output of these options.
+
+        The key hashes the unihan-etl version and every option that shapes the
+        output. Entries are named after the :func:`zip_fingerprint` of the
+        zip they were exported from and kept in an ``exports`` directory next
+        to it. ``python`` exports are kept as ``.pickle`` snapshots, see
+        :func:`write_snapshot`.
+
+        Returns
+        -------
+        pathlib.Path :
+            cache entry, which may not exist yet
+        """
+        zip_path = pathlib.Path(self.options.zip_path)
+        key = {
+            "version": __version__,
+            "fields": self._get_fields(),
+            "input_files": sorted(self.options.input_files),
+            "format": self.options.format,
+            "expand": self.options.expand,
+            "prune_empty": self.options.prune_empty,
+            "compact": self.options.compact,
+            "where": sorted(self.options.where, key=str),
+            "codepoint_ranges": self._get_codepoint_ranges(),
+            "memoize_expansion": self.options.memoize_expansion,
+            "intern_values": self.options.intern_values,
+            "lazy_expansion": self.options.lazy_expansion,
+        }
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8"),
+        ).hexdigest()[:16]
+        ext = "pickle" if self.options.format == "python" else self.options.format
+        return (
+            zip_path.parent
+            / "exports"
+            / f"unihan-{zip_fingerprint(zip_path)}-{digest}.{ext}"
+        )
+
+    def _prune_export_cache(self, cache_path: pathlib.Path) -> None:
+        """Remove cache entries exported from other zips than ``cache_path``'s."""
+        fingerprint = cache_path.name.split("-")[1]
+        for stale in cache_path.parent.glob("unihan-*"):
+            if stale.name.split("-")[1] != fingerprint:
+                log.info("Removing stale cached export: %s", stale)
+                stale.unlink(missing_ok=True)
+
+    def export(self) -> UntypedNormalizedData | None:
+        """Extract zip and process information into CSV's.
+
+        CSV and YAML are written as records are produced, holding one character
+        in memory at a time.
+
+        With ``export_cache`` on, files are also kept in the export cache (see
+        :meth:`export_cache_path`) and a later export with the same zip and
+        options is linked from there instead of being processed again. For
+        ``python`` exports, the records are loaded from a pickled snapshot.
+
+        With ``intern_values``, the values of ``python`` exports are interned
+        as records are produced, and :attr:`intern_stats` tells the bytes
+        saved, net of the interner's tables, freed after the export.
+        """
+        fields = self._get_fields()
 
         # Replace {ext} with extension to use.
         self.options.destination = pathlib.Path(
@@ -595,32 +1641,131 @@ class Packager:
         if not self.options.destination.parent.exists():
             self.options.destination.parent.mkdir(parents=True, exist_ok=True)
 
-        raw_data = load_data(files=files)
-        data = normalize(raw_data, fields)
-
-        # expand data hierarchically
-        if self.options.expand and self.options.format != "csv":
-            data = expand_delimiters(data)
-
-            if self.options.prune_empty:
-                for char in data:
-                    if isinstance(char, dict):
-                        for field in list(char.keys()):
-                            if not char[field]:
-                                char.pop(field, None)
+        cache_path = None
+        if self.options.export_cache and pathlib.Path(self.options.zip_path).is_file():
+            cache_path = self.export_cache_path()
+            if self.options.format == "python":
+                snapshot = load_snapshot(cache_path)
+                if snapshot is not None:
+                    log.info("Loaded snapshot: %s", cache_path)
+                    return snapshot
+            elif cache_path.is_file():
+                _link_or_copy(cache_path, self.options.destination)
+                log.info("Reused cached export: %s", cache_path)
+                log.info("Saved output to: %s", self.options.destination)
+                return None
+
+        # The destination may be a hard link into the export cache; writing
+        # through it would change the cached export.
+        if self.options.format != "python":
+            self.options.destination.unlink(missing_ok=True)
+
+        records = self.iter_records()
 
         if self.options.format == "json":
-            export_json(data, self.options.destination)
+            export_json(records, self.options.destination, compact=self.options.compact)
+        elif self.options.format == "ndjson":
+            export_ndjson(
+                records,
+                self.options.destination,
+                compact=self.options.compact,
+            )
         elif self.options.format == "csv":
-            export_csv(data, self.options.destination, fields)
+            export_csv(records, self.options.destination, fields)
         elif self.options.format == "yaml":
-            export_yaml(data, self.options.destination)
+            export_yaml(records, self.options.destination)
+        elif self.options.format == "sqlite":
+            export_sqlite(records, self.options.destination, fields)
+        elif self.options.format == "mmap":
+            export_mmap(records, self.options.destination, fields)
         elif self.options.format == "python":
+            data: list[MutableMapping[str, t.Any]]
+            if self.options.intern_values:
+                interner = Interner()
+                data = [interner.intern_record(record) for record in records]
+                self.intern_stats = interner.stats()
+                log.info(
+                    "Interned %d values and %d objects, saving %d bytes "
+                    "net of %d bytes of tables",
+                    *self.intern_stats,
+                )
+            else:
+                data = list(records)
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                write_snapshot(data, cache_path)
+                self._prune_export_cache(cache_path)
             return data
         else:
             log.info(f"Format {self.options.format} does not exist")
+            return None
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(self.options.destination, cache_path)
+            self._prune_export_cache(cache_path)
         return None
 
+    def export_table(self) -> UnihanTable:
+        """Return the records as a columnar :class:`~unihan_etl.table.UnihanTable`.
+
+        Records are processed as for ``format="python"`` and added to the
+        table as they are produced, so the list of dicts of :meth:`export` is
+        never built.
+
+        Returns
+        -------
+        :class:`~unihan_etl.table.UnihanTable` :
+            one row per character, one column per field
+        """
+        packager = Packager(dataclasses.replace(self.options, format="python"))
+        return UnihanTable.from_records(packager.iter_records(), self._get_fields())
+
+    def export_variants(self) -> VariantGraph:
+        """Return the variant relations as a :class:`~unihan_etl.variants.VariantGraph`.
+
+        Only ``Unihan_Variants.txt`` is read, whatever fields and files these
+        options select; the zip is downloaded first if missing. The graph is
+        saved with its components next to the zip, keyed by
+        :func:`zip_fingerprint` like the codepoint index, and loaded from there
+        by later calls; graphs of earlier zips at the same location are
+        removed.
+
+        Returns
+        -------
+        :class:`~unihan_etl.variants.VariantGraph` :
+            relations of every variant field, with their components
+        """
+        packager = Packager(
+            dataclasses.replace(
+                self.options,
+                fields=list(VARIANT_FIELDS),
+                input_files=DEFAULT_OPTIONS.input_files,
+                format="python",
+                expand=False,
+                where=DEFAULT_OPTIONS.where,
+                codepoint_ranges=DEFAULT_OPTIONS.codepoint_ranges,
+                blocks=DEFAULT_OPTIONS.blocks,
+            ),
+        )
+        packager.download()
+
+        zip_path = pathlib.Path(self.options.zip_path)
+        variants_path = get_variants_path(zip_path, zip_fingerprint(zip_path))
+        if variants_path.exists() and self.options.cache:
+            try:
+                return VariantGraph.load(variants_path)
+            except ValueError:
+                log.info("Rebuilding variant graph: %s", variants_path)
+
+        graph = VariantGraph.from_records(packager.iter_records())
+        graph.dump(variants_path)
+        for stale in variants_path.parent.glob("unihan-variants-*.json"):
+            if stale != variants_path:
+                log.info("Removing stale variant graph: %s", stale)
+                stale.unlink(missing_ok=True)
+        return graph
+
     @classmethod
     def from_cli(cls, argv: Sequence[str]) -> Packager:
         """Create Packager instance from CLI :mod:`argparse` arguments.
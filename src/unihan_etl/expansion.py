@@ -2,26 +2,27 @@
 
 Notes
 -----
-:func:`re.compile` operations are inside of expand functions:
-
-1. readability
-2. module-level function bytecode is cached in python
-3. the last used compiled regexes are cached
+Expanders are looked up in :data:`EXPANDERS`, which is built once at import.
+Their regular expressions are compiled once, at module level, beside the
+expander using them, since :func:`expand_field` runs once per field of every
+character.
 """
 
 from __future__ import annotations
 
+import collections.abc
 import enum
+import functools
 import re
 import typing as t
 
 import zhon.hanzi
 import zhon.pinyin
 
-from unihan_etl.constants import SPACE_DELIMITED_FIELDS
+from unihan_etl.constants import SPACE_DELIMITED_FIELDS, UNIHAN_FIELDS
 
 if t.TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
     from typing import TypeGuard
 
 #: diacritics from kHanyuPinlu
@@ -154,6 +155,14 @@ def expand_kAlternateTotalStrokes(
     return expanded
 
 
+_KUNIHANCORE2020_SET_PATTERN = re.compile(
+    r"""
+    (?P<set>[GHJKMPT]{1})
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kUnihanCore2020(
     value: str,
 ) -> list[str]:
@@ -164,13 +173,7 @@ def expand_kUnihanCore2020(
     >>> expand_kUnihanCore2020('GHJ')
     ['G', 'H', 'J']
     """
-    set_pattern = re.compile(
-        r"""
-        (?P<set>[GHJKMPT]{1})
-    """,
-        re.VERBOSE,
-    )
-    items = set_pattern.split(value)
+    items = _KUNIHANCORE2020_SET_PATTERN.split(value)
     return [s for s in items if s]
 
 
@@ -199,22 +202,24 @@ class kLocationDict(t.TypedDict):
     virtual: int
 
 
+_KHANYU_PATTERN = re.compile(
+    r"""
+    (?P<volume>[1-8])
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-3][0-9])
+    (?P<virtual>[0-3])
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kHanYu(value: list[str]) -> list[kLocationDict]:
     """Expand kHanYu field."""
-    pattern = re.compile(
-        r"""
-        (?P<volume>[1-8])
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-3][0-9])
-        (?P<virtual>[0-3])
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kLocationDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KHANYU_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -229,23 +234,24 @@ def expand_kHanYu(value: list[str]) -> list[kLocationDict]:
     return expanded
 
 
-def expand_kIRGHanyuDaZidian(value: list[str]) -> list[kLocationDict]:
-    """Expand kIRGHanyuDaZidian field."""
-    pattern = re.compile(
-        r"""
-        (?P<volume>[1-8])
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-3][0-9])
-        (?P<virtual>[01])
+_KIRGHANYUDAZIDIAN_PATTERN = re.compile(
+    r"""
+    (?P<volume>[1-8])
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-3][0-9])
+    (?P<virtual>[01])
     """,
-        re.VERBOSE,
-    )
+    re.VERBOSE,
+)
+
 
+def expand_kIRGHanyuDaZidian(value: list[str]) -> list[kLocationDict]:
+    """Expand kIRGHanyuDaZidian field."""
     expanded: Sequence[str | kLocationDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KIRGHANYUDAZIDIAN_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -299,6 +305,16 @@ class kTGHZ2013Dict(t.TypedDict):
     locations: Sequence[kTGHZ2013LocationDict]
 
 
+_KTGHZ2013_LOCATION_PATTERN = re.compile(
+    r"""
+    (?P<page>[\d]{3})\.
+    (?P<position>[\d]{2})
+    (?P<entry_type>[\d]{1})
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kTGHZ2013(
     value: list[str],
 ) -> list[kTGHZ2013Dict]:
@@ -317,15 +333,6 @@ def expand_kTGHZ2013(
     [{'reading': 'mò', 'locations': [{'page': 256, 'position': 9, 'entry_type': 0}]},
      {'reading': 'wàn', 'locations': [{'page': 379, 'position': 16, 'entry_type': 0}]}]
     """
-    location_pattern = re.compile(
-        r"""
-        (?P<page>[\d]{3})\.
-        (?P<position>[\d]{2})
-        (?P<entry_type>[\d]{1})
-    """,
-        re.VERBOSE,
-    )
-
     expanded: list[kTGHZ2013Dict] = []
 
     for val in value:
@@ -335,7 +342,7 @@ def expand_kTGHZ2013(
         exploded_locations = []
 
         for loc in locations:
-            m = location_pattern.match(loc)
+            m = _KTGHZ2013_LOCATION_PATTERN.match(loc)
             assert m is not None
             g = m.groupdict()
             assert g is not None
@@ -374,6 +381,15 @@ class kSMSZD2003IndexDict(t.TypedDict):
     position: int
 
 
+_KSMSZD2003INDEX_LOCATION_PATTERN = re.compile(
+    r"""
+    (?P<page>[\d]{1,3})\.
+    (?P<position>[\d]{2})
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kSMSZD2003Index(
     value: list[str],
 ) -> list[kSMSZD2003IndexDict]:
@@ -396,18 +412,10 @@ def expand_kSMSZD2003Index(
     Commercial Press Character Dictionary). Hong Kong: 商務印書館(香港)有限公司
     (Commercial Press [Hong Kong], Ltd.), 2003. ISBN 962-07-0140-2.
     """
-    location_pattern = re.compile(
-        r"""
-        (?P<page>[\d]{1,3})\.
-        (?P<position>[\d]{2})
-    """,
-        re.VERBOSE,
-    )
-
     expanded: list[kSMSZD2003IndexDict] = []
 
     for loc in value:
-        m = location_pattern.match(loc)
+        m = _KSMSZD2003INDEX_LOCATION_PATTERN.match(loc)
         assert m is not None
         g = m.groupdict()
         assert g is not None
@@ -507,20 +515,21 @@ class kHanyuPinyinDict(t.TypedDict):
     readings: list[str]
 
 
+_KHANYUPINYIN_LOCATION_PATTERN = re.compile(
+    r"""
+    (?P<volume>[1-8])
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-3][0-9])
+    (?P<virtual>[0-3])
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kHanyuPinyin(
     value: list[str],
 ) -> list[kHanyuPinyinDict]:
     """Expand kHanyuPinyin field."""
-    location_pattern = re.compile(
-        r"""
-        (?P<volume>[1-8])
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-3][0-9])
-        (?P<virtual>[0-3])
-    """,
-        re.VERBOSE,
-    )
-
     expanded: Sequence[str | kHanyuPinyinDict] = value.copy()
     assert isinstance(expanded, list)
 
@@ -529,7 +538,7 @@ def expand_kHanyuPinyin(
         expanded[i] = kHanyuPinyinPreDict(locations=v[0], readings=v[1])
 
         for n, loc in enumerate(expanded[i]["locations"]):
-            m = location_pattern.match(loc)
+            m = _KHANYUPINYIN_LOCATION_PATTERN.match(loc)
             assert m is not None
             g = m.groupdict()
             assert g is not None
@@ -606,20 +615,21 @@ class kXHC1983PreDict(t.TypedDict):
     reading: str
 
 
+_KXHC1983_PATTERN = re.compile(
+    r"""
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-9]{2})
+    (?P<entry>[0-9]{1})
+    (?P<substituted>\*?)
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kXHC1983(
     value: list[str],
 ) -> list[kXHC1983Dict]:
     """Expand kXHC1983 field."""
-    pattern = re.compile(
-        r"""
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-9]{2})
-        (?P<entry>[0-9]{1})
-        (?P<substituted>\*?)
-    """,
-        re.VERBOSE,
-    )
-
     expanded: Sequence[str | kXHC1983Dict] = value.copy()
     assert isinstance(expanded, list)
 
@@ -628,7 +638,7 @@ def expand_kXHC1983(
         expanded[i] = kXHC1983PreDict(locations=vals[0].split(","), reading=vals[1])
 
         for n, loc in enumerate(expanded[i]["locations"]):
-            m = pattern.match(loc)
+            m = _KXHC1983_PATTERN.match(loc)
             assert m is not None
 
             g = m.groupdict()
@@ -671,24 +681,25 @@ class kCheungBauerDict(t.TypedDict):
     readings: list[str]
 
 
+_KCHEUNGBAUER_PATTERN = re.compile(
+    r"""
+    (?P<radical>[0-9]{3})\/(?P<strokes>[0-9]{2});
+    (?P<cangjie>[A-Z]*);
+    (?P<readings>[a-z1-6\[\]\/,]+)
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kCheungBauer(
     value: list[str],
 ) -> list[kCheungBauerDict]:
     """Expand kCheungBauer field."""
-    pattern = re.compile(
-        r"""
-        (?P<radical>[0-9]{3})\/(?P<strokes>[0-9]{2});
-        (?P<cangjie>[A-Z]*);
-        (?P<readings>[a-z1-6\[\]\/,]+)
-    """,
-        re.VERBOSE,
-    )
-
     expanded: Sequence[str | kCheungBauerDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KCHEUNGBAUER_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -709,23 +720,25 @@ kRSAdobe_Japan1_6Dict = t.TypedDict(
 )
 
 
+_KRSADOBE_JAPAN1_6_PATTERN = re.compile(
+    r"""
+    (?P<type>[CV])\+
+    (?P<cid>[0-9]{1,5})\+
+    (?P<radical>[1-9][0-9]{0,2})\.
+    (?P<strokes>[1-9][0-9]?)\.
+    (?P<strokes_residue>[0-9]{1,2})
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kRSAdobe_Japan1_6(value: list[str]) -> list[kRSAdobe_Japan1_6Dict]:
     """Expand kRSAdobe_Japan1_6 field."""
-    pattern = re.compile(
-        r"""
-        (?P<type>[CV])\+
-        (?P<cid>[0-9]{1,5})\+
-        (?P<radical>[1-9][0-9]{0,2})\.
-        (?P<strokes>[1-9][0-9]?)\.
-        (?P<strokes_residue>[0-9]{1,2})
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kRSAdobe_Japan1_6Dict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KRSADOBE_JAPAN1_6_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -764,21 +777,23 @@ class kCihaiTDict(t.TypedDict):
     character: int
 
 
+_KCIHAIT_PATTERN = re.compile(
+    r"""
+    (?P<page>[1-9][0-9]{0,3})\.
+    (?P<row>[0-9]{1})
+    (?P<character>[0-9]{2})
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kCihaiT(value: list[str]) -> list[kCihaiTDict]:
     """Expand kCihaiT field."""
-    pattern = re.compile(
-        r"""
-        (?P<page>[1-9][0-9]{0,3})\.
-        (?P<row>[0-9]{1})
-        (?P<character>[0-9]{2})
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kCihaiTDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KCIHAIT_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -844,17 +859,19 @@ class kDaeJaweonDict(t.TypedDict):
     virtual: int
 
 
+_KDAEJAWEON_PATTERN = re.compile(
+    r"""
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-9]{2})
+    (?P<virtual>[01])
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kDaeJaweon(value: str) -> kDaeJaweonDict:
     """Expand kDaeJaweon field."""
-    pattern = re.compile(
-        r"""
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-9]{2})
-        (?P<virtual>[01])
-    """,
-        re.VERBOSE,
-    )
-    m = pattern.match(value)
+    m = _KDAEJAWEON_PATTERN.match(value)
     assert m is not None
 
     g = m.groupdict()
@@ -904,20 +921,22 @@ class kFennDict(t.TypedDict):
     frequency: str
 
 
+_KFENN_PATTERN = re.compile(
+    r"""
+    (?P<phonetic>[0-9]+a?)
+    (?P<frequency>[A-KP*])
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kFenn(value: list[str]) -> list[kFennDict]:
     """Expand kFenn field."""
-    pattern = re.compile(
-        r"""
-        (?P<phonetic>[0-9]+a?)
-        (?P<frequency>[A-KP*])
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kFennDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KFENN_PATTERN.match(v)
         assert m is not None
         g = m.groupdict(v)
         assert g is not None
@@ -944,20 +963,22 @@ class kHanyuPinluDict(t.TypedDict):
     frequency: int
 
 
+_KHANYUPINLU_PATTERN = re.compile(
+    rf"""
+    (?P<phonetic>[a-z({zhon.pinyin.lowercase}{N_DIACRITICS}]+)
+    \((?P<frequency>[0-9]+)\)
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kHanyuPinlu(value: list[str]) -> list[kHanyuPinluDict]:
     """Expand kHanyuPinlu field."""
-    pattern = re.compile(
-        rf"""
-        (?P<phonetic>[a-z({zhon.pinyin.lowercase}{N_DIACRITICS}]+)
-        \((?P<frequency>[0-9]+)\)
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kHanyuPinluDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KHANYUPINLU_PATTERN.match(v)
         assert m is not None
         g = m.groupdict()
         assert g is not None
@@ -1011,21 +1032,29 @@ class kHDZRadBreakDict(t.TypedDict):
     location: LocationDict
 
 
+_KHDZRADBREAK_LOC_PATTERN = re.compile(
+    r"""
+    (?P<volume>[1-8])
+    (?P<page>[0-9]{4})\.
+    (?P<character>[0-3][0-9])
+    (?P<virtual>[01])
+    """,
+    re.VERBOSE,
+)
+_KHDZRADBREAK_PATTERN = re.compile(
+    rf"""
+    (?P<radical>[{zhon.hanzi.radicals}]+)
+    \[(?P<ucn>U\+2F[0-9A-D][0-9A-F])\]
+    """,
+    re.VERBOSE,
+)
+
+
 def expand_kHDZRadBreak(value: str) -> kHDZRadBreakDict:
     """Expand kHDZRadBreak field."""
     rad, loc = value.split(":")
 
-    loc_pattern = re.compile(
-        r"""
-        (?P<volume>[1-8])
-        (?P<page>[0-9]{4})\.
-        (?P<character>[0-3][0-9])
-        (?P<virtual>[01])
-    """,
-        re.VERBOSE,
-    )
-
-    loc_m = loc_pattern.match(loc)
+    loc_m = _KHDZRADBREAK_LOC_PATTERN.match(loc)
     assert loc_m is not None
     loc_g = loc_m.groupdict()
     assert loc_g is not None
@@ -1037,14 +1066,7 @@ def expand_kHDZRadBreak(value: str) -> kHDZRadBreakDict:
         virtual=int(loc_g["virtual"]),
     )
 
-    pattern = re.compile(
-        rf"""
-        (?P<radical>[{zhon.hanzi.radicals}]+)
-        \[(?P<ucn>U\+2F[0-9A-D][0-9A-F])\]
-    """,
-        re.VERBOSE,
-    )
-    m = pattern.match(rad)
+    m = _KHDZRADBREAK_PATTERN.match(rad)
     assert m is not None
     g = m.groupdict()
     assert g is not None
@@ -1149,6 +1171,16 @@ def get_krs_simplified_type(val: str) -> kRSSimplifiedType | t.Literal[False]:
     return False
 
 
+_KRSGENERIC_PATTERN = re.compile(
+    r"""
+    (?P<radical>[1-9][0-9]{0,2})
+    (?P<simplified>\'{0,3})\.
+    (?P<strokes>-?[0-9]{1,2})
+    """,
+    re.VERBOSE,
+)
+
+
 def _expand_kRSGeneric(value: list[str]) -> list[kRSGenericDict]:
     """Expand kRSGeneric field.
 
@@ -1163,19 +1195,11 @@ def _expand_kRSGeneric(value: list[str]) -> list[kRSGenericDict]:
     [{'radical': 120, 'strokes': 3, 'simplified':
         <kRSSimplifiedType.Chinese: 'Chinese'>}]
     """
-    pattern = re.compile(
-        r"""
-        (?P<radical>[1-9][0-9]{0,2})
-        (?P<simplified>\'{0,3})\.
-        (?P<strokes>-?[0-9]{1,2})
-    """,
-        re.VERBOSE,
-    )
     expanded: Sequence[str | kRSGenericDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KRSGENERIC_PATTERN.match(v)
         assert m is not None
         g = m.groupdict()
         assert g is not None
@@ -1256,22 +1280,23 @@ class kGSRDict(t.TypedDict):
     apostrophe: bool
 
 
-def expand_kGSR(value: list[str]) -> list[kGSRDict]:
-    """Expand kGSR field."""
-    pattern = re.compile(
-        r"""
-        (?P<set>[0-9]{4})
-        (?P<letter>[a-vx-z])
-        (?P<apostrophe>\')?
+_KGSR_PATTERN = re.compile(
+    r"""
+    (?P<set>[0-9]{4})
+    (?P<letter>[a-vx-z])
+    (?P<apostrophe>\')?
     """,
-        re.VERBOSE,
-    )
+    re.VERBOSE,
+)
 
+
+def expand_kGSR(value: list[str]) -> list[kGSRDict]:
+    """Expand kGSR field."""
     expanded: Sequence[str | kGSRDict] = value.copy()
     assert isinstance(expanded, list)
 
     for i, v in enumerate(value):
-        m = pattern.match(v)
+        m = _KGSR_PATTERN.match(v)
         assert m is not None
 
         g = m.groupdict()
@@ -1597,6 +1622,75 @@ def expand_kZhuang(value: list[str]) -> list[kZhuangDict]:
     return expanded
 
 
+#: Expander of each UNIHAN field with structured values, by field name.
+#:
+#: Built at import from the ``expand_<field>`` functions of this module. An
+#: expander receives the raw value, split on spaces for
+#: :data:`~unihan_etl.constants.SPACE_DELIMITED_FIELDS`. Add or override
+#: entries with :func:`register_expander`.
+EXPANDERS: dict[str, Callable[[t.Any], t.Any]] = {
+    field: globals()[f"expand_{field}"]
+    for field in UNIHAN_FIELDS
+    if f"expand_{field}" in globals()
+}
+
+_SPACE_DELIMITED_FIELDS = frozenset(SPACE_DELIMITED_FIELDS)
+
+ExpanderT = t.TypeVar("ExpanderT", bound="Callable[[t.Any], t.Any]")
+
+
+@t.overload
+def register_expander(field: str) -> Callable[[ExpanderT], ExpanderT]: ...
+
+
+@t.overload
+def register_expander(field: str, expander: ExpanderT) -> ExpanderT: ...
+
+
+def register_expander(
+    field: str,
+    expander: ExpanderT | None = None,
+) -> ExpanderT | Callable[[ExpanderT], ExpanderT]:
+    """Register ``expander`` as the expander of ``field`` in :data:`EXPANDERS`.
+
+    Replaces any expander already registered for ``field``. Without
+    ``expander``, returns a decorator.
+
+    Parameters
+    ----------
+    field : str
+        field name
+    expander : callable, optional
+        function taking the field's value and returning its expanded form
+
+    Returns
+    -------
+    callable :
+        ``expander``, or a decorator registering the function it decorates
+
+    Examples
+    --------
+    >>> @register_expander("kExample")
+    ... def expand_kExample(value: str) -> list[str]:
+    ...     return value.split(",")
+
+    >>> expand_field("kExample", "a,b")
+    ['a', 'b']
+
+    >>> del EXPANDERS["kExample"]
+    """
+    if expander is None:
+
+        def decorator(func: ExpanderT) -> ExpanderT:
+            EXPANDERS[field] = func
+            return func
+
+        return decorator
+
+    EXPANDERS[field] = expander
+    return expander
+
+
 def expand_field(field: str, fvalue: str | list[str]) -> t.Any:
     """Return structured value of information in UNIHAN field.
 
@@ -1610,16 +1704,319 @@ def expand_field(field: str, fvalue: str | list[str]) -> t.Any:
     Returns
     -------
     list or dict :
-        expanded field information per UNIHAN's documentation
+        expanded field information per UNIHAN's documentation, or the value
+        as is if :data:`EXPANDERS` has no expander for the field
     """
-    if field in SPACE_DELIMITED_FIELDS and fvalue:
+    if field in _SPACE_DELIMITED_FIELDS and fvalue:
         assert isinstance(fvalue, str)
         fvalue = fvalue.split(" ")
 
-    try:
-        expansion_func = eval(f"expand_{field}")
-        return expansion_func(fvalue)
-    except NameError:
-        pass
+    expander = EXPANDERS.get(field)
+    if expander is None:
+        return fvalue
+    return expander(fvalue)
+
+
+class FrozenDict(dict[str, t.Any]):
+    """A :class:`dict` refusing changes, for expanded values shared by records.
+
+    Compares and pickles as a plain dict. JSON encodes it as one; YAML exports
+    represent it as one through :func:`~unihan_etl.core.export_yaml`, as
+    :func:`yaml.safe_dump` alone refuses it.
+
+    >>> d = FrozenDict(zh_Hans=6, zh_Hant=6)
+    >>> d == {"zh_Hans": 6, "zh_Hant": 6}
+    True
+    >>> d["zh_Hans"] = 7
+    Traceback (most recent call last):
+    ...
+    TypeError: FrozenDict is immutable
+    """
+
+    def _immutable(self, *args: t.Any, **kwargs: t.Any) -> t.NoReturn:
+        msg = f"{type(self).__name__} is immutable"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenDict], tuple[dict[str, t.Any]]]:
+        """Pickle through the constructor, as item assignment is refused."""
+        return type(self), (dict(self),)
+
+
+def freeze(value: t.Any) -> t.Any:
+    """Return ``value`` with its lists as tuples and dicts as :class:`FrozenDict`.
+
+    >>> freeze([{"radical": 39, "strokes": 3}])
+    ({'radical': 39, 'strokes': 3},)
+    """
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    return value
+
+
+#: Raw values an :class:`ExpansionMemo` keeps per field, by default.
+DEFAULT_MEMO_SIZE = 1 << 16
+
+#: Fields an :class:`ExpansionMemo` memoizes by default: those whose raw values
+#: repeat across many characters. Values of fields such as kDefinition or the
+#: kIRG_*Source fields are nearly all distinct, and only cost a memo lookup.
+MEMO_FIELDS = (
+    "kAccountingNumeric",
+    "kAlternateTotalStrokes",
+    "kCantonese",
+    "kHangul",
+    "kIICore",
+    "kJapaneseKun",
+    "kJapaneseOn",
+    "kKorean",
+    "kMandarin",
+    "kOtherNumeric",
+    "kPrimaryNumeric",
+    "kRSUnicode",
+    "kStrange",
+    "kTang",
+    "kTotalStrokes",
+    "kUnihanCore2020",
+    "kVietnamese",
+)
+
+
+class MemoStats(t.NamedTuple):
+    """Counters of one field's memo, per :meth:`ExpansionMemo.stats`."""
+
+    #: Values served from the memo.
+    hits: int
+    #: Values expanded.
+    misses: int
+    #: Values held.
+    size: int
+
+
+class ExpansionMemo:
+    """Expand fields through a memo of each field's raw values.
 
-    return fvalue
+    Values such as kRSUnicode's ``39.3``, kTotalStrokes' ``6`` or kMandarin
+    syllables repeat across thousands of characters. A memo expands each
+    distinct raw value once, and hands out the same frozen value, per
+    :func:`freeze`, to every character having it: lists are tuples and dicts
+    are :class:`FrozenDict`.
+
+    Parameters
+    ----------
+    fields : list of str, optional
+        fields to memoize, :data:`MEMO_FIELDS` by default, all if None; others
+        are expanded per :func:`expand_field`. Values of fields with nothing to
+        expand, such as ``char``, are returned as is.
+    maxsize : int, optional
+        raw values to hold per field, least recently used first out;
+        unbounded if None
+
+    Examples
+    --------
+    >>> memo = ExpansionMemo()
+    >>> first = memo.expand("kTotalStrokes", "6")
+    >>> first
+    {'zh-Hans': 6, 'zh-Hant': 6}
+    >>> memo.expand("kTotalStrokes", "6") is first
+    True
+    >>> memo.stats()
+    {'kTotalStrokes': MemoStats(hits=1, misses=1, size=1)}
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] | None = MEMO_FIELDS,
+        maxsize: int | None = DEFAULT_MEMO_SIZE,
+    ) -> None:
+        """Create an empty memo."""
+        self.fields = None if fields is None else frozenset(fields)
+        self.maxsize = maxsize
+        self._memos: dict[str, Callable[[str], t.Any]] = {}
+        self._expanders: dict[str, Callable[[str], t.Any]] = {}
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[ExpansionMemo], tuple[frozenset[str] | None, int | None]]:
+        """Pickle the settings only; an unpickled memo starts empty."""
+        return type(self), (self.fields, self.maxsize)
+
+    def _expander(self, field: str) -> Callable[[str], t.Any]:
+        """Return, and keep, what expands the values of ``field``."""
+        expander: Callable[[str], t.Any]
+        if field not in EXPANDERS and field not in _SPACE_DELIMITED_FIELDS:
+            expander = str
+        elif self.fields is not None and field not in self.fields:
+            expander = functools.partial(expand_field, field)
+        else:
+
+            def expand(fvalue: str) -> t.Any:
+                return freeze(expand_field(field, fvalue))
+
+            expander = functools.lru_cache(maxsize=self.maxsize)(expand)
+            self._memos[field] = expander
+        self._expanders[field] = expander
+        return expander
+
+    def expand(self, field: str, fvalue: str) -> t.Any:
+        """Return the expanded value of ``fvalue``, per :func:`expand_field`.
+
+        Parameters
+        ----------
+        field : str
+            field name
+        fvalue : str
+            raw value of the field
+
+        Returns
+        -------
+        tuple, dict or str :
+            the frozen expanded value, shared with other callers
+        """
+        expander = self._expanders.get(field) or self._expander(field)
+        return expander(fvalue)
+
+    def stats(self) -> dict[str, MemoStats]:
+        """Return the counters of each field memoized so far."""
+        stats = {}
+        for field, memo in self._memos.items():
+            info = memo.cache_info()  # type: ignore[attr-defined]
+            stats[field] = MemoStats(info.hits, info.misses, info.currsize)
+        return stats
+
+    def clear(self) -> None:
+        """Drop every memoized value and counter."""
+        self._memos.clear()
+        self._expanders.clear()
+
+
+class LazyRecord(collections.abc.MutableMapping[str, t.Any]):
+    """A record expanding each field on first access.
+
+    Holds the raw values of a record per :func:`~unihan_etl.core.normalize`,
+    and expands a field the first time it's read, keeping the result. Fields
+    never read are never expanded. Otherwise it behaves as the dict of
+    :func:`~unihan_etl.core.expand_record`; ``dict(record)`` expands every
+    field. Values empty only once expanded aren't pruned.
+
+    Parameters
+    ----------
+    record : dict
+        raw values, by field
+    expand : callable, optional
+        function taking a field and raw value, :func:`expand_field` by default,
+        or e.g. :meth:`ExpansionMemo.expand`
+    pending : iterable of str, optional
+        fields of ``record`` still raw; by default, those with values and
+        something to expand, per :data:`EXPANDERS`
+
+    Examples
+    --------
+    >>> record = LazyRecord({"char": "好", "kTotalStrokes": "6", "kMandarin": "hǎo"})
+    >>> sorted(record.pending)
+    ['kMandarin', 'kTotalStrokes']
+    >>> record["kTotalStrokes"]
+    {'zh-Hans': 6, 'zh-Hant': 6}
+    >>> sorted(record.pending)
+    ['kMandarin']
+    >>> record == {
+    ...     "char": "好",
+    ...     "kTotalStrokes": {"zh-Hans": 6, "zh-Hant": 6},
+    ...     "kMandarin": {"zh-Hans": "hǎo", "zh-Hant": "hǎo"},
+    ... }
+    True
+    """
+
+    __slots__ = ("_data", "_expand", "_pending")
+
+    def __init__(
+        self,
+        record: dict[str, t.Any],
+        expand: Callable[[str, t.Any], t.Any] | None = None,
+        pending: Iterable[str] | None = None,
+    ) -> None:
+        """Wrap the raw values of ``record``, which is kept, not copied."""
+        self._data = record
+        self._expand = expand_field if expand is None else expand
+        self._pending = (
+            {
+                field
+                for field, value in record.items()
+                if value and (field in EXPANDERS or field in _SPACE_DELIMITED_FIELDS)
+            }
+            if pending is None
+            else set(pending)
+        )
+
+    @property
+    def pending(self) -> frozenset[str]:
+        """Fields not expanded yet."""
+        return frozenset(self._pending)
+
+    def __getitem__(self, field: str) -> t.Any:
+        """Return the expanded value of ``field``, expanding it if need be."""
+        value = self._data[field]
+        if field in self._pending:
+            value = self._data[field] = self._expand(field, value)
+            self._pending.discard(field)
+        return value
+
+    def __setitem__(self, field: str, value: t.Any) -> None:
+        """Set the expanded value of ``field``."""
+        self._data[field] = value
+        self._pending.discard(field)
+
+    def __delitem__(self, field: str) -> None:
+        """Remove ``field``."""
+        del self._data[field]
+        self._pending.discard(field)
+
+    def __contains__(self, field: object) -> bool:
+        """Return whether the record has ``field``, without expanding it."""
+        return field in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields, in record order."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        """Return the representation of the record, expanded."""
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(
+        self,
+    ) -> tuple[
+        type[LazyRecord],
+        tuple[dict[str, t.Any], Callable[[str, t.Any], t.Any], set[str]],
+    ]:
+        """Pickle the values as they are, and how fields still raw expand.
+
+        ``expand`` must be picklable, as :func:`expand_field` and
+        :meth:`ExpansionMemo.expand` are.
+        """
+        return type(self), (self._data, self._expand, self._pending)
+
+    def copy(self) -> LazyRecord:
+        """Return a shallow copy, expanding as this record would."""
+        return type(self)(dict(self._data), self._expand, self._pending)
+
+    def map_stored(
+        self,
+        func: Callable[[str, t.Any], tuple[str, t.Any]],
+    ) -> LazyRecord:
+        """Return a copy with each field and stored value replaced by ``func``'s.
+
+        Stored values are raw for pending fields, and aren't expanded.
+        """
+        return type(self)(
+            dict(func(field, value) for field, value in self._data.items()),
+            self._expand,
+            self._pending,
+        )
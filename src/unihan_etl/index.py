@@ -0,0 +1,626 @@
+"""Persistent, on-disk codepoint index of UNIHAN records.
+
+The index is a SQLite database holding one expanded, pruned record per
+character, keyed by codepoint. Records are stored pickled, so the index is a
+local cache to be read only by unihan-etl itself. It is built once per UNIHAN zip (see
+:func:`unihan_etl.core.zip_fingerprint`) and afterwards answers a lookup
+without parsing any of the UNIHAN text files.
+
+Alongside the records, the index holds postings: for each field and value,
+the sorted codepoints of the characters having it, for reverse lookups with
+:meth:`UnihanIndex.codepoints` and :meth:`UnihanIndex.find`. Every scalar
+within an expanded value is indexed, under the field and under its dotted
+path, e.g. ``kRSUnicode`` and ``kRSUnicode.radical``. Pinyin readings are
+also indexed toneless and with tone numbers, ranked by frequency, for
+:meth:`UnihanIndex.pinyin`. kDefinition is indexed for full-text search with
+:meth:`UnihanIndex.text`, in an SQLite FTS5 table where SQLite has FTS5 and in
+a table of terms otherwise.
+"""
+
+from __future__ import annotations
+
+import array
+import enum
+import functools
+import itertools
+import logging
+import pathlib
+import pickle
+import re
+import sqlite3
+import typing as t
+import unicodedata
+
+from unihan_etl.constants import INDEX_FIELDS
+from unihan_etl.util import split_pinyin_tone
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from unihan_etl.types import StrPath
+
+log = logging.getLogger(__name__)
+
+#: Bumped whenever the layout of the index database changes, so an index
+#: written by an older unihan-etl is rebuilt instead of misread.
+INDEX_SCHEMA_VERSION = 4
+
+#: Number of records written per :meth:`sqlite3.Cursor.executemany` batch.
+INDEX_BATCH_SIZE = 5000
+
+
+def get_index_path(zip_path: StrPath, fingerprint: str) -> pathlib.Path:
+    """Return where the index of the zip with ``fingerprint`` is stored.
+
+    The index sits next to the zip it was built from.
+
+    >>> get_index_path("/tmp/downloads/Unihan.zip", "0123456789abcdef").name
+    'unihan-index-0123456789abcdef.v4.sqlite3'
+    """
+    return pathlib.Path(zip_path).parent / (
+        f"unihan-index-{fingerprint}.v{INDEX_SCHEMA_VERSION}.sqlite3"
+    )
+
+
+def _dump_record(record: Mapping[str, t.Any]) -> bytes:
+    # Pickled rather than JSON-encoded: expanded values hold enums, such as
+    # kRSUnicode's kRSSimplifiedType, which must come back as themselves.
+    return pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def value_key(value: t.Any) -> str:
+    """Return how a scalar field value is keyed in the postings.
+
+    >>> value_key("hǎo"), value_key(6)
+    ('hǎo', '6')
+    """
+    if isinstance(value, enum.Enum):
+        value = value.value
+    return str(value)
+
+
+def _posting_keys(path: str, value: t.Any) -> Iterator[tuple[str, str]]:
+    """Yield ``(path, key)`` for each scalar within ``value``.
+
+    Mappings extend the path by their keys; lists keep it.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _posting_keys(f"{path}.{key}", item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _posting_keys(path, item)
+    elif value is not None and value != "":
+        yield path, value_key(value)
+
+
+def posting_keys(field: str, value: t.Any) -> set[tuple[str, str]]:
+    """Return the ``(field, value)`` postings a field's value is indexed under.
+
+    >>> for key in sorted(posting_keys("kTotalStrokes", {"zh-Hans": 6, "zh-Hant": 6})):
+    ...     print(key)
+    ('kTotalStrokes', '6')
+    ('kTotalStrokes.zh-Hans', '6')
+    ('kTotalStrokes.zh-Hant', '6')
+    """
+    keys: set[tuple[str, str]] = set()
+    for path, key in _posting_keys(field, value):
+        keys.add((path, key))
+        keys.add((field, key))
+    return keys
+
+
+#: Fields whose readings :meth:`UnihanIndex.pinyin` finds characters by.
+PINYIN_FIELDS = ("kMandarin", "kHanyuPinyin", "kXHC1983", "kHanyuPinlu")
+
+
+def _pinyin_readings(record: Mapping[str, t.Any]) -> Iterator[str]:
+    """Yield the pinyin readings in the expanded :data:`PINYIN_FIELDS`."""
+    yield from (record.get("kMandarin") or {}).values()
+    for entry in record.get("kHanyuPinyin") or ():
+        yield from entry["readings"]
+    for entry in record.get("kXHC1983") or ():
+        yield entry["reading"]
+    for entry in record.get("kHanyuPinlu") or ():
+        yield entry["phonetic"]
+
+
+def pinyin_keys(record: Mapping[str, t.Any]) -> dict[str, int]:
+    """Return the pinyin keys of an expanded record, with its frequency in each.
+
+    Each reading is keyed toneless and with its tone number, ``5`` for the
+    neutral tone. Frequencies are kHanyuPinlu's, summed over the readings
+    sharing a key, and ``0`` for readings it doesn't list.
+
+    >>> sorted(
+    ...     pinyin_keys(
+    ...         {
+    ...             "kMandarin": {"zh-Hans": "xià", "zh-Hant": "xià"},
+    ...             "kHanyuPinlu": [
+    ...                 {"phonetic": "xià", "frequency": 6430},
+    ...                 {"phonetic": "xia", "frequency": 249},
+    ...             ],
+    ...         },
+    ...     ).items(),
+    ... )
+    [('xia', 6679), ('xia4', 6430), ('xia5', 249)]
+    """
+    frequencies = {
+        entry["phonetic"]: entry["frequency"]
+        for entry in record.get("kHanyuPinlu") or ()
+    }
+    keys: dict[str, int] = {}
+    for reading in set(_pinyin_readings(record)):
+        toneless, tone = split_pinyin_tone(reading)
+        frequency = frequencies.get(reading, 0)
+        for key in (toneless, f"{toneless}{tone or 5}"):
+            keys[key] = keys.get(key, 0) + frequency
+    return keys
+
+
+_TEXT_TERM_PATTERN = re.compile(r"(\w+)(\*?)")
+
+
+def _fold(text: str) -> str:
+    """Return ``text`` casefolded and without diacritics."""
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text.casefold())
+        if not unicodedata.combining(char)
+    )
+
+
+def text_terms(text: str) -> list[str]:
+    """Return the search terms of ``text``: its words, casefolded and unaccented.
+
+    >>> text_terms("(same as 穩) firm; Stable; secure")
+    ['same', 'as', '穩', 'firm', 'stable', 'secure']
+    """
+    return [term for term, _ in _TEXT_TERM_PATTERN.findall(_fold(text))]
+
+
+def parse_text_query(query: str) -> list[tuple[str, bool]]:
+    """Return the terms of a full-text query, and whether each is a prefix.
+
+    >>> parse_text_query("wild hors*")
+    [('wild', False), ('hors', True)]
+
+    Raises
+    ------
+    ValueError :
+        if ``query`` has no terms
+    """
+    terms = [
+        (term, bool(star)) for term, star in _TEXT_TERM_PATTERN.findall(_fold(query))
+    ]
+    if not terms:
+        msg = f"Expected search terms, got: {query!r}"
+        raise ValueError(msg)
+    return terms
+
+
+def _definition(record: Mapping[str, t.Any]) -> str:
+    definition = record.get("kDefinition") or ""
+    return (
+        "; ".join(definition) if isinstance(definition, (list, tuple)) else definition
+    )
+
+
+def _build_text_index(
+    conn: sqlite3.Connection,
+    definitions: Iterable[tuple[int, str]],
+    fts: bool = True,
+) -> None:
+    """Index ``(codepoint, definition)`` pairs for :meth:`UnihanIndex.text`.
+
+    Definitions go into an FTS5 table if ``fts`` is on and SQLite has FTS5,
+    into a table of terms otherwise.
+    """
+    if fts:
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE text_fts USING fts5"
+                "(definition, tokenize = 'unicode61 remove_diacritics 2')",
+            )
+        except sqlite3.OperationalError as e:
+            log.info("SQLite lacks FTS5, indexing definitions by term: %s", e)
+        else:
+            conn.executemany(
+                "INSERT INTO text_fts (rowid, definition) VALUES (?, ?)",
+                definitions,
+            )
+            return
+
+    conn.execute(
+        "CREATE TABLE text_terms "
+        "(term TEXT PRIMARY KEY, codepoints BLOB NOT NULL) WITHOUT ROWID",
+    )
+    conn.execute(
+        "CREATE TABLE text_lengths "
+        "(codepoint INTEGER PRIMARY KEY, length INTEGER NOT NULL)",
+    )
+    terms: dict[str, array.array[int]] = {}
+    lengths: list[tuple[int, int]] = []
+    for codepoint, definition in definitions:
+        words = text_terms(definition)
+        lengths.append((codepoint, len(words)))
+        for term in dict.fromkeys(words):
+            posting = terms.get(term)
+            if posting is None:
+                posting = terms[term] = array.array("I")
+            posting.append(codepoint)
+    conn.executemany("INSERT INTO text_lengths VALUES (?, ?)", lengths)
+    conn.executemany(
+        "INSERT INTO text_terms VALUES (?, ?)",
+        ((term, posting.tobytes()) for term, posting in terms.items()),
+    )
+
+
+class UnihanIndex:
+    """Read-only view of a codepoint index built by :meth:`UnihanIndex.build`.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        index database to open
+
+    Raises
+    ------
+    FileNotFoundError :
+        if no index exists at ``path``
+    """
+
+    def __init__(self, path: StrPath) -> None:
+        """Open the index at ``path`` read-only."""
+        self.path = pathlib.Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(str(self.path))
+        self._conn = sqlite3.connect(
+            f"{self.path.as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        records: Iterable[Mapping[str, t.Any]],
+        path: StrPath,
+    ) -> UnihanIndex:
+        """Write ``records`` into a new index at ``path`` and open it.
+
+        The database is written to a sibling temp file and moved into place, so
+        a reader never opens a half-written index.
+
+        Parameters
+        ----------
+        records : iterable of dict
+            expanded records, per :meth:`unihan_etl.core.Packager.export`
+        path : str or pathlib.Path
+            where the index is stored
+
+        Returns
+        -------
+        :class:`UnihanIndex` :
+            the opened index
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / (path.name + ".tmp")
+        tmp_path.unlink(missing_ok=True)
+
+        log.info("Building index: %s", path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TABLE records "
+                "(codepoint INTEGER PRIMARY KEY, record BLOB NOT NULL)",
+            )
+            conn.execute(
+                "CREATE TABLE postings (field TEXT NOT NULL, value TEXT NOT NULL, "
+                "codepoints BLOB NOT NULL, PRIMARY KEY (field, value)) WITHOUT ROWID",
+            )
+            conn.execute(
+                "CREATE TABLE pinyin "
+                "(key TEXT PRIMARY KEY, codepoints BLOB NOT NULL) WITHOUT ROWID",
+            )
+            postings: dict[tuple[str, str], array.array[int]] = {}
+            pinyin: dict[str, list[tuple[int, int]]] = {}
+            definitions: list[tuple[int, str]] = []
+            batch: list[tuple[int, bytes]] = []
+            for record in records:
+                codepoint = ord(record["char"])
+                batch.append((codepoint, _dump_record(record)))
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    conn.executemany("INSERT INTO records VALUES (?, ?)", batch)
+                    batch.clear()
+                for field, value in record.items():
+                    if field in INDEX_FIELDS:
+                        continue
+                    for key in posting_keys(field, value):
+                        posting = postings.get(key)
+                        if posting is None:
+                            posting = postings[key] = array.array("I")
+                        posting.append(codepoint)
+                for pinyin_key, frequency in pinyin_keys(record).items():
+                    pinyin.setdefault(pinyin_key, []).append((-frequency, codepoint))
+                definition = _definition(record)
+                if definition:
+                    definitions.append((codepoint, definition))
+            conn.executemany("INSERT INTO records VALUES (?, ?)", batch)
+            conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)",
+                (
+                    (field, value, posting.tobytes())
+                    for (field, value), posting in postings.items()
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO pinyin VALUES (?, ?)",
+                (
+                    (key, array.array("I", [cp for _, cp in sorted(ranked)]).tobytes())
+                    for key, ranked in pinyin.items()
+                ),
+            )
+            _build_text_index(conn, definitions)
+            conn.commit()
+        finally:
+            conn.close()
+        tmp_path.replace(path)
+        log.info("Done building index.")
+
+        return cls(path)
+
+    def get(self, char: str) -> dict[str, t.Any] | None:
+        """Return the record of ``char``, or None if it has no UNIHAN data.
+
+        Parameters
+        ----------
+        char : str
+            single character
+
+        Returns
+        -------
+        dict or None :
+            the character's expanded record
+        """
+        row = self._conn.execute(
+            "SELECT record FROM records WHERE codepoint = ?",
+            (ord(char),),
+        ).fetchone()
+        if row is None:
+            return None
+        record: dict[str, t.Any] = pickle.loads(row[0])
+        return record
+
+    def get_many(
+        self,
+        chars: Iterable[str],
+    ) -> Iterator[tuple[str, dict[str, t.Any] | None]]:
+        """Yield each of ``chars`` with its record, or None if it has none.
+
+        Records are read in chunks, a query each, rather than one query per
+        character, and yielded as each chunk is read.
+
+        Parameters
+        ----------
+        chars : iterable of str
+            single characters
+
+        Yields
+        ------
+        tuple of str and dict or None :
+            each character and its expanded record, in the order of ``chars``
+        """
+        chunk_size = INDEX_BATCH_SIZE // 10
+        chars = iter(chars)
+        while chunk := list(itertools.islice(chars, chunk_size)):
+            # Chunked to stay within SQLite's limit on bound parameters
+            codepoints = [ord(char) for char in chunk]
+            records = dict(
+                self._conn.execute(
+                    "SELECT codepoint, record FROM records "
+                    f"WHERE codepoint IN ({', '.join('?' * len(codepoints))})",
+                    codepoints,
+                ),
+            )
+            for char, codepoint in zip(chunk, codepoints, strict=True):
+                row = records.get(codepoint)
+                yield char, None if row is None else pickle.loads(row)
+
+    def codepoints(self, field: str, value: t.Any) -> list[int]:
+        """Return the codepoints of characters with ``value`` in ``field``.
+
+        Parameters
+        ----------
+        field : str
+            field name, or dotted path into an expanded value, e.g.
+            ``kMandarin`` or ``kMandarin.zh-Hans``
+        value : str or int
+            scalar to look for, compared by :func:`value_key`
+
+        Returns
+        -------
+        list of int :
+            ascending codepoints, empty if no character matches
+        """
+        row = self._conn.execute(
+            "SELECT codepoints FROM postings WHERE field = ? AND value = ?",
+            (field, value_key(value)),
+        ).fetchone()
+        posting: array.array[int] = array.array("I")
+        if row is not None:
+            posting.frombytes(row[0])
+        return posting.tolist()
+
+    def pinyin(self, reading: str) -> list[int]:
+        """Return the codepoints of characters with a pinyin reading.
+
+        Readings come from :data:`PINYIN_FIELDS`. Characters are ranked by
+        their kHanyuPinlu frequency for the reading, then by codepoint.
+
+        Parameters
+        ----------
+        reading : str
+            syllable with a tone mark (``hǎo``) or number (``hao3``) to match
+            that tone, or without either (``hao``) to match any tone
+
+        Returns
+        -------
+        list of int :
+            codepoints, most frequent first, empty if no character matches
+
+        Raises
+        ------
+        ValueError :
+            if ``reading`` isn't a syllable, per
+            :func:`~unihan_etl.util.split_pinyin_tone`
+        """
+        toneless, tone = split_pinyin_tone(reading)
+        row = self._conn.execute(
+            "SELECT codepoints FROM pinyin WHERE key = ?",
+            (toneless if tone is None else f"{toneless}{tone}",),
+        ).fetchone()
+        ranked: array.array[int] = array.array("I")
+        if row is not None:
+            ranked.frombytes(row[0])
+        return ranked.tolist()
+
+    def text(self, query: str, limit: int | None = None) -> list[int]:
+        """Return the codepoints of characters whose kDefinition matches ``query``.
+
+        Parameters
+        ----------
+        query : str
+            words that must all occur in the definition, ignoring case and
+            diacritics. End a word with ``*`` to match it as a prefix, e.g.
+            ``hors*``.
+        limit : int, optional
+            most codepoints to return
+
+        Returns
+        -------
+        list of int :
+            codepoints, best match first: by FTS5's bm25 rank, or, without
+            FTS5, shortest definition first
+
+        Raises
+        ------
+        ValueError :
+            if ``query`` has no words
+        """
+        terms = parse_text_query(query)
+        if self._text_fts:
+            match = " ".join(
+                f'"{term}"' + ("*" if prefix else "") for term, prefix in terms
+            )
+            rows = self._conn.execute(
+                "SELECT rowid FROM text_fts WHERE text_fts MATCH ? "
+                "ORDER BY rank, rowid LIMIT ?",
+                (match, -1 if limit is None else limit),
+            ).fetchall()
+            return [row[0] for row in rows]
+
+        matches: set[int] | None = None
+        for term, prefix in terms:
+            if prefix:
+                rows = self._conn.execute(
+                    "SELECT codepoints FROM text_terms WHERE term >= ? AND term < ?",
+                    (term, term + "\U0010ffff"),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT codepoints FROM text_terms WHERE term = ?",
+                    (term,),
+                ).fetchall()
+            codepoints: set[int] = set()
+            for row in rows:
+                posting: array.array[int] = array.array("I")
+                posting.frombytes(row[0])
+                codepoints.update(posting)
+            matches = codepoints if matches is None else matches & codepoints
+            if not matches:
+                return []
+        matched = sorted(matches or ())
+        lengths: dict[int, int] = {}
+        # Chunked to stay within SQLite's limit on bound parameters
+        for start in range(0, len(matched), INDEX_BATCH_SIZE // 10):
+            chunk = matched[start : start + INDEX_BATCH_SIZE // 10]
+            lengths.update(
+                self._conn.execute(
+                    "SELECT codepoint, length FROM text_lengths "
+                    f"WHERE codepoint IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ),
+            )
+        ranked = sorted(lengths, key=lambda codepoint: (lengths[codepoint], codepoint))
+        return ranked if limit is None else ranked[:limit]
+
+    @functools.cached_property
+    def _text_fts(self) -> bool:
+        """Whether definitions are indexed in FTS5, rather than by term."""
+        row = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'text_fts'",
+        ).fetchone()
+        return row is not None
+
+    def find(self, where: Mapping[str, t.Any]) -> list[dict[str, t.Any]]:
+        """Return the records of characters matching every condition in ``where``.
+
+        Parameters
+        ----------
+        where : dict
+            values to look for, by field or dotted path, per :meth:`codepoints`
+
+        Returns
+        -------
+        list of dict :
+            matching records, in codepoint order
+
+        Examples
+        --------
+        Characters read *hǎo* with six strokes::
+
+            index.find({"kMandarin": "hǎo", "kTotalStrokes": 6})
+        """
+        matches: set[int] | None = None
+        for field, value in where.items():
+            codepoints = set(self.codepoints(field, value))
+            matches = codepoints if matches is None else matches & codepoints
+            if not matches:
+                return []
+        records = []
+        for codepoint in sorted(matches or ()):
+            record = self.get(chr(codepoint))
+            assert record is not None
+            records.append(record)
+        return records
+
+    def __contains__(self, char: object) -> bool:
+        """Return True if ``char`` has a record in the index."""
+        return isinstance(char, str) and len(char) == 1 and self.get(char) is not None
+
+    def __len__(self) -> int:
+        """Return the number of characters in the index."""
+        row = self._conn.execute("SELECT COUNT(*) FROM records").fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close the index database."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        """Return the index for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the index on leaving the context."""
+        self.close()
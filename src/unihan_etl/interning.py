@@ -0,0 +1,302 @@
+"""Deduplicate the values of exported records held in memory.
+
+A ``python`` export of UNIHAN holds millions of small values, and many are
+equal: field names repeated in every record, readings, IRG sources, stroke
+count dicts such as ``{"zh-Hans": 6, "zh-Hant": 6}``. :class:`Interner`
+replaces each equal string or number with one shared object and, unless told
+not to, each equal list or dict with one shared frozen object, per
+:func:`~unihan_etl.expansion.freeze`: lists become tuples and dicts
+:class:`~unihan_etl.expansion.FrozenDict`.
+
+Values of :data:`DISTINCT_FIELDS`, nearly all distinct, are left as they are:
+interning them would only grow the tables.
+
+It estimates the bytes of the objects it lets go, as :func:`sys.getsizeof`
+measures them, less those its tables hold, as :attr:`InternStats.bytes_saved`.
+An object found twice in a record is counted once; one also referenced by other
+records, or from outside them, is counted though it's kept.
+"""
+
+from __future__ import annotations
+
+import array
+import operator
+import sys
+import typing as t
+
+from unihan_etl.expansion import FrozenDict, LazyRecord
+
+if t.TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, MutableMapping, MutableSequence
+
+
+#: Fields whose values are nearly all distinct: definitions, the codes of
+#: character sets and links to variants. Their values aren't interned.
+DISTINCT_FIELDS = frozenset(
+    {
+        "kBigFive",
+        "kCCCII",
+        "kCNS1986",
+        "kCNS1992",
+        "kCangjie",
+        "kCompatibilityVariant",
+        "kDefinition",
+        "kEACC",
+        "kGB0",
+        "kGB1",
+        "kGB3",
+        "kGB5",
+        "kGB8",
+        "kIBMJapan",
+        "kJIS0213",
+        "kJis0",
+        "kJis1",
+        "kMainlandTelegraph",
+        "kPseudoGB1",
+        "kSemanticVariant",
+        "kSimplifiedVariant",
+        "kSpecializedSemanticVariant",
+        "kSpoofingVariant",
+        "kTaiwanTelegraph",
+        "kTraditionalVariant",
+        "kXerox",
+        "kZVariant",
+    },
+)
+
+
+class InternStats(t.NamedTuple):
+    """Counters of an :class:`Interner`, per :meth:`Interner.stats`."""
+
+    #: Strings and numbers replaced by an equal, shared one.
+    values: int
+    #: Lists and dicts replaced by an equal, shared one.
+    objects: int
+    #: Estimated bytes of the objects let go, less those of frozen copies made
+    #: and of the tables.
+    bytes_saved: int
+    #: Estimated bytes of the tables, keys and slots, not the values they share.
+    table_bytes: int
+
+
+class Interner:
+    """Replace equal values of records with shared objects.
+
+    Children are interned before their containers, so equal containers hold
+    the very same children and are keyed on their identities.
+
+    Parameters
+    ----------
+    share_objects : bool
+        also share equal lists and dicts, frozen; if off, they're kept as
+        they are, and only the strings and numbers within them are shared
+    skip_fields : collection of str
+        fields whose values are left as they are, by default
+        :data:`DISTINCT_FIELDS`
+
+    Examples
+    --------
+    >>> interner = Interner()
+    >>> first = interner.intern_record({"char": "好", "kTotalStrokes": {"zh-Hans": 6}})
+    >>> second = interner.intern_record({"char": "如", "kTotalStrokes": {"zh-Hans": 6}})
+    >>> first["kTotalStrokes"] is second["kTotalStrokes"]
+    True
+    >>> interner.stats().objects
+    1
+    """
+
+    def __init__(
+        self,
+        share_objects: bool = True,
+        skip_fields: Collection[str] = DISTINCT_FIELDS,
+    ) -> None:
+        """Create an interner with empty tables."""
+        self.share_objects = share_objects
+        self.skip_fields = skip_fields
+        # Strings are keyed by themselves, other scalars with their type, as
+        # 1, 1.0 and True are equal
+        self._values: dict[t.Any, t.Any] = {}
+        # Containers are keyed by their kind and their children's ids, packed
+        self._objects: dict[bytes, t.Any] = {}
+        self._interned_values = 0
+        self._interned_objects = 0
+        self._bytes_saved = 0
+        # Replacements made in the record being interned, by id; the record
+        # keeps the replaced objects, and so their ids, alive meanwhile.
+        self._replaced: dict[int, t.Any] | None = None
+
+    def intern(self, value: t.Any) -> t.Any:
+        """Return the shared object equal to ``value``.
+
+        Parameters
+        ----------
+        value : object
+            a value of a record: a string, number, list or dict, nested or
+            not; other objects are returned as is
+
+        Returns
+        -------
+        object :
+            ``value``, or an equal object interned earlier; lists and dicts
+            are frozen if objects are shared
+        """
+        if self._replaced is not None and id(value) in self._replaced:
+            return self._replaced[id(value)]
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            value_key = value if type(value) is str else (type(value), value)
+            canonical = self._values.setdefault(value_key, value)
+            if canonical is not value:
+                self._interned_values += 1
+                self._bytes_saved += sys.getsizeof(value)
+                self._remember(value, canonical)
+            return canonical
+        if isinstance(value, (list, tuple)):
+            items = [self.intern(item) for item in value]
+            if not self.share_objects:
+                if isinstance(value, list):
+                    value[:] = items
+                    return value
+                return tuple(items)
+            if isinstance(value, tuple) and all(map(operator.is_, items, value)):
+                frozen: t.Any = value
+            else:
+                frozen = tuple(items)
+            key = b"t" + array.array("Q", map(id, items)).tobytes()
+        elif isinstance(value, dict):
+            pairs = [(self.intern(k), self.intern(v)) for k, v in value.items()]
+            if not self.share_objects:
+                return _replace_items(value, pairs)
+            if isinstance(value, FrozenDict) and all(value[k] is v for k, v in pairs):
+                frozen = value
+            else:
+                frozen = FrozenDict(pairs)
+            key = (
+                b"d"
+                + array.array(
+                    "Q",
+                    [id(item) for pair in pairs for item in pair],
+                ).tobytes()
+            )
+        else:
+            return value
+
+        canonical = self._objects.setdefault(key, frozen)
+        if canonical is not frozen:
+            self._interned_objects += 1
+            self._bytes_saved += sys.getsizeof(value)
+        elif frozen is not value:
+            self._bytes_saved += sys.getsizeof(value) - sys.getsizeof(frozen)
+        if canonical is not value:
+            self._remember(value, canonical)
+        return canonical
+
+    def _remember(self, value: t.Any, canonical: t.Any) -> None:
+        if self._replaced is not None:
+            self._replaced[id(value)] = canonical
+
+    @t.overload
+    def intern_record(self, record: LazyRecord) -> LazyRecord: ...
+
+    @t.overload
+    def intern_record(self, record: dict[str, t.Any]) -> dict[str, t.Any]: ...
+
+    @t.overload
+    def intern_record(
+        self,
+        record: Mapping[str, t.Any],
+    ) -> MutableMapping[str, t.Any]: ...
+
+    def intern_record(
+        self,
+        record: Mapping[str, t.Any],
+    ) -> MutableMapping[str, t.Any]:
+        """Return ``record`` with its field names and values interned.
+
+        The record itself stays a plain dict, which may be changed. A
+        :class:`~unihan_etl.expansion.LazyRecord` has its stored values
+        interned, raw or expanded, without expanding any. Values of
+        :attr:`skip_fields` are kept as they are.
+        """
+        self._replaced = {}
+        try:
+            if isinstance(record, LazyRecord):
+                return record.map_stored(self._intern_item)
+            return dict(self._intern_item(k, v) for k, v in record.items())
+        finally:
+            self._replaced = None
+
+    def _intern_item(self, field: str, value: t.Any) -> tuple[str, t.Any]:
+        if field in self.skip_fields:
+            return self.intern(field), value
+        return self.intern(field), self.intern(value)
+
+    def _table_bytes(self) -> int:
+        """Return the bytes of the tables, their keys and slots."""
+        total = sys.getsizeof(self._values) + sys.getsizeof(self._objects)
+        total += sum(sys.getsizeof(key) for key in self._values if type(key) is tuple)
+        return total + sum(map(sys.getsizeof, self._objects))
+
+    def stats(self) -> InternStats:
+        """Return the counters of values interned so far.
+
+        The tables are measured on each call, in time linear in their size.
+        """
+        table_bytes = self._table_bytes()
+        return InternStats(
+            values=self._interned_values,
+            objects=self._interned_objects,
+            bytes_saved=self._bytes_saved - table_bytes,
+            table_bytes=table_bytes,
+        )
+
+
+def _replace_items(
+    value: dict[t.Any, t.Any],
+    pairs: list[tuple[t.Any, t.Any]],
+) -> dict[t.Any, t.Any]:
+    """Return ``value`` holding ``pairs``: in place, unless it's frozen."""
+    if isinstance(value, FrozenDict):
+        return FrozenDict(pairs)
+    value.clear()
+    value.update(pairs)
+    return value
+
+
+def intern_records(
+    records: MutableSequence[dict[str, t.Any]],
+    share_objects: bool = True,
+    skip_fields: Collection[str] = DISTINCT_FIELDS,
+) -> InternStats:
+    """Intern the values of ``records`` in place, per :class:`Interner`.
+
+    Parameters
+    ----------
+    records : list of dict
+        records, as returned by :meth:`~unihan_etl.core.Packager.export`
+    share_objects : bool
+        also share equal lists and dicts, frozen
+    skip_fields : collection of str
+        fields whose values are left as they are
+
+    Returns
+    -------
+    :class:`InternStats` :
+        what was shared, and the bytes saved
+
+    Examples
+    --------
+    >>> records = [
+    ...     {"char": "好", "kMandarin": "".join(["h", "ǎo"])},
+    ...     {"char": "郝", "kMandarin": "".join(["h", "ǎo"])},
+    ... ]
+    >>> records[0]["kMandarin"] is records[1]["kMandarin"]
+    False
+    >>> intern_records(records).values > 0
+    True
+    >>> records[0]["kMandarin"] is records[1]["kMandarin"]
+    True
+    """
+    interner = Interner(share_objects=share_objects, skip_fields=skip_fields)
+    for i, record in enumerate(records):
+        records[i] = interner.intern_record(record)
+    return interner.stats()
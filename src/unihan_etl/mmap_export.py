@@ -0,0 +1,313 @@
+"""Export UNIHAN into a memory-mapped lookup file.
+
+The file is laid out for :class:`UnihanMmap` to :mod:`mmap` and decode one
+record at a time, so many processes share a single page-cached copy and open
+it without reading it:
+
+- a fixed-size header, per :data:`MMAP_HEADER`
+- each record's payload: its length as a 4-byte integer, then the record,
+  without ``ucn`` and ``char``, as compact UTF-8 JSON
+- the codepoint segments: runs of codepoints, such as a CJK block, with
+  first and past-last codepoints and where their offset table starts
+- each segment's offset table: one 4-byte payload offset per codepoint in
+  the segment, ``0`` for codepoints without data
+- JSON metadata: the exported fields
+
+Integers are little-endian. Codepoints less than :data:`MMAP_SEGMENT_GAP`
+apart share a segment, so a lookup is a search among a handful of segments
+and one read from its table. As in JSON exports, enums are stored by value.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import mmap
+import pathlib
+import struct
+import typing as t
+
+from unihan_etl.constants import INDEX_FIELDS
+from unihan_etl.util import json_default
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from unihan_etl.types import StrPath
+
+log = logging.getLogger(__name__)
+
+#: First bytes of every lookup file.
+MMAP_MAGIC = b"UNIHANMM"
+
+#: Bumped whenever the layout of the lookup file changes.
+MMAP_FORMAT_VERSION = 1
+
+#: Header: magic, format version, reserved, record count, segment count,
+#: offset of the segments, offset and length of the metadata.
+MMAP_HEADER = struct.Struct("<8sHHIIQQI")
+
+#: Segment: first codepoint, past-last codepoint, offset of its offset table.
+MMAP_SEGMENT = struct.Struct("<IIQ")
+
+#: Payload offset in an offset table, or payload length before a payload.
+_UINT32 = struct.Struct("<I")
+
+#: Gap in codepoints past which a new segment starts, rather than covering
+#: the gap with empty offset table entries.
+MMAP_SEGMENT_GAP = 1024
+
+
+def _ucn(codepoint: int) -> str:
+    return f"U+{codepoint:04X}"
+
+
+def _segments(codepoints: Sequence[int]) -> list[tuple[int, int]]:
+    """Return ``(start, stop)`` runs covering ``codepoints``, split at gaps."""
+    segments: list[tuple[int, int]] = []
+    for codepoint in codepoints:
+        if segments and codepoint - segments[-1][1] < MMAP_SEGMENT_GAP:
+            segments[-1] = (segments[-1][0], codepoint + 1)
+        else:
+            segments.append((codepoint, codepoint + 1))
+    return segments
+
+
+def _write_mmap(
+    f: t.BinaryIO,
+    data: Iterable[Mapping[str, t.Any]],
+    fields: Sequence[str],
+) -> None:
+    """Write the lookup file of ``data`` to ``f``, per :func:`export_mmap`."""
+    encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=json_default,
+    )
+
+    codepoints: list[int] = []
+    offsets: dict[int, int] = {}
+    f.write(b"\0" * MMAP_HEADER.size)
+    for record in data:
+        codepoint = ord(record["char"])
+        if codepoints and codepoint <= codepoints[-1]:
+            msg = f"Records are not in codepoint order at {record['ucn']}"
+            raise ValueError(msg)
+        payload = encoder.encode(
+            {k: v for k, v in record.items() if k not in INDEX_FIELDS},
+        ).encode("utf-8")
+        offset = f.tell()
+        if offset + _UINT32.size + len(payload) > 0xFFFFFFFF:
+            msg = "Lookup file would exceed 4 GiB"
+            raise ValueError(msg)
+        f.write(_UINT32.pack(len(payload)))
+        f.write(payload)
+        codepoints.append(codepoint)
+        offsets[codepoint] = offset
+
+    segments = _segments(codepoints)
+    segments_offset = f.tell()
+    table_offset = segments_offset + MMAP_SEGMENT.size * len(segments)
+    for start, stop in segments:
+        f.write(MMAP_SEGMENT.pack(start, stop, table_offset))
+        table_offset += _UINT32.size * (stop - start)
+    for start, stop in segments:
+        f.write(
+            b"".join(
+                _UINT32.pack(offsets.get(codepoint, 0))
+                for codepoint in range(start, stop)
+            ),
+        )
+
+    metadata = json.dumps(
+        {"fields": [field for field in fields if field not in INDEX_FIELDS]},
+    ).encode("utf-8")
+    metadata_offset = f.tell()
+    f.write(metadata)
+
+    f.seek(0)
+    f.write(
+        MMAP_HEADER.pack(
+            MMAP_MAGIC,
+            MMAP_FORMAT_VERSION,
+            0,
+            len(codepoints),
+            len(segments),
+            segments_offset,
+            metadata_offset,
+            len(metadata),
+        ),
+    )
+
+
+def export_mmap(
+    data: Iterable[Mapping[str, t.Any]],
+    destination: StrPath,
+    fields: Sequence[str],
+) -> None:
+    """Export UNIHAN into a lookup file for :class:`UnihanMmap`.
+
+    Payloads are written as ``data`` yields them; the offset tables, which
+    need every codepoint, go after them. The file is written to a sibling temp
+    file and moved over ``destination``; the temp file is removed if the export
+    fails.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        records in codepoint order, expanded or not
+    destination : str or pathlib.Path
+        lookup file to write
+    fields : list of str
+        exported fields, recorded in the file's metadata
+
+    Raises
+    ------
+    ValueError :
+        if records are out of codepoint order, or the file outgrows the
+        4 GiB a payload offset can address
+    """
+    destination = pathlib.Path(destination)
+    tmp_path = destination.parent / (destination.name + ".tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            _write_mmap(f, data, fields)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(destination)
+    log.info("Saved output to: %s", destination)
+
+
+class UnihanMmap:
+    """Read-only, memory-mapped view of a lookup file written by :func:`export_mmap`.
+
+    Opening maps the file without reading it; each lookup decodes only the
+    record asked for.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        lookup file to open
+
+    Raises
+    ------
+    FileNotFoundError :
+        if no file exists at ``path``
+    ValueError :
+        if the file isn't a lookup file of this version of unihan-etl
+    """
+
+    def __init__(self, path: StrPath) -> None:
+        """Map the lookup file at ``path``."""
+        self.path = pathlib.Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < MMAP_HEADER.size:
+            self._mmap.close()
+            msg = f"Not a UNIHAN lookup file: {self.path}"
+            raise ValueError(msg)
+        (
+            magic,
+            version,
+            _,
+            self._len,
+            segment_count,
+            segments_offset,
+            metadata_offset,
+            metadata_length,
+        ) = MMAP_HEADER.unpack_from(self._mmap)
+        if magic != MMAP_MAGIC or version != MMAP_FORMAT_VERSION:
+            self._mmap.close()
+            msg = f"Not a UNIHAN lookup file of version {MMAP_FORMAT_VERSION}: {path}"
+            raise ValueError(msg)
+
+        self._segments = [
+            MMAP_SEGMENT.unpack_from(
+                self._mmap,
+                segments_offset + i * MMAP_SEGMENT.size,
+            )
+            for i in range(segment_count)
+        ]
+        self._starts = [start for start, _, _ in self._segments]
+        metadata = json.loads(
+            self._mmap[metadata_offset : metadata_offset + metadata_length],
+        )
+        #: Fields exported into the file, excluding ``ucn`` and ``char``.
+        self.fields: list[str] = metadata["fields"]
+
+    def _offset(self, codepoint: int) -> int:
+        """Return the payload offset of ``codepoint``, ``0`` if it has none."""
+        i = bisect.bisect_right(self._starts, codepoint) - 1
+        if i < 0:
+            return 0
+        start, stop, table_offset = self._segments[i]
+        if codepoint >= stop:
+            return 0
+        offset: int = _UINT32.unpack_from(
+            self._mmap,
+            table_offset + _UINT32.size * (codepoint - start),
+        )[0]
+        return offset
+
+    def _record(self, codepoint: int, offset: int) -> dict[str, t.Any]:
+        (length,) = _UINT32.unpack_from(self._mmap, offset)
+        start = offset + _UINT32.size
+        record: dict[str, t.Any] = {"ucn": _ucn(codepoint), "char": chr(codepoint)}
+        record.update(json.loads(self._mmap[start : start + length]))
+        return record
+
+    def get(self, char: str) -> dict[str, t.Any] | None:
+        """Return the record of ``char``, or None if it has no UNIHAN data.
+
+        Parameters
+        ----------
+        char : str
+            single character
+
+        Returns
+        -------
+        dict or None :
+            the character's record, as exported
+        """
+        codepoint = ord(char)
+        offset = self._offset(codepoint)
+        return self._record(codepoint, offset) if offset else None
+
+    def __contains__(self, char: object) -> bool:
+        """Return True if ``char`` has a record in the file."""
+        return isinstance(char, str) and len(char) == 1 and self._offset(ord(char)) != 0
+
+    def __len__(self) -> int:
+        """Return the number of characters in the file."""
+        return int(self._len)
+
+    def __iter__(self) -> Iterator[dict[str, t.Any]]:
+        """Yield the records in codepoint order."""
+        for start, stop, _ in self._segments:
+            for codepoint in range(start, stop):
+                offset = self._offset(codepoint)
+                if offset:
+                    yield self._record(codepoint, offset)
+
+    def close(self) -> None:
+        """Unmap the lookup file."""
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        """Return the reader for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Unmap the file on leaving the context."""
+        self.close()
@@ -35,10 +35,11 @@ class Options:
     zip_path : pathlib.Path
         Path the zip is downloaded to and read back from.
     work_dir : pathlib.Path
-        Directory the zip's data files are extracted into.
+        Directory the zip's data files are extracted into. Unused when
+        ``extract`` is off.
     fields : Sequence[str]
         UNIHAN fields to export, index fields included.
-    format : t.Literal["json", "csv", "yaml", "python"]
+    format : t.Literal["json", "ndjson", "csv", "yaml", "sqlite", "mmap", "python"]
         Export format.
     input_files : list[str]
         Files inside the zip to pull records from.
@@ -54,6 +55,44 @@ class Options:
     cache : bool
         Reuse a valid zip and already extracted files rather than downloading
         and extracting again.
+    extract : bool
+        Extract the zip into ``work_dir`` and read the data files from there.
+        When off, the data files are streamed straight out of the zip, halving
+        the I/O of a cold start and leaving no work directory behind.
+    workers : int
+        Processes to parse and expand data files in. ``1`` parses in the
+        calling process, ``0`` uses one process per CPU.
+    compact : bool
+        Write JSON and NDJSON without spaces after separators, and JSON
+        without indentation.
+    export_cache : bool
+        Keep exported files in a cache next to the zip, keyed on its contents
+        and these options, and link repeat exports from there. ``python``
+        exports are kept as pickled snapshots and loaded from there.
+    where : Sequence[tuple[str, str | None]]
+        ``(field, value)`` conditions every exported character meets: a raw
+        value of the field, or one of its space-separated items, equals
+        ``value``, or, with ``None``, the field has any value. Checked before
+        expansion, and the fields needn't be exported.
+    codepoint_ranges : Sequence[tuple[int, int]]
+        Export only characters in these ``(first, last)`` codepoint ranges,
+        along with ``blocks``. Checked as each line is read.
+    blocks : Sequence[str]
+        Export only characters in these blocks of
+        :data:`~unihan_etl.constants.CJK_BLOCKS`, e.g. ``uro`` or ``ext-b``.
+    memoize_expansion : bool
+        Expand through an :class:`~unihan_etl.expansion.ExpansionMemo`,
+        expanding each distinct raw value of a field once and sharing the
+        frozen result between characters: lists are tuples and dicts are
+        :class:`~unihan_etl.expansion.FrozenDict`.
+    intern_values : bool
+        Deduplicate the values of ``python`` exports as records are produced,
+        per :class:`~unihan_etl.interning.Interner`: equal strings, numbers,
+        and, frozen, lists and dicts are shared between records.
+    lazy_expansion : bool
+        Hold the records of ``python`` exports as
+        :class:`~unihan_etl.expansion.LazyRecord`, expanding each field on
+        first access rather than while exporting.
     log_level : LogLevel
         Level the logger is set up at.
     """
@@ -65,12 +104,24 @@ class Options:
     fields: Sequence[str] = dataclasses.field(
         default_factory=lambda: INDEX_FIELDS + UNIHAN_FIELDS,
     )
-    format: t.Literal["json", "csv", "yaml", "python"] = "csv"
+    format: t.Literal["json", "ndjson", "csv", "yaml", "sqlite", "mmap", "python"] = (
+        "csv"
+    )
     input_files: list[str] = dataclasses.field(default_factory=lambda: UNIHAN_FILES)
     download: bool = False
     expand: bool = True
     prune_empty: bool = True
     cache: bool = True
+    extract: bool = True
+    workers: int = 1
+    compact: bool = False
+    export_cache: bool = False
+    where: Sequence[tuple[str, str | None]] = ()
+    codepoint_ranges: Sequence[tuple[int, int]] = ()
+    blocks: Sequence[str] = ()
+    memoize_expansion: bool = False
+    intern_values: bool = False
+    lazy_expansion: bool = False
     log_level: LogLevel = "INFO"
 
     def __post_init__(self) -> None:
@@ -0,0 +1,305 @@
+"""Export UNIHAN into a SQLite database.
+
+The ``characters`` table holds one row per character, keyed by codepoint, with
+a column per exported field. Expanded fields holding lists or mappings are
+stored there as JSON and broken out into child tables named after the field,
+one row per item. An item's nested lists and mappings go one table further
+down, e.g. ``kHanyuPinyin_locations`` and ``kHanyuPinyin_readings``:
+
+.. code-block:: sql
+
+    SELECT c.char, r.value
+    FROM characters c
+    JOIN kHanyuPinyin p ON p.codepoint = c.codepoint
+    JOIN kHanyuPinyin_readings r ON r.parent_id = p.id
+    WHERE c.char = '㐀';
+
+Columns are typed by the values they hold, or per
+:data:`SQLITE_COLUMN_TYPES` for those whose values differ in type, and fields no
+character has a value for are ``TEXT``. Lookup columns of common fields are
+indexed, per :data:`SQLITE_LOOKUP_INDEXES`.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import logging
+import pathlib
+import sqlite3
+import typing as t
+
+from unihan_etl.constants import INDEX_FIELDS
+from unihan_etl.util import json_default
+
+if t.TYPE_CHECKING:
+    from collections.abc import Container, Iterable, Mapping, Sequence
+
+    from unihan_etl.types import StrPath
+
+log = logging.getLogger(__name__)
+
+#: Number of rows per table written per :meth:`sqlite3.Cursor.executemany`.
+SQLITE_BATCH_SIZE = 5000
+
+#: Columns indexed for lookups, by table, where the export has them.
+SQLITE_LOOKUP_INDEXES: dict[str, tuple[str, ...]] = {
+    "kCantonese": ("value",),
+    "kDefinition": ("value",),
+    "kHangul": ("value",),
+    "kHanyuPinlu": ("phonetic",),
+    "kHanyuPinyin_readings": ("value",),
+    "kJapaneseKun": ("value",),
+    "kJapaneseOn": ("value",),
+    "kKorean": ("value",),
+    "kMandarin": ("zh-Hans", "zh-Hant"),
+    "kRSUnicode": ("radical", "strokes"),
+    "kSemanticVariant": ("value",),
+    "kSimplifiedVariant": ("value",),
+    "kTotalStrokes": ("zh-Hans", "zh-Hant"),
+    "kTraditionalVariant": ("value",),
+    "kVietnamese": ("value",),
+    "kZVariant": ("value",),
+}
+
+
+#: Types of child table columns whose values differ in type, by table. In them,
+#: ``False``, which marks the absence of a value, is stored as NULL.
+SQLITE_COLUMN_TYPES: dict[str, dict[str, str]] = {
+    "kRSUnicode": {"simplified": "TEXT"},
+}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name; field keys hold characters such as ``-``."""
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+def _sql_value(value: t.Any) -> t.Any:
+    """Return ``value`` as stored in a column."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, default=json_default)
+    return value
+
+
+def _sql_type(value: t.Any) -> str:
+    if isinstance(value, (bool, int)):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+class _ChildTable:
+    """Schema, id counter and pending rows of one child table."""
+
+    def __init__(self, name: str, parent: str | None) -> None:
+        self.name = name
+        self.parent = parent
+        self.columns: list[str] = []
+        self.next_id = 1
+        self.batch: list[dict[str, t.Any]] = []
+
+
+class _SQLiteWriter:
+    """Insert records, growing the schema as new tables and keys turn up."""
+
+    def __init__(self, conn: sqlite3.Connection, fields: Sequence[str]) -> None:
+        self.conn = conn
+        self.fields = [f for f in fields if f not in INDEX_FIELDS]
+        self.tables: dict[str, _ChildTable] = {}
+        self.batch: list[dict[str, t.Any]] = []
+        # Field columns of ``characters``, added as their fields get values,
+        # typed by the first non-empty one; None while only empty ones are seen
+        self.columns: list[str] = []
+        self.column_types: dict[str, str | None] = {}
+
+        conn.execute(
+            "CREATE TABLE characters (codepoint INTEGER PRIMARY KEY, "
+            "ucn TEXT NOT NULL, char TEXT NOT NULL)",
+        )
+
+    def add(self, record: Mapping[str, t.Any]) -> None:
+        codepoint = ord(record["char"])
+        row = {"codepoint": codepoint, "ucn": record["ucn"], "char": record["char"]}
+        for field in self.fields:
+            value = record.get(field)
+            if value is None:
+                continue
+            row[field] = stored = _sql_value(value)
+            if self.column_types.get(field) is None:
+                self.column_types[field] = None if stored == "" else _sql_type(stored)
+            if isinstance(value, (list, tuple, dict)) and value:
+                self._add_items(field, None, codepoint, None, value)
+        self.batch.append(row)
+        if len(self.batch) >= SQLITE_BATCH_SIZE:
+            self.flush()
+
+    def _add_field_columns(self, fields: Container[str]) -> None:
+        """Add the columns of ``fields`` missing from ``characters``, in order."""
+        for field in self.fields:
+            if field in fields and field not in self.columns:
+                self.conn.execute(
+                    f"ALTER TABLE characters ADD COLUMN {_quote(field)} "
+                    f"{self.column_types.get(field) or 'TEXT'}",
+                )
+                self.columns.append(field)
+
+    def add_empty_columns(self) -> None:
+        """Add ``TEXT`` columns for the fields no record had a value for."""
+        self._add_field_columns(self.fields)
+
+    def _table(self, name: str, parent: str | None) -> _ChildTable:
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = _ChildTable(name, parent)
+            parent_column = (
+                ""
+                if parent is None
+                else f", parent_id INTEGER NOT NULL REFERENCES {_quote(parent)}(id)"
+            )
+            self.conn.execute(
+                f"CREATE TABLE {_quote(name)} (id INTEGER PRIMARY KEY, "
+                "codepoint INTEGER NOT NULL REFERENCES characters(codepoint)"
+                f"{parent_column}, seq INTEGER NOT NULL)",
+            )
+        return table
+
+    def _add_items(
+        self,
+        name: str,
+        parent: str | None,
+        codepoint: int,
+        parent_id: int | None,
+        value: Sequence[t.Any] | dict[str, t.Any],
+    ) -> None:
+        """Add the items of ``value`` as rows of table ``name``."""
+        table = self._table(name, parent)
+        column_types = SQLITE_COLUMN_TYPES.get(name, {})
+        items = [value] if isinstance(value, dict) else value
+        for seq, item in enumerate(items):
+            row_id = table.next_id
+            table.next_id += 1
+            row: dict[str, t.Any] = {"id": row_id, "codepoint": codepoint, "seq": seq}
+            if parent_id is not None:
+                row["parent_id"] = parent_id
+            entries = item.items() if isinstance(item, dict) else [("value", item)]
+            for key, entry in entries:
+                if isinstance(entry, (list, tuple, dict)):
+                    if entry:
+                        self._add_items(
+                            f"{name}_{key}",
+                            name,
+                            codepoint,
+                            row_id,
+                            entry,
+                        )
+                    continue
+                if key in column_types and entry is False:
+                    entry = None
+                if key not in table.columns:
+                    sql_type = column_types.get(key) or _sql_type(entry)
+                    self._add_column(table, key, sql_type)
+                row[key] = _sql_value(entry)
+            table.batch.append(row)
+
+        if len(table.batch) >= SQLITE_BATCH_SIZE:
+            self._flush_table(table)
+
+    def _add_column(self, table: _ChildTable, column: str, sql_type: str) -> None:
+        self.conn.execute(
+            f"ALTER TABLE {_quote(table.name)} ADD COLUMN {_quote(column)} {sql_type}",
+        )
+        table.columns.append(column)
+
+    def _flush_table(self, table: _ChildTable) -> None:
+        if not table.batch:
+            return
+        columns = ["id", "codepoint", "seq", *table.columns]
+        if table.parent is not None:
+            columns.append("parent_id")
+        self.conn.executemany(
+            f"INSERT INTO {_quote(table.name)} "
+            f"({', '.join(map(_quote, columns))}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            ([row.get(column) for column in columns] for row in table.batch),
+        )
+        table.batch.clear()
+
+    def flush(self) -> None:
+        """Write every pending row, parents before children."""
+        if self.batch:
+            self._add_field_columns(self.column_types)
+            columns = ["codepoint", "ucn", "char", *self.columns]
+            self.conn.executemany(
+                f"INSERT INTO characters ({', '.join(map(_quote, columns))}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                ([row.get(column) for column in columns] for row in self.batch),
+            )
+            self.batch.clear()
+        for table in self.tables.values():
+            self._flush_table(table)
+
+    def create_indexes(self) -> None:
+        """Index the links between tables and the lookup columns."""
+        self.conn.execute("CREATE INDEX characters_char ON characters (char)")
+        for table in self.tables.values():
+            link = "codepoint" if table.parent is None else "parent_id"
+            self.conn.execute(
+                f"CREATE INDEX {_quote(f'{table.name}_{link}')} "
+                f"ON {_quote(table.name)} ({link})",
+            )
+            for column in SQLITE_LOOKUP_INDEXES.get(table.name, ()):
+                if column in table.columns:
+                    self.conn.execute(
+                        f"CREATE INDEX {_quote(f'{table.name}_{column}')} "
+                        f"ON {_quote(table.name)} ({_quote(column)})",
+                    )
+
+
+def export_sqlite(
+    data: Iterable[Mapping[str, t.Any]],
+    destination: StrPath,
+    fields: Sequence[str],
+) -> None:
+    """Export UNIHAN into a SQLite database.
+
+    Records are inserted as ``data`` yields them, in batches of
+    :data:`SQLITE_BATCH_SIZE` rows, inside one transaction. The database is
+    written to a sibling temp file and moved over ``destination``; the temp
+    file is removed if the export fails.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        records, expanded or not
+    destination : str or pathlib.Path
+        database file to write
+    fields : list of str
+        fields to give a column in ``characters``
+    """
+    destination = pathlib.Path(destination)
+    tmp_path = destination.parent / (destination.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        writer = _SQLiteWriter(conn, fields)
+        for record in data:
+            writer.add(record)
+        writer.flush()
+        writer.add_empty_columns()
+        writer.create_indexes()
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+    tmp_path.replace(destination)
+    log.info("Saved output to: %s", destination)
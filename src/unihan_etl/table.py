@@ -0,0 +1,242 @@
+"""Columnar, in-memory table of UNIHAN records.
+
+:class:`UnihanTable` is an alternative to the list of per-character dicts of
+:meth:`unihan_etl.core.Packager.export`. Characters are one array of
+codepoints, from which ``ucn`` and ``char`` are derived, and each field is a
+column holding values only for the characters that have them. Scanning a
+field walks one column instead of every record, and memory grows with the
+data present rather than with characters times fields.
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import typing as t
+
+from unihan_etl.constants import INDEX_FIELDS
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+
+def _ucn(codepoint: int) -> str:
+    return f"U+{codepoint:04X}"
+
+
+class _Column(t.NamedTuple):
+    """Values of one field, with the rows they belong to in ascending order."""
+
+    rows: array.array[int]
+    values: list[t.Any]
+
+
+class UnihanTable:
+    """Columnar table of UNIHAN records, one row per character.
+
+    Build one with :meth:`from_records` or
+    :meth:`unihan_etl.core.Packager.export_table`.
+
+    Parameters
+    ----------
+    codepoints : array.array
+        codepoint of each row, ascending
+    fields : list of str
+        columns of the table, excluding ``ucn`` and ``char``
+    columns : dict
+        per field, the rows with a value and those values
+
+    Examples
+    --------
+    >>> table = UnihanTable.from_records(
+    ...     [
+    ...         {"ucn": "U+3400", "char": "㐀", "kCantonese": "jau1"},
+    ...         {"ucn": "U+3401", "char": "㐁", "kDefinition": "to lick"},
+    ...     ],
+    ...     fields=["kCantonese", "kDefinition"],
+    ... )
+    >>> len(table)
+    2
+    >>> table.get("㐁")
+    {'ucn': 'U+3401', 'char': '㐁', 'kDefinition': 'to lick'}
+    >>> table.column("kCantonese")
+    ['jau1', None]
+    """
+
+    def __init__(
+        self,
+        codepoints: array.array[int],
+        fields: Sequence[str],
+        columns: Mapping[str, _Column],
+    ) -> None:
+        """Wrap already built columns."""
+        self.codepoints = codepoints
+        self.fields = list(fields)
+        self._columns = dict(columns)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, t.Any]],
+        fields: Sequence[str],
+    ) -> UnihanTable:
+        """Build a table from records, consuming them one at a time.
+
+        Parameters
+        ----------
+        records : iterable of dict
+            records in codepoint order, dense or sparse, per
+            :meth:`unihan_etl.core.Packager.iter_records`
+        fields : list of str
+            fields to keep. ``ucn`` and ``char`` are always kept.
+
+        Returns
+        -------
+        :class:`UnihanTable` :
+            the table
+
+        Raises
+        ------
+        ValueError :
+            if records are out of codepoint order
+        """
+        fields = [f for f in fields if f not in INDEX_FIELDS]
+        codepoints: array.array[int] = array.array("I")
+        columns = {field: _Column(array.array("I"), []) for field in fields}
+
+        for row, record in enumerate(records):
+            codepoint = ord(record["char"])
+            if codepoints and codepoint <= codepoints[-1]:
+                msg = f"Records are not in codepoint order at {record['ucn']}"
+                raise ValueError(msg)
+            codepoints.append(codepoint)
+            for field, column in columns.items():
+                value = record.get(field)
+                if value is not None:
+                    column.rows.append(row)
+                    column.values.append(value)
+
+        return cls(codepoints, fields, columns)
+
+    def __len__(self) -> int:
+        """Return the number of characters in the table."""
+        return len(self.codepoints)
+
+    def __contains__(self, char: object) -> bool:
+        """Return True if ``char`` has a row in the table."""
+        return isinstance(char, str) and len(char) == 1 and self.index(char) is not None
+
+    def index(self, char: str) -> int | None:
+        """Return the row of ``char``, or None if it has no UNIHAN data."""
+        codepoint = ord(char)
+        row = bisect.bisect_left(self.codepoints, codepoint)
+        if row < len(self.codepoints) and self.codepoints[row] == codepoint:
+            return row
+        return None
+
+    def row(self, row: int) -> dict[str, t.Any]:
+        """Return the record at ``row``.
+
+        Parameters
+        ----------
+        row : int
+            row number; negative numbers count from the end
+
+        Returns
+        -------
+        dict :
+            the record, holding only the fields the character has data for
+
+        Raises
+        ------
+        IndexError :
+            if there's no such row
+        """
+        codepoint = self.codepoints[row]
+        if row < 0:
+            row += len(self.codepoints)
+        record: dict[str, t.Any] = {"ucn": _ucn(codepoint), "char": chr(codepoint)}
+        for field in self.fields:
+            column = self._columns[field]
+            i = bisect.bisect_left(column.rows, row)
+            if i < len(column.rows) and column.rows[i] == row:
+                record[field] = column.values[i]
+        return record
+
+    def get(self, char: str) -> dict[str, t.Any] | None:
+        """Return the record of ``char``, or None if it has no UNIHAN data."""
+        row = self.index(char)
+        return None if row is None else self.row(row)
+
+    def column(
+        self,
+        field: str,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> list[t.Any]:
+        """Return the values of ``field`` for rows ``start`` up to ``stop``.
+
+        Parameters
+        ----------
+        field : str
+            field name, ``ucn`` or ``char``
+        start : int
+            first row
+        stop : int, optional
+            row to stop before, the end by default
+
+        Returns
+        -------
+        list :
+            one value per row, None for characters without one
+
+        Raises
+        ------
+        KeyError :
+            if ``field`` isn't a column of the table
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.codepoints))
+        if field == "char":
+            return [chr(cp) for cp in self.codepoints[start:stop]]
+        if field == "ucn":
+            return [_ucn(cp) for cp in self.codepoints[start:stop]]
+
+        column = self._columns[field]
+        values: list[t.Any] = [None] * max(stop - start, 0)
+        first = bisect.bisect_left(column.rows, start)
+        last = bisect.bisect_left(column.rows, stop)
+        for row, value in zip(
+            column.rows[first:last],
+            column.values[first:last],
+            strict=True,
+        ):
+            values[row - start] = value
+        return values
+
+    def items(self, field: str) -> Iterator[tuple[str, t.Any]]:
+        """Yield ``(char, value)`` for each character with a value for ``field``.
+
+        Raises
+        ------
+        KeyError :
+            if ``field`` isn't a column of the table
+        """
+        column = self._columns[field]
+        for row, value in zip(column.rows, column.values, strict=True):
+            yield chr(self.codepoints[row]), value
+
+    def __iter__(self) -> Iterator[dict[str, t.Any]]:
+        """Yield the records row by row, built as they are reached."""
+        columns = [(field, self._columns[field]) for field in self.fields]
+        cursors = [0] * len(columns)
+        for row, codepoint in enumerate(self.codepoints):
+            record: dict[str, t.Any] = {
+                "ucn": _ucn(codepoint),
+                "char": chr(codepoint),
+            }
+            for i, (field, column) in enumerate(columns):
+                cursor = cursors[i]
+                if cursor < len(column.rows) and column.rows[cursor] == row:
+                    record[field] = column.values[cursor]
+                    cursors[i] = cursor + 1
+            yield record
@@ -37,6 +37,10 @@ UntypedUnihanData = Mapping[str, t.Any]
 UntypedNormalizedData: TypeAlias = Sequence[UntypedUnihanData]
 """Normalized UNIHAN data as a sequence of field-value mappings."""
 
+# Streamed w/ stream_normalize()
+ParsedLine: TypeAlias = tuple[int, str, str, str]
+"""A UNIHAN data line split into ``(codepoint, ucn, field, value)``."""
+
 # Export w/ listify()
 ListifiedExport = list[list[str]]
 
@@ -45,7 +49,7 @@ ExpandedExport: TypeAlias = Sequence[Mapping[str, t.Any]]
 """Expanded UNIHAN export with multi-value delimiters resolved."""
 
 # Valid output formats
-UnihanFormats = t.Literal["json", "csv", "yaml", "python"]
+UnihanFormats = t.Literal["json", "ndjson", "csv", "yaml", "sqlite", "mmap", "python"]
 
 
 @dataclasses.dataclass()
@@ -61,7 +65,8 @@ class Options:
     zip_path : pathlib.Path
         Path the zip is downloaded to and read back from.
     work_dir : pathlib.Path
-        Directory the zip's data files are extracted into.
+        Directory the zip's data files are extracted into. Unused when
+        ``extract`` is off.
     fields : tuple[str, ...]
         UNIHAN fields to export, index fields included.
     format : UnihanFormats
@@ -80,6 +85,37 @@ class Options:
     cache : bool
         Reuse a valid zip and already extracted files rather than downloading
         and extracting again.
+    extract : bool
+        Extract the zip into ``work_dir`` rather than streaming the data files
+        straight out of it.
+    workers : int
+        Processes to parse and expand data files in. ``1`` parses in the
+        calling process, ``0`` uses one process per CPU.
+    compact : bool
+        Write JSON and NDJSON without spaces after separators, and JSON
+        without indentation.
+    export_cache : bool
+        Keep exported files in a cache next to the zip, keyed on its contents
+        and these options, and link repeat exports from there. ``python``
+        exports are kept as pickled snapshots and loaded from there.
+    where : tuple[tuple[str, str | None], ...]
+        ``(field, value)`` conditions every exported character meets: a raw
+        value of the field, or one of its space-separated items, equals
+        ``value``, or, with ``None``, the field has any value. Checked before
+        expansion, and the fields needn't be exported.
+    codepoint_ranges : tuple[tuple[int, int], ...]
+        Export only characters in these ``(first, last)`` codepoint ranges,
+        along with ``blocks``. Checked as each line is read.
+    blocks : tuple[str, ...]
+        Export only characters in these blocks of
+        :data:`~unihan_etl.constants.CJK_BLOCKS`, e.g. ``uro`` or ``ext-b``.
+    memoize_expansion : bool
+        Expand each distinct raw value of a field once, sharing the frozen
+        result between characters.
+    intern_values : bool
+        Share equal values between the records of ``python`` exports.
+    lazy_expansion : bool
+        Expand the fields of ``python`` exports on first access.
     log_level : LogLevel
         Level the logger is set up at.
     """
@@ -95,6 +131,16 @@ class Options:
     expand: bool
     prune_empty: bool
     cache: bool
+    extract: bool
+    workers: int
+    compact: bool
+    export_cache: bool
+    where: tuple[tuple[str, str | None], ...]
+    codepoint_ranges: tuple[tuple[int, int], ...]
+    blocks: tuple[str, ...]
+    memoize_expansion: bool
+    intern_values: bool
+    lazy_expansion: bool
     log_level: LogLevel
 
 
@@ -2,16 +2,43 @@
 
 from __future__ import annotations
 
+import enum
 import re
 import sys
 import typing as t
+import unicodedata
+from collections.abc import Mapping
 
 if t.TYPE_CHECKING:
-    from collections.abc import Mapping
-
     from unihan_etl.types import UntypedUnihanData
 
 
+def json_default(value: object) -> t.Any:
+    """Return a JSON-serializable stand-in for ``value``, for :func:`json.dump`.
+
+    Expanded values hold enums, such as kRSUnicode's
+    :class:`~unihan_etl.expansion.kRSSimplifiedType`; they encode as their value.
+    Mappings other than dicts, such as
+    :class:`~unihan_etl.expansion.LazyRecord`, encode as dicts.
+
+    >>> import json
+    >>> from unihan_etl.expansion import kRSSimplifiedType
+    >>> json.dumps({"simplified": kRSSimplifiedType.Chinese}, default=json_default)
+    '{"simplified": "Chinese"}'
+
+    Raises
+    ------
+    TypeError :
+        if ``value`` has no JSON form, as :func:`json.dumps` would
+    """
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Mapping):
+        return dict(value)
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
 def ucn_to_unicode(ucn: str) -> str:
     r"""Return a python unicode value from a UCN.
 
@@ -39,6 +66,107 @@ def ucn_to_unicode(ucn: str) -> str:
     return char
 
 
+def parse_codepoint_range(value: str) -> tuple[int, int]:
+    """Return the ``(first, last)`` codepoints of a range such as ``U+4E00-U+9FFF``.
+
+    Either end is a UCN or hex codepoint; a single codepoint is a range of one.
+
+    >>> parse_codepoint_range("U+4E00-U+9FFF")
+    (19968, 40959)
+
+    >>> parse_codepoint_range("20000")
+    (131072, 131072)
+
+    Raises
+    ------
+    ValueError :
+        if an end isn't a codepoint, or the range ends before it starts
+    """
+    first_ucn, _, last_ucn = value.partition("-")
+    try:
+        first = int(first_ucn.strip().removeprefix("U+"), 16)
+        last = int(last_ucn.strip().removeprefix("U+"), 16) if last_ucn else first
+    except ValueError:
+        msg = f"Expected a codepoint range such as U+4E00-U+9FFF, got: {value!r}"
+        raise ValueError(msg) from None
+    if last < first or last > sys.maxunicode:
+        msg = f"Invalid codepoint range: {value!r}"
+        raise ValueError(msg)
+    return first, last
+
+
+def parse_condition(condition: str) -> tuple[str, str | None]:
+    """Return the field and value of a ``FIELD=VALUE`` or ``FIELD`` condition.
+
+    A condition without a value matches any character with the field.
+
+    >>> parse_condition("kMandarin=hǎo")
+    ('kMandarin', 'hǎo')
+
+    >>> parse_condition("kIICore")
+    ('kIICore', None)
+
+    Raises
+    ------
+    ValueError :
+        if the condition has no field
+    """
+    field, sep, value = condition.partition("=")
+    if not field.strip():
+        msg = f"Expected FIELD or FIELD=VALUE, got: {condition!r}"
+        raise ValueError(msg)
+    return field.strip(), value.strip() if sep else None
+
+
+#: Combining marks of the four pinyin tones, as left by NFD decomposition.
+_PINYIN_TONE_MARKS = {"\u0304": 1, "\u0301": 2, "\u030c": 3, "\u0300": 4}
+
+
+def split_pinyin_tone(syllable: str) -> tuple[str, int | None]:
+    """Return a pinyin syllable without its tone, and the tone.
+
+    Accepts tone marks (``hǎo``) and tone numbers (``hao3``, with ``5`` or
+    ``0`` for the neutral tone). ``ü`` may be written ``v`` or ``u:``.
+
+    >>> split_pinyin_tone("hǎo")
+    ('hao', 3)
+    >>> split_pinyin_tone("LV4")
+    ('lü', 4)
+    >>> split_pinyin_tone("ma0")
+    ('ma', 5)
+
+    Without a mark or number, the tone is unknown:
+
+    >>> split_pinyin_tone("hao")
+    ('hao', None)
+
+    Raises
+    ------
+    ValueError :
+        if ``syllable`` is empty or its tone number isn't 0 to 5
+    """
+    syllable = syllable.strip().lower()
+    tone: int | None = None
+    if syllable[-1:].isdigit():
+        tone = int(syllable[-1]) or 5
+        syllable = syllable[:-1]
+        if tone > 5:
+            msg = f"Pinyin tone must be 0 to 5: {syllable}{tone}"
+            raise ValueError(msg)
+    if not syllable:
+        msg = "Expected a pinyin syllable"
+        raise ValueError(msg)
+
+    letters = []
+    for char in unicodedata.normalize("NFD", syllable):
+        if char in _PINYIN_TONE_MARKS:
+            tone = _PINYIN_TONE_MARKS[char]
+        else:
+            letters.append(char)
+    toneless = unicodedata.normalize("NFC", "".join(letters))
+    return toneless.replace("u:", "ü").replace("v", "ü"), tone
+
+
 def ucnstring_to_python(ucn_string: str) -> bytes:
     r"""Return Unicode UCN (e.g. "U+4E00") as native Python Unicode (u'\\u4e00').
 
@@ -0,0 +1,323 @@
+"""Graph of the variant relations between UNIHAN characters.
+
+The fields of ``Unihan_Variants.txt`` relate a character to others, each
+value a UCN optionally followed by the dictionaries attesting it, e.g.
+``U+8AAA<kMatthews,kMeyerWempe``. :class:`VariantGraph` parses them once into
+edges keyed by character and groups characters into connected components,
+across all variant fields and per field, so every variant of a character,
+however distant, is read off its component. Graphs are saved with their
+components, which load back without being recomputed.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import typing as t
+
+from unihan_etl.util import ucn_to_unicode
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+    from unihan_etl.types import StrPath
+
+#: Version of the file format written by :meth:`VariantGraph.dump`.
+VARIANTS_FORMAT_VERSION = 1
+
+#: Fields relating characters to their variants, the edge types of a graph.
+VARIANT_FIELDS = (
+    "kSemanticVariant",
+    "kSimplifiedVariant",
+    "kSpecializedSemanticVariant",
+    "kSpoofingVariant",
+    "kTraditionalVariant",
+    "kZVariant",
+)
+
+
+class VariantEdge(t.NamedTuple):
+    """A variant relation, as UNIHAN states it for ``char``."""
+
+    #: Character the field belongs to.
+    char: str
+    #: Its variant.
+    variant: str
+    #: Field stating the relation, e.g. ``kSemanticVariant``.
+    field: str
+    #: Dictionaries attesting the relation, e.g. ``("kMatthews",)``.
+    sources: tuple[str, ...]
+
+
+def parse_variant(value: str) -> tuple[str, tuple[str, ...]]:
+    """Return the variant and sources of a variant field value.
+
+    >>> parse_variant("U+8AAA<kMatthews,kMeyerWempe")
+    ('說', ('kMatthews', 'kMeyerWempe'))
+    >>> parse_variant("U+8BF4")
+    ('说', ())
+    """
+    ucn, _, sources = value.partition("<")
+    return ucn_to_unicode(ucn), tuple(sources.split(",")) if sources else ()
+
+
+def get_variants_path(zip_path: StrPath, fingerprint: str) -> pathlib.Path:
+    """Return where the variant graph of the zip with ``fingerprint`` is kept.
+
+    The graph sits next to the zip it was built from.
+
+    >>> get_variants_path("/tmp/downloads/Unihan.zip", "0123456789abcdef").name
+    'unihan-variants-0123456789abcdef.v1.json'
+    """
+    return pathlib.Path(zip_path).parent / (
+        f"unihan-variants-{fingerprint}.v{VARIANTS_FORMAT_VERSION}.json"
+    )
+
+
+def _index_components(
+    components: list[tuple[str, ...]],
+) -> tuple[dict[str, int], list[tuple[str, ...]]]:
+    """Return each character's component, and ``components``."""
+    component_of = {
+        char: i for i, component in enumerate(components) for char in component
+    }
+    return component_of, components
+
+
+def _components(
+    edges: Iterable[VariantEdge],
+) -> tuple[dict[str, int], list[tuple[str, ...]]]:
+    """Return each character's component, and each component's characters.
+
+    Edges are followed in both directions.
+    """
+    parent: dict[str, str] = {}
+
+    def find(char: str) -> str:
+        root = parent.setdefault(char, char)
+        while root != parent[root]:
+            root = parent[root]
+        while char != root:
+            parent[char], char = root, parent[char]
+        return root
+
+    for edge in edges:
+        a, b = find(edge.char), find(edge.variant)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    members: dict[str, list[str]] = {}
+    for char in sorted(parent):
+        members.setdefault(find(char), []).append(char)
+    return _index_components(list(map(tuple, members.values())))
+
+
+class VariantGraph:
+    """Variant relations between characters, with precomputed components.
+
+    Build one with :meth:`from_records`,
+    :meth:`unihan_etl.core.Packager.export_variants` or :meth:`load`.
+
+    Parameters
+    ----------
+    edges : iterable of :class:`VariantEdge`
+        relations, as stated by the variant fields
+    components : dict, optional
+        components computed earlier from ``edges``, across all fields under
+        ``None`` and per field, as :meth:`load` reads them; computed if not
+        given
+
+    Examples
+    --------
+    >>> graph = VariantGraph.from_records(
+    ...     [
+    ...         {"ucn": "U+8AAA", "char": "說", "kSimplifiedVariant": "U+8BF4"},
+    ...         {"ucn": "U+8BF4", "char": "说", "kTraditionalVariant": "U+8AAA"},
+    ...         {"ucn": "U+8AAC", "char": "説", "kZVariant": "U+8AAA<kHKGlyph"},
+    ...     ],
+    ... )
+    >>> [f"U+{ord(char):04X}" for char in graph.variants("说")]
+    ['U+8AAA', 'U+8AAC']
+    >>> graph.variants("说", field="kTraditionalVariant")
+    ['說']
+    >>> graph.edges("説")
+    [VariantEdge(char='説', variant='說', field='kZVariant', sources=('kHKGlyph',))]
+    """
+
+    def __init__(
+        self,
+        edges: Iterable[VariantEdge],
+        components: Mapping[str | None, list[tuple[str, ...]]] | None = None,
+    ) -> None:
+        """Index ``edges`` and compute the components, unless given."""
+        self._edges: dict[str, list[VariantEdge]] = {}
+        by_field: dict[str, list[VariantEdge]] = {}
+        for edge in edges:
+            self._edges.setdefault(edge.char, []).append(edge)
+            by_field.setdefault(edge.field, []).append(edge)
+
+        if components is not None:
+            self._component, self._members = _index_components(components[None])
+            self._field_components = {
+                field: _index_components(components[field]) for field in by_field
+            }
+            return
+        self._component, self._members = _components(self)
+        self._field_components = {
+            field: _components(field_edges) for field, field_edges in by_field.items()
+        }
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, t.Any]],
+        fields: Sequence[str] = VARIANT_FIELDS,
+    ) -> VariantGraph:
+        """Build a graph from records, expanded or not.
+
+        Parameters
+        ----------
+        records : iterable of dict
+            records holding variant fields
+        fields : list of str
+            variant fields to take edges from
+
+        Returns
+        -------
+        :class:`VariantGraph` :
+            the graph
+        """
+
+        def iter_edges() -> Iterator[VariantEdge]:
+            for record in records:
+                for field in fields:
+                    values = record.get(field)
+                    if not values:
+                        continue
+                    if isinstance(values, str):
+                        values = values.split(" ")
+                    for value in values:
+                        variant, sources = parse_variant(value)
+                        yield VariantEdge(record["char"], variant, field, sources)
+
+        return cls(iter_edges())
+
+    def edges(self, char: str) -> list[VariantEdge]:
+        """Return the relations UNIHAN states for ``char``, in field order."""
+        return list(self._edges.get(char, ()))
+
+    def variants(self, char: str, field: str | None = None) -> list[str]:
+        """Return every character ``char`` is related to, directly or not.
+
+        Relations are followed in both directions: a character's traditional
+        variant lists it as its simplified variant and vice versa.
+
+        Parameters
+        ----------
+        char : str
+            single character
+        field : str, optional
+            follow only this variant field's relations
+
+        Returns
+        -------
+        list of str :
+            the variants, in codepoint order, without ``char`` itself
+        """
+        if field is None:
+            component, members = self._component, self._members
+        elif field in self._field_components:
+            component, members = self._field_components[field]
+        else:
+            return []
+        i = component.get(char)
+        if i is None:
+            return []
+        return [variant for variant in members[i] if variant != char]
+
+    def components(self, field: str | None = None) -> list[tuple[str, ...]]:
+        """Return the groups of characters that are variants of each other.
+
+        Parameters
+        ----------
+        field : str, optional
+            group by this variant field's relations only
+
+        Returns
+        -------
+        list of tuple of str :
+            each group in codepoint order, groups by their first character
+        """
+        if field is None:
+            return list(self._members)
+        if field not in self._field_components:
+            return []
+        return list(self._field_components[field][1])
+
+    def __contains__(self, char: object) -> bool:
+        """Return True if ``char`` has any variant."""
+        return char in self._component
+
+    def __len__(self) -> int:
+        """Return the number of characters with a variant."""
+        return len(self._component)
+
+    def __iter__(self) -> Iterator[VariantEdge]:
+        """Yield every edge."""
+        for edges in self._edges.values():
+            yield from edges
+
+    def dump(self, path: StrPath) -> None:
+        """Save the edges and components to a JSON file at ``path``, for :meth:`load`.
+
+        The file is written to a sibling temp file and moved into place.
+        """
+        path = pathlib.Path(path)
+        tmp_path = path.parent / (path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": VARIANTS_FORMAT_VERSION,
+                    "edges": [list(edge) for edge in self],
+                    "components": self._members,
+                    "field_components": {
+                        field: members
+                        for field, (_, members) in self._field_components.items()
+                    },
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: StrPath) -> VariantGraph:
+        """Return the graph saved at ``path`` by :meth:`dump`.
+
+        Components are read from the file rather than recomputed.
+
+        Raises
+        ------
+        ValueError :
+            if the file isn't a graph saved by this version of :meth:`dump`
+        """
+        with pathlib.Path(path).open(encoding="utf-8") as f:
+            saved = json.load(f)
+        if not isinstance(saved, dict) or saved.get("version") != (
+            VARIANTS_FORMAT_VERSION
+        ):
+            msg = f"Not a variant graph of format {VARIANTS_FORMAT_VERSION}: {path}"
+            raise ValueError(msg)
+        components: dict[str | None, list[tuple[str, ...]]] = {
+            field: list(map(tuple, members))
+            for field, members in saved["field_components"].items()
+        }
+        components[None] = list(map(tuple, saved["components"]))
+        return cls(
+            (
+                VariantEdge(char, variant, field, tuple(sources))
+                for char, variant, field, sources in saved["edges"]
+            ),
+            components,
+        )
@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import typing as t
+
 import pytest
 
+from unihan_etl.cli import search
 from unihan_etl.cli._colors import ColorMode, Colors
+from unihan_etl.core import Packager
+from unihan_etl.index import UnihanIndex
+
+if t.TYPE_CHECKING:
+    import pathlib
 
 
 @pytest.fixture
@@ -17,3 +25,14 @@ def colors_always() -> Colors:
 def colors_never() -> Colors:
     """Return Colors instance with NEVER mode."""
     return Colors(ColorMode.NEVER)
+
+
+@pytest.fixture
+def quick_search_index(
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> pathlib.Path:
+    """Point ``unihan-etl search`` at an index of the quick dataset."""
+    index_path = quick_packager.build_index()
+    monkeypatch.setattr(search, "_open_index", lambda: UnihanIndex(index_path))
+    return index_path
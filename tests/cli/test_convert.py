@@ -0,0 +1,104 @@
+"""Tests for convert subcommand."""
+
+from __future__ import annotations
+
+import io
+import typing as t
+
+import pytest
+
+from unihan_etl.cli import cli, convert as convert_command
+from unihan_etl.convert import Converter
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from unihan_etl.core import Packager
+
+
+@pytest.fixture
+def quick_convert(
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Converter:
+    """Point ``unihan-etl convert`` at the variants of the quick dataset."""
+    converter = Converter.from_options(quick_packager.options)
+    monkeypatch.setattr(convert_command, "_load_converter", lambda: converter)
+    return converter
+
+
+class ConvertCommandCase(t.NamedTuple):
+    """Case for :func:`test_convert_command`."""
+
+    test_id: str
+    args: list[str]
+    stdin: str
+    expected_stdout: str
+    expected_stderr: str
+
+
+CONVERT_COMMAND_CASES: list[ConvertCommandCase] = [
+    ConvertCommandCase(
+        test_id="default_hant",
+        args=[],
+        stdin="一万\n万一\n",
+        expected_stdout="一萬\n萬一\n",
+        expected_stderr="",
+    ),
+    ConvertCommandCase(
+        test_id="to_hans",
+        args=["--to", "hans"],
+        stdin="㑯\n",
+        expected_stdout="㑔\n",
+        expected_stderr="",
+    ),
+    ConvertCommandCase(
+        test_id="ambiguous",
+        args=["--ambiguous"],
+        stdin="万\n一么\n",
+        expected_stdout="萬\n一幺\n",
+        expected_stderr="<stdin>:2:2: 么 -> 幺 麼 麽\n",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(ConvertCommandCase._fields),
+    CONVERT_COMMAND_CASES,
+    ids=[case.test_id for case in CONVERT_COMMAND_CASES],
+)
+def test_convert_command(
+    quick_convert: Converter,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    test_id: str,
+    args: list[str],
+    stdin: str,
+    expected_stdout: str,
+    expected_stderr: str,
+) -> None:
+    """Stdin is written converted to stdout."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    assert cli(["convert", *args]) == 0
+
+    captured = capsys.readouterr()
+    assert captured.out == expected_stdout
+    assert captured.err == expected_stderr
+
+
+def test_convert_command_files(
+    quick_convert: Converter,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Files are converted in order, and missing ones fail."""
+    first = tmp_path / "first.txt"
+    first.write_text("万\n", encoding="utf-8")
+    second = tmp_path / "second.txt"
+    second.write_text("㑔\n", encoding="utf-8")
+
+    assert cli(["convert", str(first), str(second)]) == 0
+    assert capsys.readouterr().out == "萬\n㑯\n"
+
+    assert cli(["convert", str(tmp_path / "missing.txt")]) == 1
+    assert "Error:" in capsys.readouterr().err
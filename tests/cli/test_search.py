@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import io
+import json
 import typing as t
 
 import pytest
 
+from unihan_etl.cli import cli, create_parser
 from unihan_etl.cli.search import char_to_ucn, normalize_char_input
 
+if t.TYPE_CHECKING:
+    import pathlib
+
 
 class NormalizeCharInputFixture(t.NamedTuple):
     """Test fixture for normalize_char_input function."""
@@ -184,3 +190,241 @@ def test_ucn_format_is_uppercase() -> None:
     # Should be U+4E00 not U+4e00
     assert result == "U+4E00"
     assert result.isupper() or "+" in result  # + is not a letter
+
+
+class SearchWhereFixture(t.NamedTuple):
+    """Test fixture for ``unihan-etl search --where``."""
+
+    test_id: str
+    args: list[str]
+    expected_chars: list[str]
+
+
+SEARCH_WHERE_FIXTURES: list[SearchWhereFixture] = [
+    SearchWhereFixture(
+        test_id="single_condition",
+        args=["--where", "kMandarin=qiū"],
+        expected_chars=["㐀"],
+    ),
+    SearchWhereFixture(
+        test_id="dotted_path",
+        args=["--where", "kTotalStrokes.zh-Hans=5", "--where", "kCangjie=TM"],
+        expected_chars=["㐀"],
+    ),
+    SearchWhereFixture(
+        test_id="no_match",
+        args=["--where", "kCangjie=ZZZZZ"],
+        expected_chars=[],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    SearchWhereFixture._fields,
+    SEARCH_WHERE_FIXTURES,
+    ids=[f.test_id for f in SEARCH_WHERE_FIXTURES],
+)
+def test_search_where(
+    test_id: str,
+    args: list[str],
+    expected_chars: list[str],
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test search --where prints the matching characters' records."""
+    result = cli(["search", *args, "--ndjson", "-f", "kDefinition"])
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines() if line]
+    assert [record["char"] for record in records] == expected_chars
+    assert result == (0 if expected_chars else 1)
+    if records:
+        assert set(records[0]) <= {"char", "ucn", "kDefinition"}
+
+
+def test_search_where_table(
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test search --where prints a table of the queried fields."""
+    result = cli(["search", "--where", "kRSUnicode.radical=5"])
+
+    assert result == 0
+    header = capsys.readouterr().out.splitlines()[0]
+    assert header.split() == ["char", "ucn", "kRSUnicode"]
+
+
+def test_search_where_invalid(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test search rejects malformed or conflicting arguments."""
+    assert cli(["search", "--where", "kMandarin"]) == 1
+    assert "Expected FIELD=VALUE" in capsys.readouterr().err
+    assert cli(["search", "--where", "=hǎo"]) == 1
+    assert "Expected FIELD=VALUE" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        create_parser().parse_args(["search", "-w", "kMandarin=hǎo"])
+
+    assert cli(["search", "一", "--where", "kMandarin=yī"]) == 1
+    assert cli(["search"]) == 1
+
+
+def test_search_pinyin(
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test search --pinyin matches numbered, marked and toneless readings."""
+    for reading in ("qiū", "qiu1", "qiu"):
+        assert cli(["search", "--pinyin", reading, "--ndjson"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[0])["char"] == "㐀"
+
+    assert cli(["search", "--pinyin", "qiu4"]) == 1
+    assert "No characters read: qiu4" in capsys.readouterr().err
+
+    assert cli(["search", "--pinyin", "hao9"]) == 1
+    assert "tone must be 0 to 5" in capsys.readouterr().err
+
+    assert cli(["search", "--pinyin", "qiu", "--where", "kCangjie=TM"]) == 1
+
+
+def test_search_text(
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test search --text prints characters whose definitions match."""
+    assert cli(["search", "--text", "corrupted form", "--ndjson"]) == 0
+    records = [
+        json.loads(line) for line in capsys.readouterr().out.splitlines() if line
+    ]
+    assert records
+    for record in records:
+        definition = " ".join(record["kDefinition"]).lower()
+        assert "corrupted" in definition
+        assert "form" in definition
+
+    assert cli(["search", "--text", "serv*"]) == 0
+    assert capsys.readouterr().out.splitlines()[0].split() == [
+        "char",
+        "ucn",
+        "kDefinition",
+    ]
+
+    assert cli(["search", "--text", "zebra"]) == 1
+    assert "No definitions match: zebra" in capsys.readouterr().err
+
+    assert cli(["search", "--text", "*"]) == 1
+    assert "Expected search terms" in capsys.readouterr().err
+
+
+class SearchBatchFixture(t.NamedTuple):
+    """Test fixture for looking up many characters at once."""
+
+    test_id: str
+    args: list[str]
+    stdin: str
+    expected_chars: list[str]
+    expected_missing: str | None
+
+
+SEARCH_BATCH_FIXTURES: list[SearchBatchFixture] = [
+    SearchBatchFixture(
+        test_id="many_chars",
+        args=["㐁", "U+3400", "3401"],
+        stdin="",
+        expected_chars=["㐁", "㐀"],
+        expected_missing=None,
+    ),
+    SearchBatchFixture(
+        test_id="stdin_text",
+        args=["--file", "-"],
+        stdin="㐀㐁A\n㐀 㐁\n",
+        expected_chars=["㐀", "㐁"],
+        expected_missing="Characters not found: A (U+0041)",
+    ),
+    SearchBatchFixture(
+        test_id="chars_and_stdin",
+        args=["㐁", "--file", "-"],
+        stdin="㐀",
+        expected_chars=["㐁", "㐀"],
+        expected_missing=None,
+    ),
+    SearchBatchFixture(
+        test_id="none_found",
+        args=["A", "B"],
+        stdin="",
+        expected_chars=[],
+        expected_missing="Characters not found: A (U+0041), B (U+0042)",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    SearchBatchFixture._fields,
+    SEARCH_BATCH_FIXTURES,
+    ids=[f.test_id for f in SEARCH_BATCH_FIXTURES],
+)
+def test_search_batch(
+    test_id: str,
+    args: list[str],
+    stdin: str,
+    expected_chars: list[str],
+    expected_missing: str | None,
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test search prints one NDJSON record per distinct character."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    result = cli(["search", *args, "--ndjson", "-f", "kCantonese"])
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert [record["char"] for record in records] == expected_chars
+    assert all(set(record) <= {"char", "ucn", "kCantonese"} for record in records)
+    assert result == (0 if expected_chars else 1)
+    if expected_missing is None:
+        assert captured.err == ""
+    else:
+        assert expected_missing in captured.err
+
+
+@pytest.mark.parametrize("flag", ["--ndjson", "--json"])
+def test_search_batch_encodes_enums(
+    flag: str,
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test batches holding kRSUnicode's simplified radicals print as JSON."""
+    assert cli(["search", "U+9F50", "U+3400", flag, "-f", "kRSUnicode"]) == 0
+
+    out = capsys.readouterr().out
+    records = (
+        json.loads(out)
+        if flag == "--json"
+        else [json.loads(line) for line in out.splitlines()]
+    )
+    assert [record["char"] for record in records] == ["齐", "㐀"]
+    assert records[0]["kRSUnicode"][0]["simplified"] == "Chinese"
+
+
+def test_search_batch_file(
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test search --file looks up a document's characters, as a table."""
+    document = tmp_path / "document.txt"
+    document.write_text("㐁㐀㐁\n", encoding="utf-8")
+
+    assert cli(["search", "--file", str(document)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["char", "ucn", "kMandarin", "kDefinition"]
+    assert [line.split()[0] for line in lines[2:]] == ["㐁", "㐀"]
+
+    assert cli(["search", "--file", str(document), "--json"]) == 0
+    records = json.loads(capsys.readouterr().out)
+    assert [record["char"] for record in records] == ["㐁", "㐀"]
+
+    assert cli(["search", "--file", str(tmp_path / "missing.txt")]) == 1
+    assert "Error:" in capsys.readouterr().err
+    assert cli(["search", "㐀", "nothex"]) == 1
+    assert "Cannot parse character input" in capsys.readouterr().err
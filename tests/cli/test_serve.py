@@ -0,0 +1,247 @@
+"""Tests for serve subcommand."""
+
+from __future__ import annotations
+
+import contextlib
+import http.client
+import json
+import socket
+import threading
+import typing as t
+
+import pytest
+
+from unihan_etl.cli import cli
+from unihan_etl.cli.serve import LookupServer, UnixLookupServer
+from unihan_etl.index import UnihanIndex
+
+if t.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a UNIX socket."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self) -> None:
+        """Connect to the UNIX socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+@contextlib.contextmanager
+def _serving(server: LookupServer | UnixLookupServer) -> Iterator[None]:
+    """Run ``server`` in a thread, shutting it down on exit."""
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={"poll_interval": 0.01},
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.fixture
+def lookup_connection(
+    quick_search_index: pathlib.Path,
+) -> Iterator[http.client.HTTPConnection]:
+    """Return a connection to a lookup server of the quick dataset.
+
+    The server answers with kCantonese unless a request asks for other fields.
+    """
+    with UnihanIndex(quick_search_index) as index:
+        server = LookupServer(("127.0.0.1", 0), index, ["kCantonese"])
+        with _serving(server):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+            yield connection
+            connection.close()
+
+
+def _request(
+    connection: http.client.HTTPConnection,
+    method: str,
+    path: str,
+    body: t.Any = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, str]:
+    connection.request(
+        method,
+        path,
+        body=None if body is None else json.dumps(body).encode("utf-8"),
+        headers=headers or {},
+    )
+    response = connection.getresponse()
+    return response.status, response.read().decode("utf-8")
+
+
+class LookupRequestCase(t.NamedTuple):
+    """Case for :func:`test_lookup_request`."""
+
+    test_id: str
+    method: str
+    path: str
+    body: t.Any
+    expected_status: int
+    expected: t.Any
+
+
+LOOKUP_REQUEST_CASES: list[LookupRequestCase] = [
+    LookupRequestCase(
+        test_id="get_char",
+        method="GET",
+        path="/lookup/%E3%90%80?fields=kCantonese",
+        body=None,
+        expected_status=200,
+        expected={"char": "㐀", "ucn": "U+3400", "kCantonese": ["jau1"]},
+    ),
+    LookupRequestCase(
+        test_id="get_ucn",
+        method="GET",
+        path="/lookup/U+3400?fields=kCantonese,kMandarin",
+        body=None,
+        expected_status=200,
+        expected={
+            "char": "㐀",
+            "ucn": "U+3400",
+            "kCantonese": ["jau1"],
+            "kMandarin": {"zh-Hans": "qiū", "zh-Hant": "qiū"},
+        },
+    ),
+    LookupRequestCase(
+        test_id="get_simplified_radical",
+        method="GET",
+        path="/lookup/U+9F50?fields=kRSUnicode",
+        body=None,
+        expected_status=200,
+        expected={
+            "char": "齐",
+            "ucn": "U+9F50",
+            "kRSUnicode": [
+                {"radical": 210, "strokes": 0, "simplified": "Chinese"},
+                {"radical": 67, "strokes": 2, "simplified": False},
+            ],
+        },
+    ),
+    LookupRequestCase(
+        test_id="get_missing",
+        method="GET",
+        path="/lookup/A",
+        body=None,
+        expected_status=404,
+        expected={"error": "Character not found: A"},
+    ),
+    LookupRequestCase(
+        test_id="get_unparseable",
+        method="GET",
+        path="/lookup/xyz",
+        body=None,
+        expected_status=400,
+        expected={"error": "Cannot parse character input: 'xyz'"},
+    ),
+    LookupRequestCase(
+        test_id="unknown_path",
+        method="GET",
+        path="/search",
+        body=None,
+        expected_status=404,
+        expected={"error": "Not found: /search"},
+    ),
+    LookupRequestCase(
+        test_id="post_list",
+        method="POST",
+        path="/lookup",
+        body=["3400", "A"],
+        expected_status=200,
+        expected=[{"char": "㐀", "ucn": "U+3400", "kCantonese": ["jau1"]}, None],
+    ),
+    LookupRequestCase(
+        test_id="post_chars_fields",
+        method="POST",
+        path="/lookup",
+        body={"chars": ["㐀", "U+3400"], "fields": ["kCantonese"]},
+        expected_status=200,
+        expected=[{"char": "㐀", "ucn": "U+3400", "kCantonese": ["jau1"]}] * 2,
+    ),
+    LookupRequestCase(
+        test_id="post_not_a_list",
+        method="POST",
+        path="/lookup",
+        body={"char": "㐀"},
+        expected_status=400,
+        expected={"error": 'Expected a list of characters, or {"chars": [...]}'},
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(LookupRequestCase._fields),
+    LOOKUP_REQUEST_CASES,
+    ids=[case.test_id for case in LOOKUP_REQUEST_CASES],
+)
+def test_lookup_request(
+    lookup_connection: http.client.HTTPConnection,
+    test_id: str,
+    method: str,
+    path: str,
+    body: t.Any,
+    expected_status: int,
+    expected: t.Any,
+) -> None:
+    """Lookups answer with JSON, over one kept-alive connection."""
+    for _ in range(2):
+        status, text = _request(lookup_connection, method, path, body)
+        assert status == expected_status
+        assert json.loads(text) == expected
+
+
+def test_lookup_ndjson(lookup_connection: http.client.HTTPConnection) -> None:
+    """Clients accepting NDJSON get one record per line."""
+    status, text = _request(
+        lookup_connection,
+        "POST",
+        "/lookup",
+        {"chars": ["㐀", "㐁"], "fields": ["kCantonese"]},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert status == 200
+    lines = text.splitlines()
+    assert [json.loads(line)["char"] for line in lines] == ["㐀", "㐁"]
+
+
+def test_lookup_unix_socket(
+    quick_search_index: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """The server answers on a UNIX socket, removed on close."""
+    socket_path = tmp_path / "unihan.sock"
+    with UnihanIndex(quick_search_index) as index:
+        server = UnixLookupServer(str(socket_path), index, ["kCantonese"])
+        with _serving(server):
+            connection = UnixHTTPConnection(str(socket_path))
+            status, text = _request(connection, "GET", "/lookup/U+3400")
+            connection.close()
+    assert status == 200
+    assert json.loads(text) == {"char": "㐀", "ucn": "U+3400", "kCantonese": ["jau1"]}
+    assert not socket_path.exists()
+
+
+def test_serve_command_address_in_use(
+    quick_search_index: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Serving on a port already in use fails with an error."""
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        assert cli(["serve", "--port", str(port)]) == 1
+    assert "Error:" in capsys.readouterr().err
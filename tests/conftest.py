@@ -0,0 +1,39 @@
+"""Pytest fixtures for unihan-etl tests."""
+
+from __future__ import annotations
+
+import dataclasses
+import shutil
+import typing as t
+
+import pytest
+
+from unihan_etl.core import Packager
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from unihan_etl.options import Options
+
+
+@pytest.fixture
+def quick_packager(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> Packager:
+    """Return a Packager over a private copy of the quick zip.
+
+    Indexes, variant graphs and export caches are kept next to the zip, so
+    tests writing them use this rather than the shared session zip.
+    """
+    zip_path = tmp_path / "downloads" / "Unihan.zip"
+    zip_path.parent.mkdir(parents=True)
+    shutil.copy(unihan_quick_options.zip_path, zip_path)
+    return Packager(
+        dataclasses.replace(
+            unihan_quick_options,
+            zip_path=zip_path,
+            work_dir=tmp_path / "work",
+            destination=tmp_path / "out" / "unihan.{ext}",
+        ),
+    )
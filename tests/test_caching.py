@@ -11,7 +11,7 @@ import zipfile
 
 import pytest
 
-from unihan_etl import core
+from unihan_etl import core, expansion
 from unihan_etl.core import Packager
 from unihan_etl.pytest_plugin import _sync_quick_dataset, _sync_quick_zip
 
@@ -276,3 +276,185 @@ def test_has_valid_zip_memoizes_integrity_check(
     os.utime(zip_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
     assert core.has_valid_zip(zip_path)
     assert testzip_calls == 2
+
+
+def test_packager_no_extract_reads_zip(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """With extract off, nothing is written to work_dir and records match.
+
+    The records streamed from the zip are the ones an extracting packager reads
+    back from disk.
+    """
+    work_dir = tmp_path / "work"
+    packager = Packager(
+        dataclasses.replace(
+            unihan_quick_options,
+            work_dir=work_dir,
+            format="python",
+            extract=False,
+        ),
+    )
+    packager.download()
+    assert not work_dir.exists()
+
+    extracting_packager = Packager(
+        dataclasses.replace(unihan_quick_options, format="python"),
+    )
+    extracting_packager.download()
+
+    assert packager.export() == extracting_packager.export()
+    assert not work_dir.exists()
+
+
+@pytest.fixture
+def export_cache_packager(quick_packager: Packager) -> Packager:
+    """Return a Packager with the export cache on, over a copy of the quick zip."""
+    packager = Packager(
+        dataclasses.replace(quick_packager.options, export_cache=True),
+    )
+    packager.download()
+    return packager
+
+
+def test_export_cache_reuses_output(
+    export_cache_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A repeat export links the cached output instead of processing again."""
+    export_cache_packager.export()
+    destination = export_cache_packager.options.destination
+    cache_path = export_cache_packager.export_cache_path()
+    assert cache_path.read_bytes() == destination.read_bytes()
+    expected = destination.read_bytes()
+    destination.unlink()
+
+    def fail_iter_records(self: Packager) -> None:
+        msg = "export should have been reused"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(Packager, "iter_records", fail_iter_records)
+    export_cache_packager.export()
+
+    assert destination.read_bytes() == expected
+    assert destination.stat().st_ino == cache_path.stat().st_ino
+
+
+def test_export_cache_keyed_on_options_and_zip(
+    export_cache_packager: Packager,
+) -> None:
+    """Other options miss the cache; a changed zip drops its stale entries."""
+    options = export_cache_packager.options
+    export_cache_packager.export()
+    csv_cache_path = export_cache_packager.export_cache_path()
+
+    no_expand = Packager(dataclasses.replace(options, format="json", expand=False))
+    expand = Packager(dataclasses.replace(options, format="json"))
+    assert no_expand.export_cache_path() != expand.export_cache_path()
+    assert expand.export_cache_path() != csv_cache_path
+    block = Packager(dataclasses.replace(options, blocks=["uro"]))
+    where = Packager(dataclasses.replace(options, where=[("kIICore", None)]))
+    assert block.export_cache_path() != csv_cache_path
+    assert where.export_cache_path() != csv_cache_path
+    memo = Packager(dataclasses.replace(options, memoize_expansion=True))
+    assert memo.export_cache_path() != csv_cache_path
+    interned = Packager(dataclasses.replace(options, intern_values=True))
+    assert interned.export_cache_path() != csv_cache_path
+    lazy = Packager(dataclasses.replace(options, lazy_expansion=True))
+    assert lazy.export_cache_path() != csv_cache_path
+
+    with zipfile.ZipFile(options.zip_path, "a") as zf:
+        zf.writestr("Unihan_Extra.txt", "# extra\n")
+
+    assert export_cache_packager.export_cache_path() != csv_cache_path
+    export_cache_packager.export()
+    assert export_cache_packager.export_cache_path().exists()
+    assert not csv_cache_path.exists()
+
+
+def test_uncached_export_leaves_cache_intact(
+    export_cache_packager: Packager,
+) -> None:
+    """Exporting over a destination linked to the cache doesn't alter the cache."""
+    export_cache_packager.export()
+    cache_path = export_cache_packager.export_cache_path()
+    cached = cache_path.read_bytes()
+
+    Packager(
+        dataclasses.replace(
+            export_cache_packager.options,
+            fields=["kCantonese"],
+            export_cache=False,
+        ),
+    ).export()
+
+    assert cache_path.read_bytes() == cached
+    assert export_cache_packager.options.destination.read_bytes() != cached
+
+
+def test_python_export_snapshot(
+    export_cache_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A repeat python export loads the snapshot instead of processing again."""
+    packager = Packager(
+        dataclasses.replace(export_cache_packager.options, format="python"),
+    )
+    expected = packager.export()
+    snapshot_path = packager.export_cache_path()
+    assert snapshot_path.suffix == ".pickle"
+    assert core.load_snapshot(snapshot_path) == expected
+
+    def fail_iter_records(self: Packager) -> None:
+        msg = "snapshot should have been loaded"
+        raise AssertionError(msg)
+
+    with monkeypatch.context() as m:
+        m.setattr(Packager, "iter_records", fail_iter_records)
+        assert packager.export() == expected
+
+    monkeypatch.setattr(core, "__version__", "0.0.0-other")
+    assert packager.export_cache_path() != snapshot_path
+    assert packager.export() == expected
+    assert packager.export_cache_path().exists()
+
+
+def test_python_export_snapshot_lazy_memoized(
+    export_cache_packager: Packager,
+) -> None:
+    """Lazy records loaded from a snapshot still expand through a memo."""
+    options = dataclasses.replace(
+        export_cache_packager.options,
+        format="python",
+        memoize_expansion=True,
+        lazy_expansion=True,
+    )
+    fresh = Packager(options).export()
+    loaded = Packager(options).export()
+    assert fresh is not None
+    assert loaded is not None
+    assert all(isinstance(record, expansion.LazyRecord) for record in loaded)
+
+    for fresh_record, loaded_record in zip(fresh, loaded, strict=True):
+        for field in ("kMandarin", "kRSUnicode", "kTotalStrokes"):
+            if field in fresh_record:
+                value = loaded_record[field]
+                assert type(value) is type(fresh_record[field])
+                assert value == fresh_record[field]
+
+
+def test_python_export_snapshot_unreadable(
+    export_cache_packager: Packager,
+) -> None:
+    """An unreadable snapshot is rebuilt from the data files."""
+    packager = Packager(
+        dataclasses.replace(export_cache_packager.options, format="python"),
+    )
+    expected = packager.export()
+    snapshot_path = packager.export_cache_path()
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:100])
+
+    assert core.load_snapshot(snapshot_path) is None
+    assert packager.export() == expected
+    assert core.load_snapshot(snapshot_path) == expected
@@ -0,0 +1,81 @@
+"""Tests for simplified and traditional text conversion."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+
+from unihan_etl.convert import Ambiguity, Converter, convert, convert_lines
+
+if t.TYPE_CHECKING:
+    from unihan_etl.convert import ConversionTarget
+    from unihan_etl.core import Packager
+
+
+@pytest.fixture
+def quick_converter(quick_packager: Packager) -> Converter:
+    """Return the converter of the quick dataset."""
+    return Converter.from_options(quick_packager.options)
+
+
+class ConvertCase(t.NamedTuple):
+    """Case for :func:`test_convert`."""
+
+    test_id: str
+    text: str
+    to: ConversionTarget
+    expected: str
+
+
+CONVERT_CASES: list[ConvertCase] = [
+    ConvertCase("one_to_one", "万", "hant", "萬"),
+    ConvertCase("reverse", "㑯", "hans", "㑔"),
+    ConvertCase("one_to_many_first", "么", "hant", "幺"),
+    ConvertCase("no_variant", "A好,", "hant", "A好,"),
+    ConvertCase("target_script_kept", "万", "hans", "万"),
+    ConvertCase("mixed", "一万㑔\n", "hant", "一萬㑯\n"),
+]
+
+
+@pytest.mark.parametrize(
+    list(ConvertCase._fields),
+    CONVERT_CASES,
+    ids=[case.test_id for case in CONVERT_CASES],
+)
+def test_convert(
+    quick_converter: Converter,
+    test_id: str,
+    text: str,
+    to: ConversionTarget,
+    expected: str,
+) -> None:
+    """Text converts through the variants of the quick dataset."""
+    assert quick_converter.convert(text, to=to) == expected
+    assert convert(text, to=to, converter=quick_converter) == expected
+    assert "".join(convert_lines([text], to=to, converter=quick_converter)) == expected
+
+
+def test_convert_ambiguities(quick_converter: Converter) -> None:
+    """Characters with several variants are reported with their candidates."""
+    assert quick_converter.ambiguous("hant")["么"] == ("幺", "麼", "麽")
+    assert quick_converter.ambiguities("一么万么", to="hant") == [
+        Ambiguity(1, "么", ("幺", "麼", "麽")),
+        Ambiguity(3, "么", ("幺", "麼", "麽")),
+    ]
+    assert quick_converter.ambiguities("万", to="hant") == []
+
+
+def test_convert_keeps_self_variant() -> None:
+    """Ambiguous characters among their own variants are left unchanged."""
+    converter = Converter({"hant": {"台": ("台", "臺"), "发": ("發", "髮")}})
+    assert converter.convert("台发") == "台發"
+    assert set(converter.ambiguous()) == {"台", "发"}
+    assert converter.convert("台发", to="hans") == "台发"
+    assert converter.ambiguities("台发", to="hans") == []
+
+
+def test_convert_rejects_unknown_target(quick_converter: Converter) -> None:
+    """Targets other than hans and hant raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown conversion target: 'zh'"):
+        quick_converter.convert("万", to=t.cast("ConversionTarget", "zh"))
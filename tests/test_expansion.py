@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import pickle
 import typing as t
 
 import pytest
 
-from unihan_etl import constants, expansion
+from unihan_etl import constants, core, expansion
 
 if t.TYPE_CHECKING:
+    import pathlib
     from typing import TypeAlias
 
 ExpandedData: TypeAlias = list[dict[str, t.Any]]
@@ -1903,3 +1905,191 @@ def test_expand_kFanqie(
     """Test expansion of kFanqie."""
     item = next(i for i in unihan_quick_expanded_data if i["ucn"] == ucn)
     assert item["kFanqie"] == expected
+
+
+def test_expanders_registry_covers_expand_functions() -> None:
+    """Every ``expand_<field>`` function of a UNIHAN field is registered."""
+    for field in constants.UNIHAN_FIELDS:
+        func = getattr(expansion, f"expand_{field}", None)
+        assert expansion.EXPANDERS.get(field) is func
+    assert set(expansion.EXPANDERS) <= set(constants.UNIHAN_FIELDS)
+
+
+def test_register_expander_overrides_field(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A registered expander replaces the built-in one in expand_field."""
+    monkeypatch.setattr(expansion, "EXPANDERS", dict(expansion.EXPANDERS))
+
+    def expand_upper(value: list[str]) -> list[str]:
+        return [v.upper() for v in value]
+
+    assert expansion.register_expander("kCantonese", expand_upper) is expand_upper
+    assert expansion.expand_field("kCantonese", "jau1 tim2") == ["JAU1", "TIM2"]
+
+    # Fields without an expander pass through, split if space delimited.
+    assert expansion.expand_field("kCCCII", "213F5B 2D373F") == ["213F5B", "2D373F"]
+    assert expansion.expand_field("kDefinitionX", "a;b") == "a;b"
+
+
+def test_expansion_memo_matches_expand_field(
+    unihan_quick_fixture_files: list[pathlib.Path],
+) -> None:
+    """Memoized values equal expanded ones, frozen, and are shared."""
+    records = core.stream_normalize(
+        core.load_data_streams(unihan_quick_fixture_files),
+        (*constants.INDEX_FIELDS, *constants.UNIHAN_FIELDS),
+        sparse=True,
+    )
+    memo = expansion.ExpansionMemo(fields=None)
+    expanded: dict[tuple[str, str], t.Any] = {}
+    for record in records:
+        for field, value in record.items():
+            if not value:
+                continue
+            result = memo.expand(field, value)
+            assert result == expansion.freeze(expansion.expand_field(field, value))
+            if field in expansion.EXPANDERS:
+                assert result is expanded.setdefault((field, value), result)
+
+    stats = memo.stats()
+    assert "kTotalStrokes" in stats
+    assert "char" not in stats
+    assert sum(s.hits for s in stats.values()) > 0
+    assert all(s.misses == s.size for s in stats.values())
+
+
+def test_expansion_memo_values_are_immutable() -> None:
+    """Values shared between characters can't be changed through any of them."""
+    memo = expansion.ExpansionMemo()
+    value = memo.expand("kRSUnicode", "39.3 39'.3")
+    assert isinstance(value, tuple)
+    with pytest.raises(TypeError):
+        value[0]["radical"] = 1
+
+
+class ExpansionMemoFieldsCase(t.NamedTuple):
+    """Case for :func:`test_expansion_memo_fields`."""
+
+    test_id: str
+    fields: tuple[str, ...] | None
+    field: str
+    memoized: bool
+
+
+EXPANSION_MEMO_FIELDS_CASES: list[ExpansionMemoFieldsCase] = [
+    ExpansionMemoFieldsCase(
+        "default_repeating", expansion.MEMO_FIELDS, "kMandarin", True
+    ),
+    ExpansionMemoFieldsCase("default_distinct", expansion.MEMO_FIELDS, "kHanYu", False),
+    ExpansionMemoFieldsCase("all", None, "kHanYu", True),
+    ExpansionMemoFieldsCase("nothing_to_expand", None, "kCangjie", False),
+]
+
+
+@pytest.mark.parametrize(
+    list(ExpansionMemoFieldsCase._fields),
+    EXPANSION_MEMO_FIELDS_CASES,
+    ids=[case.test_id for case in EXPANSION_MEMO_FIELDS_CASES],
+)
+def test_expansion_memo_fields(
+    test_id: str,
+    fields: tuple[str, ...] | None,
+    field: str,
+    memoized: bool,
+) -> None:
+    """Only the memo's fields are memoized; the rest expand as usual."""
+    memo = expansion.ExpansionMemo(fields=fields)
+    value = {"kMandarin": "hǎo", "kHanYu": "10001.010", "kCangjie": "VND"}[field]
+    first = memo.expand(field, value)
+    if memoized:
+        assert first == expansion.freeze(expansion.expand_field(field, value))
+        assert memo.expand(field, value) is first
+    else:
+        assert first == expansion.expand_field(field, value)
+    assert (field in memo.stats()) is memoized
+
+
+def test_expansion_memo_bounded() -> None:
+    """A memo holds at most ``maxsize`` values of a field."""
+    memo = expansion.ExpansionMemo(maxsize=2)
+    for strokes in ["1", "2", "3", "1"]:
+        memo.expand("kTotalStrokes", strokes)
+
+    assert memo.stats() == {
+        "kTotalStrokes": expansion.MemoStats(hits=0, misses=4, size=2),
+    }
+    memo.clear()
+    assert memo.stats() == {}
+
+
+def test_lazy_record_expands_on_first_access() -> None:
+    """Fields expand once, on first read; others stay raw."""
+    calls: list[str] = []
+
+    def expand(field: str, value: t.Any) -> t.Any:
+        calls.append(field)
+        return expansion.expand_field(field, value)
+
+    record = expansion.LazyRecord(
+        {"ucn": "U+597D", "char": "好", "kTotalStrokes": "6", "kMandarin": "hǎo"},
+        expand,
+    )
+
+    assert "kMandarin" in record
+    assert list(record) == ["ucn", "char", "kTotalStrokes", "kMandarin"]
+    assert len(record) == 4
+    assert calls == []
+
+    strokes = record["kTotalStrokes"]
+    assert strokes == {"zh-Hans": 6, "zh-Hant": 6}
+    assert record["kTotalStrokes"] is strokes
+    assert record.get("char") == "好"
+    assert calls == ["kTotalStrokes"]
+    assert record.pending == {"kMandarin"}
+
+    record["kMandarin"] = {"zh-Hans": "hào", "zh-Hant": "hào"}
+    del record["ucn"]
+    assert dict(record) == {
+        "char": "好",
+        "kTotalStrokes": {"zh-Hans": 6, "zh-Hant": 6},
+        "kMandarin": {"zh-Hans": "hào", "zh-Hant": "hào"},
+    }
+    assert calls == ["kTotalStrokes"]
+
+
+def test_lazy_record_pickles_and_copies_unexpanded() -> None:
+    """Copies and pickles keep pending fields raw until read."""
+    record = expansion.LazyRecord({"char": "好", "kTotalStrokes": "6 7"})
+    copied = record.copy()
+    loaded = pickle.loads(pickle.dumps(record))
+
+    for other in (copied, loaded):
+        assert isinstance(other, expansion.LazyRecord)
+        assert other.pending == {"kTotalStrokes"}
+
+    # Comparing reads, and so expands, every field of both records
+    assert loaded == record
+    assert copied.pending == {"kTotalStrokes"}
+    assert record.pending == loaded.pending == set()
+    assert copied == record
+
+
+def test_lazy_record_pickles_memo() -> None:
+    """Records expanding through a memo still do, sharing one, once unpickled."""
+    memo = expansion.ExpansionMemo()
+    records = [
+        expansion.LazyRecord({"char": char, "kTotalStrokes": "6"}, memo.expand)
+        for char in "好如"
+    ]
+    records[0]["kTotalStrokes"]
+    loaded = pickle.loads(pickle.dumps(records))
+
+    assert [record.pending for record in loaded] == [set(), {"kTotalStrokes"}]
+    strokes = [record["kTotalStrokes"] for record in loaded]
+    assert all(isinstance(value, expansion.FrozenDict) for value in strokes)
+    assert strokes[0] == strokes[1] == {"zh-Hans": 6, "zh-Hant": 6}
+    unpickled_memo = loaded[1]._expand.__self__
+    assert isinstance(unpickled_memo, expansion.ExpansionMemo)
+    assert unpickled_memo is not memo
+    assert unpickled_memo.stats() == {
+        "kTotalStrokes": expansion.MemoStats(hits=0, misses=1, size=1),
+    }
@@ -0,0 +1,393 @@
+"""Tests for the persistent codepoint index."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import pathlib
+import shutil
+import typing as t
+import zipfile
+
+import pytest
+
+from unihan_etl import core, index as index_module
+from unihan_etl.cli import cli
+from unihan_etl.core import Packager
+from unihan_etl.index import UnihanIndex, get_index_path, text_terms
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from unihan_etl.options import Options
+
+
+def test_build_index_matches_export(quick_packager: Packager) -> None:
+    """Every indexed record equals its record in a full python export."""
+    index_path = quick_packager.build_index()
+
+    export_packager = Packager(
+        dataclasses.replace(quick_packager.options, format="python"),
+    )
+    export_packager.download()
+    data = export_packager.export()
+    assert data is not None
+
+    with UnihanIndex(index_path) as index:
+        assert len(index) == len(data)
+        for record in data:
+            assert index.get(record["char"]) == record
+        assert index.get("A") is None
+        assert "㐀" in index
+        assert "A" not in index
+
+
+def test_get_many_matches_get(
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batched lookups keep input order, and read a chunk per query."""
+    monkeypatch.setattr(index_module, "INDEX_BATCH_SIZE", 30)
+    with UnihanIndex(quick_packager.build_index()) as index:
+        chars = [*map(chr, range(0x3409, 0x3400 - 1, -1)), "A", "㐀"]
+        results = list(index.get_many(iter(chars)))
+
+        assert [char for char, _ in results] == chars
+        assert [record for _, record in results] == [index.get(c) for c in chars]
+        assert results[-2][1] is None
+        assert list(index.get_many([])) == []
+
+
+def test_build_index_reuses_existing(
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A second build of an unchanged zip returns the index without parsing."""
+    index_path = quick_packager.build_index()
+
+    def fail_export(self: Packager) -> None:
+        msg = "index should have been reused"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(Packager, "export", fail_export)
+    assert quick_packager.build_index() == index_path
+
+
+def test_build_index_keyed_by_zip_fingerprint(quick_packager: Packager) -> None:
+    """A zip with different contents gets a new index; the old one is removed."""
+    old_index_path = quick_packager.build_index()
+    zip_path = quick_packager.options.zip_path
+
+    with zipfile.ZipFile(zip_path, "a") as zf:
+        zf.writestr("Unihan_Extra.txt", "# extra\n")
+
+    assert core.zip_fingerprint(zip_path) not in old_index_path.name
+    new_index_path = quick_packager.build_index()
+
+    assert new_index_path == get_index_path(zip_path, core.zip_fingerprint(zip_path))
+    assert new_index_path.exists()
+    assert not old_index_path.exists()
+
+
+def test_build_index_ignores_filters(quick_packager: Packager) -> None:
+    """Row filters and in-memory options don't narrow or change the index."""
+    full_path = quick_packager.build_index()
+    with UnihanIndex(full_path) as index:
+        expected = {char: index.get(char) for char in ("㐀", "齐")}
+        expected_len = len(index)
+    full_path.unlink()
+
+    filtered = Packager(
+        dataclasses.replace(
+            quick_packager.options,
+            blocks=["uro"],
+            codepoint_ranges=[(0x9F50, 0x9F50)],
+            where=[("kDefinition", None)],
+            memoize_expansion=True,
+            lazy_expansion=True,
+            intern_values=True,
+        ),
+    )
+    assert filtered.build_index() == full_path
+    with UnihanIndex(full_path) as index:
+        assert len(index) == expected_len
+        assert {char: index.get(char) for char in expected} == expected
+
+
+@pytest.mark.parametrize("build", [True, False], ids=["index", "no_index"])
+def test_cli_export_builds_index(quick_packager: Packager, build: bool) -> None:
+    """``unihan-etl export`` builds the index only if asked to."""
+    options = quick_packager.options
+    zip_path = pathlib.Path(options.zip_path)
+    index_path = get_index_path(zip_path, core.zip_fingerprint(zip_path))
+    args = [
+        "export",
+        "-z",
+        str(zip_path),
+        "-w",
+        str(options.work_dir),
+        "-d",
+        str(pathlib.Path(options.destination).parent / "unihan.csv"),
+        "-f",
+        "kDefinition",
+    ]
+
+    assert cli([*args, "--index"] if build else args) == 0
+    assert index_path.exists() is build
+
+
+def test_zip_fingerprint_ignores_location(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """Copies of the same zip share a fingerprint."""
+    copy_path = tmp_path / "Copy.zip"
+    shutil.copy(unihan_quick_options.zip_path, copy_path)
+
+    assert core.zip_fingerprint(copy_path) == core.zip_fingerprint(
+        unihan_quick_options.zip_path,
+    )
+
+
+def test_open_missing_index(tmp_path: pathlib.Path) -> None:
+    """Opening a nonexistent index raises instead of creating an empty one."""
+    with pytest.raises(FileNotFoundError):
+        UnihanIndex(tmp_path / "missing.sqlite3")
+    assert not (tmp_path / "missing.sqlite3").exists()
+
+
+class ReverseLookupCase(t.NamedTuple):
+    """Case for :func:`test_reverse_lookup_matches_scan`."""
+
+    test_id: str
+    field: str
+    value: str | int
+    matches: t.Callable[[Mapping[str, t.Any]], bool]
+
+
+REVERSE_LOOKUP_CASES: list[ReverseLookupCase] = [
+    ReverseLookupCase(
+        test_id="string",
+        field="kCangjie",
+        value="TM",
+        matches=lambda r: r.get("kCangjie") == "TM",
+    ),
+    ReverseLookupCase(
+        test_id="any_script_reading",
+        field="kMandarin",
+        value="yì",
+        matches=lambda r: "yì" in r.get("kMandarin", {}).values(),
+    ),
+    ReverseLookupCase(
+        test_id="integer",
+        field="kTotalStrokes",
+        value=6,
+        matches=lambda r: 6 in r.get("kTotalStrokes", {}).values(),
+    ),
+    ReverseLookupCase(
+        test_id="dotted_path",
+        field="kRSUnicode.radical",
+        value="5",
+        matches=lambda r: any(x["radical"] == 5 for x in r.get("kRSUnicode", [])),
+    ),
+    ReverseLookupCase(
+        test_id="list_of_mappings",
+        field="kHanyuPinyin",
+        value="qiū",
+        matches=lambda r: any(
+            "qiū" in x["readings"] for x in r.get("kHanyuPinyin", [])
+        ),
+    ),
+    ReverseLookupCase(
+        test_id="no_match",
+        field="kCangjie",
+        value="ZZZZZ",
+        matches=lambda r: False,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(ReverseLookupCase._fields),
+    REVERSE_LOOKUP_CASES,
+    ids=[case.test_id for case in REVERSE_LOOKUP_CASES],
+)
+def test_reverse_lookup_matches_scan(
+    quick_packager: Packager,
+    test_id: str,
+    field: str,
+    value: str | int,
+    matches: t.Callable[[Mapping[str, t.Any]], bool],
+) -> None:
+    """Postings list the same characters as scanning the export."""
+    index_path = quick_packager.build_index()
+    export_packager = Packager(
+        dataclasses.replace(quick_packager.options, format="python"),
+    )
+    data = export_packager.export()
+    assert data is not None
+    expected = [record for record in data if matches(record)]
+
+    with UnihanIndex(index_path) as index:
+        assert index.codepoints(field, value) == [ord(r["char"]) for r in expected]
+        assert index.find({field: value}) == expected
+
+
+def test_find_intersects_conditions(quick_packager: Packager) -> None:
+    """Every condition given to find must hold."""
+    with UnihanIndex(quick_packager.build_index()) as index:
+        six_strokes = set(index.codepoints("kTotalStrokes", 6))
+        radical_nine = set(index.codepoints("kRSUnicode.radical", 9))
+        records = index.find({"kTotalStrokes": "6", "kRSUnicode.radical": 9})
+
+        assert [ord(r["char"]) for r in records] == sorted(six_strokes & radical_nine)
+        assert records
+        assert index.find({"kTotalStrokes": 6, "kCangjie": "ZZZZZ"}) == []
+
+
+class PinyinLookupCase(t.NamedTuple):
+    """Case for :func:`test_pinyin_lookup`."""
+
+    test_id: str
+    reading: str
+    expected: list[str]
+
+
+PINYIN_LOOKUP_CASES: list[PinyinLookupCase] = [
+    PinyinLookupCase(test_id="tone_mark", reading="qiū", expected=["㐀"]),
+    PinyinLookupCase(test_id="tone_number", reading="qiu1", expected=["㐀"]),
+    PinyinLookupCase(test_id="toneless", reading="qiu", expected=["㐀", "㐤"]),
+    PinyinLookupCase(test_id="other_tone", reading="qiu4", expected=[]),
+    PinyinLookupCase(test_id="neutral_tone", reading="xia5", expected=["下"]),
+    PinyinLookupCase(test_id="unknown", reading="zzz", expected=[]),
+]
+
+
+@pytest.mark.parametrize(
+    list(PinyinLookupCase._fields),
+    PINYIN_LOOKUP_CASES,
+    ids=[case.test_id for case in PINYIN_LOOKUP_CASES],
+)
+def test_pinyin_lookup(
+    quick_packager: Packager,
+    test_id: str,
+    reading: str,
+    expected: list[str],
+) -> None:
+    """Readings match with tone marks, tone numbers or no tone."""
+    with UnihanIndex(quick_packager.build_index()) as index:
+        assert [chr(cp) for cp in index.pinyin(reading)] == expected
+
+
+def test_pinyin_lookup_ranked_by_frequency(tmp_path: pathlib.Path) -> None:
+    """Characters with a reading come most frequent first, then by codepoint."""
+    records: list[dict[str, t.Any]] = [
+        {
+            "ucn": "U+4E0B",
+            "char": "下",
+            "kHanyuPinlu": [
+                {"phonetic": "xià", "frequency": 6430},
+                {"phonetic": "xia", "frequency": 249},
+            ],
+        },
+        {"ucn": "U+590F", "char": "夏", "kMandarin": {"zh-Hans": "xià"}},
+        {
+            "ucn": "U+5413",
+            "char": "吓",
+            "kHanyuPinlu": [{"phonetic": "xià", "frequency": 7000}],
+        },
+        {"ucn": "U+5323", "char": "匣", "kXHC1983": [{"reading": "xiá"}]},
+    ]
+    with UnihanIndex.build(records, tmp_path / "index.sqlite3") as index:
+        assert [chr(cp) for cp in index.pinyin("xia")] == ["吓", "下", "匣", "夏"]
+        assert [chr(cp) for cp in index.pinyin("xià")] == ["吓", "下", "夏"]
+        assert [chr(cp) for cp in index.pinyin("xia5")] == ["下"]
+        assert [chr(cp) for cp in index.pinyin("xia2")] == ["匣"]
+
+
+@pytest.fixture(params=[True, False], ids=["fts5", "terms"])
+def text_index(
+    request: pytest.FixtureRequest,
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[UnihanIndex]:
+    """Return an index of the quick dataset, definitions in FTS5 or by term."""
+    monkeypatch.setattr(
+        index_module,
+        "_build_text_index",
+        functools.partial(index_module._build_text_index, fts=request.param),
+    )
+    with UnihanIndex(quick_packager.build_index()) as index:
+        assert index._text_fts is request.param
+        yield index
+
+
+class TextSearchCase(t.NamedTuple):
+    """Case for :func:`test_text_search_matches_scan`."""
+
+    test_id: str
+    query: str
+    words: list[str]
+    prefixes: list[str]
+
+
+TEXT_SEARCH_CASES: list[TextSearchCase] = [
+    TextSearchCase("word", "ancient", ["ancient"], []),
+    TextSearchCase("case_insensitive", "ANCIENT", ["ancient"], []),
+    TextSearchCase("all_words", "corrupted form", ["corrupted", "form"], []),
+    TextSearchCase("prefix", "serv*", [], ["serv"]),
+    TextSearchCase("word_and_prefix", "form simplif*", ["form"], ["simplif"]),
+    TextSearchCase("no_match", "zebra", ["zebra"], []),
+]
+
+
+@pytest.mark.parametrize(
+    list(TextSearchCase._fields),
+    TEXT_SEARCH_CASES,
+    ids=[case.test_id for case in TEXT_SEARCH_CASES],
+)
+def test_text_search_matches_scan(
+    text_index: UnihanIndex,
+    quick_packager: Packager,
+    test_id: str,
+    query: str,
+    words: list[str],
+    prefixes: list[str],
+) -> None:
+    """Full-text search finds the characters whose definitions have every word."""
+    data = Packager(
+        dataclasses.replace(quick_packager.options, format="python"),
+    ).export()
+    assert data is not None
+
+    expected = set()
+    for record in data:
+        terms = text_terms("; ".join(record.get("kDefinition", [])))
+        if all(word in terms for word in words) and all(
+            any(term.startswith(prefix) for term in terms) for prefix in prefixes
+        ):
+            expected.add(ord(record["char"]))
+
+    codepoints = text_index.text(query)
+    assert len(codepoints) == len(expected)
+    assert set(codepoints) == expected
+    assert text_index.text(query, limit=2) == codepoints[:2]
+
+
+def test_text_search_ranking(text_index: UnihanIndex) -> None:
+    """Shorter, more focused definitions rank first."""
+    codepoints = text_index.text("ancient")
+    lengths = []
+    for codepoint in codepoints:
+        record = text_index.get(chr(codepoint))
+        assert record is not None
+        lengths.append(len(text_terms("; ".join(record["kDefinition"]))))
+    assert lengths[0] == min(lengths)
+    if not text_index._text_fts:
+        assert lengths == sorted(lengths)
+
+
+def test_text_search_empty_query(text_index: UnihanIndex) -> None:
+    """A query without words raises ValueError."""
+    with pytest.raises(ValueError, match="Expected search terms"):
+        text_index.text(" * ; ")
@@ -0,0 +1,162 @@
+"""Tests for interning the values of exported records."""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import sys
+import typing as t
+
+import pytest
+
+from unihan_etl.core import Packager
+from unihan_etl.expansion import FrozenDict, freeze
+from unihan_etl.interning import DISTINCT_FIELDS, Interner, intern_records
+from unihan_etl.util import json_default
+
+if t.TYPE_CHECKING:
+    from unihan_etl.options import Options
+
+ExpandedData: t.TypeAlias = list[dict[str, t.Any]]
+
+
+def _footprint(records: ExpandedData) -> int:
+    """Return the bytes of the distinct values within ``records``."""
+    seen: set[int] = set()
+    total = 0
+    stack: list[t.Any] = [v for record in records for v in (*record, *record.values())]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, (str, int, float, list, tuple, dict)):
+            total += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend((*value, *value.values()))
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return total
+
+
+class InternRecordsCase(t.NamedTuple):
+    """Case for :func:`test_intern_records`."""
+
+    test_id: str
+    share_objects: bool
+
+
+INTERN_RECORDS_CASES: list[InternRecordsCase] = [
+    InternRecordsCase("share_objects", share_objects=True),
+    InternRecordsCase("values_only", share_objects=False),
+]
+
+
+@pytest.mark.parametrize(
+    list(InternRecordsCase._fields),
+    INTERN_RECORDS_CASES,
+    ids=[case.test_id for case in INTERN_RECORDS_CASES],
+)
+def test_intern_records(
+    unihan_quick_expanded_data: ExpandedData,
+    test_id: str,
+    share_objects: bool,
+) -> None:
+    """Interned records are equal, and the bytes saved are about those freed."""
+    records = copy.deepcopy(unihan_quick_expanded_data)
+    before = _footprint(records)
+
+    stats = intern_records(records, share_objects=share_objects)
+
+    saved = before - _footprint(records)
+    assert stats.values > 0
+    assert (stats.objects > 0) is share_objects
+    assert saved > 0
+    assert stats.table_bytes > 0
+    assert stats.bytes_saved + stats.table_bytes == pytest.approx(saved, rel=0.01)
+    if share_objects:
+        assert records == [
+            {
+                field: value if field in DISTINCT_FIELDS else freeze(value)
+                for field, value in record.items()
+            }
+            for record in unihan_quick_expanded_data
+        ]
+    else:
+        assert records == unihan_quick_expanded_data
+
+
+def _copy(value: str) -> str:
+    """Return an equal string that isn't ``value``."""
+    return value.encode().decode()
+
+
+def test_interner_shares_equal_values() -> None:
+    """Equal values of records are the same object, frozen if containers."""
+    interner = Interner()
+    first, second = (
+        interner.intern_record(
+            {
+                _copy("kMandarin"): _copy("hǎo"),
+                "kIRG_GSource": [{"source": "G0", "location": _copy("3A43")}],
+            },
+        )
+        for _ in range(2)
+    )
+
+    assert first == second
+    assert all(first[k] is second[k] for k in first)
+    assert all(a is b for a, b in zip(first, second, strict=True))
+    assert isinstance(first["kIRG_GSource"], tuple)
+    assert isinstance(first["kIRG_GSource"][0], FrozenDict)
+    first["kMandarin"] = "hào"
+    assert second["kMandarin"] == "hǎo"
+
+
+def test_interner_counts_tables() -> None:
+    """Distinct values save nothing, and cost the tables holding them."""
+    interner = Interner()
+    for i in range(100):
+        interner.intern_record({"kMandarin": f"reading{i}"})
+
+    stats = interner.stats()
+    assert stats.values == stats.objects == 0
+    assert stats.table_bytes > 0
+    assert stats.bytes_saved == -stats.table_bytes
+
+
+def test_interner_skips_distinct_fields() -> None:
+    """Values of distinct fields are kept as they are; field names are shared."""
+    interner = Interner()
+    definition = ["good", "well"]
+    first = interner.intern_record({_copy("kDefinition"): definition})
+    second = interner.intern_record({_copy("kDefinition"): list(definition)})
+
+    assert "kDefinition" in DISTINCT_FIELDS
+    assert first["kDefinition"] is definition
+    assert second["kDefinition"] is not first["kDefinition"]
+    assert next(iter(first)) is next(iter(second))
+
+    everything = Interner(skip_fields=())
+    first = everything.intern_record({"kDefinition": definition})
+    assert first["kDefinition"] == ("good", "well")
+
+
+def test_packager_intern_values(unihan_quick_options: Options) -> None:
+    """``intern_values`` exports the same values and reports bytes saved."""
+    options = dataclasses.replace(unihan_quick_options, format="python")
+    packager = Packager(options)
+    packager.download()
+    expected = packager.export()
+    interned = Packager(dataclasses.replace(options, intern_values=True))
+    records = interned.export()
+
+    assert packager.intern_stats is None
+    assert interned.intern_stats is not None
+    stats = interned.intern_stats
+    assert stats.bytes_saved + stats.table_bytes > 0
+    assert json.dumps(records, default=json_default) == json.dumps(
+        expected,
+        default=json_default,
+    )
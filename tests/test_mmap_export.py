@@ -0,0 +1,134 @@
+"""Tests for the memory-mapped lookup file export format."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import typing as t
+
+import pytest
+
+from unihan_etl.core import Packager
+from unihan_etl.mmap_export import MMAP_SEGMENT_GAP, UnihanMmap, export_mmap
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from unihan_etl.options import Options
+
+
+@pytest.fixture
+def quick_mmap(tmp_path: pathlib.Path, unihan_quick_options: Options) -> pathlib.Path:
+    """Return the quick dataset exported to a lookup file."""
+    packager = Packager(
+        dataclasses.replace(
+            unihan_quick_options,
+            destination=tmp_path / "unihan.{ext}",
+            format="mmap",
+        ),
+    )
+    packager.download()
+    packager.export()
+    return tmp_path / "unihan.mmap"
+
+
+def test_mmap_matches_json_export(
+    quick_mmap: pathlib.Path,
+    unihan_quick_options: Options,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Every record reads back as the JSON export wrote it."""
+    packager = Packager(
+        dataclasses.replace(
+            unihan_quick_options,
+            destination=tmp_path / "unihan.{ext}",
+            format="json",
+        ),
+    )
+    packager.export()
+    expected = json.loads((tmp_path / "unihan.json").read_text(encoding="utf-8"))
+
+    with UnihanMmap(quick_mmap) as lookup:
+        assert len(lookup) == len(expected)
+        assert list(lookup) == expected
+        for record in expected:
+            assert record["char"] in lookup
+            assert lookup.get(record["char"]) == record
+        assert "kDefinition" in lookup.fields
+        assert "char" not in lookup.fields
+
+
+class MissingCharCase(t.NamedTuple):
+    """Case for :func:`test_mmap_missing_chars`."""
+
+    test_id: str
+    char: str
+
+
+MISSING_CHAR_CASES: list[MissingCharCase] = [
+    MissingCharCase(test_id="before_first_segment", char="A"),
+    MissingCharCase(test_id="in_segment_gap", char="㐂"),
+    MissingCharCase(test_id="between_segments", char="耀"),
+    MissingCharCase(test_id="after_last_segment", char="\U0010ffff"),
+]
+
+
+@pytest.mark.parametrize(
+    list(MissingCharCase._fields),
+    MISSING_CHAR_CASES,
+    ids=[case.test_id for case in MISSING_CHAR_CASES],
+)
+def test_mmap_missing_chars(
+    tmp_path: pathlib.Path,
+    test_id: str,
+    char: str,
+) -> None:
+    """Characters without data are absent wherever they fall."""
+    destination = tmp_path / "unihan.mmap"
+    records = [
+        {"ucn": "U+3400", "char": "㐀", "kCantonese": "jau1"},
+        {"ucn": "U+3403", "char": "㐃", "kCantonese": "baak3"},
+        {"ucn": "U+9FA5", "char": "龥", "kDefinition": "to sigh"},
+    ]
+    export_mmap(records, destination, ["ucn", "char", "kCantonese", "kDefinition"])
+
+    with UnihanMmap(destination) as lookup:
+        assert len(lookup._segments) == 2
+        assert lookup.get(char) is None
+        assert char not in lookup
+        assert list(lookup) == records
+
+
+def test_mmap_segments_split_at_gaps(tmp_path: pathlib.Path) -> None:
+    """Codepoints closer than the gap share a segment's offset table."""
+    destination = tmp_path / "unihan.mmap"
+    codepoints = [0x3400, 0x3400 + MMAP_SEGMENT_GAP - 1, 0x3400 + 3 * MMAP_SEGMENT_GAP]
+    export_mmap(
+        ({"ucn": f"U+{cp:04X}", "char": chr(cp)} for cp in codepoints),
+        destination,
+        ["ucn", "char"],
+    )
+
+    with UnihanMmap(destination) as lookup:
+        assert [(start, stop) for start, stop, _ in lookup._segments] == [
+            (codepoints[0], codepoints[1] + 1),
+            (codepoints[2], codepoints[2] + 1),
+        ]
+        assert [record["char"] for record in lookup] == [chr(cp) for cp in codepoints]
+
+
+def test_mmap_rejects_other_files(tmp_path: pathlib.Path) -> None:
+    """Files that aren't lookup files, and unsorted records, raise ValueError."""
+    path = tmp_path / "unihan.json"
+    path.write_text("[]" * 40, encoding="utf-8")
+    with pytest.raises(ValueError, match="Not a UNIHAN lookup file"):
+        UnihanMmap(path)
+
+    records = [
+        {"ucn": "U+3401", "char": "㐁"},
+        {"ucn": "U+3400", "char": "㐀"},
+    ]
+    with pytest.raises(ValueError, match="not in codepoint order at U\\+3400"):
+        export_mmap(records, tmp_path / "unihan.mmap", ["ucn", "char"])
+    assert not (tmp_path / "unihan.mmap").exists()
+    assert not (tmp_path / "unihan.mmap.tmp").exists()
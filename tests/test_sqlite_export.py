@@ -0,0 +1,180 @@
+"""Tests for the SQLite export format."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import sqlite3
+import typing as t
+
+import pytest
+
+from unihan_etl.core import Packager
+from unihan_etl.sqlite_export import export_sqlite
+
+if t.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+    from unihan_etl.options import Options
+
+
+@pytest.fixture
+def quick_sqlite(tmp_path: pathlib.Path, unihan_quick_options: Options) -> pathlib.Path:
+    """Return the quick dataset exported to SQLite."""
+    packager = Packager(
+        dataclasses.replace(
+            unihan_quick_options,
+            destination=tmp_path / "unihan.{ext}",
+            format="sqlite",
+        ),
+    )
+    packager.download()
+    packager.export()
+    return tmp_path / "unihan.sqlite"
+
+
+def test_sqlite_characters_match_export(
+    quick_sqlite: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """Each character row holds the exported record, lists as JSON."""
+    packager = Packager(dataclasses.replace(unihan_quick_options, format="python"))
+    data = packager.export()
+    assert data is not None
+
+    conn = sqlite3.connect(quick_sqlite)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM characters ORDER BY codepoint").fetchall()
+    assert len(rows) == len(data)
+
+    for row, record in zip(rows, data, strict=True):
+        assert row["codepoint"] == ord(record["char"])
+        assert row["ucn"] == record["ucn"]
+        for field in ("kCangjie", "kCantonese", "kMandarin", "kHanyuPinyin"):
+            value = record.get(field)
+            if isinstance(value, (list, dict)):
+                assert json.loads(row[field]) == value
+            else:
+                assert row[field] == value
+
+
+def test_sqlite_child_tables(quick_sqlite: pathlib.Path) -> None:
+    """Multi-value fields are broken out into typed, indexed child tables."""
+    conn = sqlite3.connect(quick_sqlite)
+
+    readings = conn.execute(
+        "SELECT c.char, r.value FROM characters c "
+        "JOIN kHanyuPinyin p ON p.codepoint = c.codepoint "
+        "JOIN kHanyuPinyin_readings r ON r.parent_id = p.id "
+        "WHERE c.char = '㐁'",
+    ).fetchall()
+    assert readings == [("㐁", "tiàn")]
+
+    mandarin = conn.execute(
+        'SELECT "zh-Hans", "zh-Hant" FROM kMandarin m '
+        "JOIN characters c ON c.codepoint = m.codepoint WHERE c.char = '㐀'",
+    ).fetchone()
+    assert mandarin == ("qiū", "qiū")
+
+    column_types = {
+        row[1]: row[2]
+        for row in conn.execute("PRAGMA table_info(kHanyuPinyin_locations)")
+    }
+    assert column_types["volume"] == "INTEGER"
+    assert column_types["parent_id"] == "INTEGER"
+
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert {
+        "characters_char",
+        "kHanyuPinyin_codepoint",
+        "kHanyuPinyin_readings_parent_id",
+        "kHanyuPinyin_readings_value",
+        "kMandarin_zh-Hans",
+    } <= indexes
+
+
+def test_sqlite_adds_columns_for_new_keys(tmp_path: pathlib.Path) -> None:
+    """A key first seen in a later record becomes a new child table column."""
+    records: list[dict[str, t.Any]] = [
+        {"ucn": "U+3400", "char": "㐀", "kExample": [{"a": 1}]},
+        {"ucn": "U+3401", "char": "㐁", "kExample": [{"a": 2, "b": "x"}]},
+        {"ucn": "U+3402", "char": "㐂", "kExample": None},
+    ]
+    destination = tmp_path / "unihan.sqlite"
+    export_sqlite(records, destination, ["ucn", "char", "kExample"])
+
+    conn = sqlite3.connect(destination)
+    assert conn.execute(
+        "SELECT codepoint, seq, a, b FROM kExample ORDER BY id",
+    ).fetchall() == [(0x3400, 0, 1, None), (0x3401, 0, 2, "x")]
+    assert conn.execute(
+        "SELECT kExample FROM characters WHERE char = '㐂'",
+    ).fetchone() == (None,)
+    assert not (tmp_path / "unihan.sqlite.tmp").exists()
+
+
+def test_sqlite_characters_columns_typed(tmp_path: pathlib.Path) -> None:
+    """Field columns are typed by their values, the first non-empty one."""
+    records: list[dict[str, t.Any]] = [
+        {"ucn": "U+3400", "char": "㐀", "kFrequency": None, "kGradeLevel": ""},
+        {"ucn": "U+3401", "char": "㐁", "kFrequency": 3, "kGradeLevel": 1},
+        {"ucn": "U+3402", "char": "㐂", "kFrequency": 5, "kMandarin": ["qiū"]},
+    ]
+    fields = ["ucn", "char", "kFrequency", "kGradeLevel", "kMandarin", "kNone"]
+    destination = tmp_path / "unihan.sqlite"
+    export_sqlite(records, destination, fields)
+
+    conn = sqlite3.connect(destination)
+    column_types = {
+        row[1]: row[2] for row in conn.execute("PRAGMA table_info(characters)")
+    }
+    assert column_types == {
+        "codepoint": "INTEGER",
+        "ucn": "TEXT",
+        "char": "TEXT",
+        "kFrequency": "INTEGER",
+        "kGradeLevel": "INTEGER",
+        "kMandarin": "TEXT",
+        "kNone": "TEXT",
+    }
+    assert conn.execute(
+        "SELECT kFrequency, typeof(kFrequency), kGradeLevel FROM characters "
+        "ORDER BY codepoint",
+    ).fetchall() == [(None, "null", ""), (3, "integer", 1), (5, "integer", None)]
+
+
+def test_sqlite_radical_simplified_text(quick_sqlite: pathlib.Path) -> None:
+    """kRSUnicode.simplified holds text, NULL for radicals not simplified."""
+    conn = sqlite3.connect(quick_sqlite)
+    column_types = {
+        row[1]: row[2] for row in conn.execute('PRAGMA table_info("kRSUnicode")')
+    }
+    assert column_types["simplified"] == "TEXT"
+    counts = dict(
+        conn.execute(
+            'SELECT typeof(simplified), count(*) FROM "kRSUnicode" GROUP BY 1',
+        ).fetchall(),
+    )
+    assert set(counts) == {"null", "text"}
+    assert {
+        value
+        for (value,) in conn.execute(
+            'SELECT DISTINCT simplified FROM "kRSUnicode" WHERE simplified NOTNULL',
+        )
+    } <= {"Chinese", "NonChinese", "SecondNonChinese"}
+
+
+def test_sqlite_removes_temp_file_on_error(tmp_path: pathlib.Path) -> None:
+    """A failed export leaves neither the database nor its temp file."""
+
+    def records() -> Iterator[dict[str, t.Any]]:
+        yield {"ucn": "U+3400", "char": "㐀", "kDefinition": "hill"}
+        msg = "parse failed"
+        raise ValueError(msg)
+
+    destination = tmp_path / "unihan.sqlite"
+    with pytest.raises(ValueError, match="parse failed"):
+        export_sqlite(records(), destination, ["ucn", "char", "kDefinition"])
+
+    assert list(tmp_path.iterdir()) == []
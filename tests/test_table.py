@@ -0,0 +1,108 @@
+"""Tests for the columnar UnihanTable."""
+
+from __future__ import annotations
+
+import dataclasses
+import typing as t
+
+import pytest
+
+from unihan_etl.core import Packager
+from unihan_etl.table import UnihanTable
+
+if t.TYPE_CHECKING:
+    from unihan_etl.options import Options
+
+
+@pytest.fixture
+def quick_records(unihan_quick_options: Options) -> list[dict[str, t.Any]]:
+    """Return the quick dataset as exported with ``format="python"``."""
+    packager = Packager(dataclasses.replace(unihan_quick_options, format="python"))
+    packager.download()
+    data = packager.export()
+    assert data is not None
+    return [dict(r) for r in data]
+
+
+@pytest.fixture
+def quick_table(unihan_quick_options: Options) -> UnihanTable:
+    """Return the quick dataset as a table."""
+    packager = Packager(unihan_quick_options)
+    packager.download()
+    return packager.export_table()
+
+
+def test_table_rows_match_export(
+    quick_table: UnihanTable,
+    quick_records: list[dict[str, t.Any]],
+) -> None:
+    """Iterated, fetched and looked up rows equal the exported records."""
+    assert len(quick_table) == len(quick_records)
+    assert [list(r.items()) for r in quick_table] == [
+        list(r.items()) for r in quick_records
+    ]
+    for row, record in enumerate(quick_records):
+        assert quick_table.row(row) == record
+        assert quick_table.get(record["char"]) == record
+    assert quick_table.row(-1) == quick_records[-1]
+    assert quick_table.get("A") is None
+    assert "A" not in quick_table
+    assert quick_records[0]["char"] in quick_table
+
+
+class ColumnSliceCase(t.NamedTuple):
+    """Case for :func:`test_table_column_slice`."""
+
+    test_id: str
+    field: str
+    start: int
+    stop: int | None
+
+
+COLUMN_SLICE_CASES: list[ColumnSliceCase] = [
+    ColumnSliceCase(test_id="whole_column", field="kTotalStrokes", start=0, stop=None),
+    ColumnSliceCase(test_id="middle_slice", field="kDefinition", start=100, stop=300),
+    ColumnSliceCase(test_id="tail_slice", field="kCantonese", start=-50, stop=None),
+    ColumnSliceCase(test_id="char_column", field="char", start=10, stop=20),
+    ColumnSliceCase(test_id="ucn_column", field="ucn", start=0, stop=5),
+]
+
+
+@pytest.mark.parametrize(
+    ColumnSliceCase._fields,
+    COLUMN_SLICE_CASES,
+    ids=[c.test_id for c in COLUMN_SLICE_CASES],
+)
+def test_table_column_slice(
+    test_id: str,
+    field: str,
+    start: int,
+    stop: int | None,
+    quick_table: UnihanTable,
+    quick_records: list[dict[str, t.Any]],
+) -> None:
+    """A column slice holds the rows' values, None where a row has none."""
+    expected = [r.get(field) for r in quick_records[start:stop]]
+    assert quick_table.column(field, start, stop) == expected
+
+
+def test_table_items_skip_missing(
+    quick_table: UnihanTable,
+    quick_records: list[dict[str, t.Any]],
+) -> None:
+    """items() yields only the characters with a value for the field."""
+    assert list(quick_table.items("kCantonese")) == [
+        (r["char"], r["kCantonese"]) for r in quick_records if "kCantonese" in r
+    ]
+    with pytest.raises(KeyError):
+        quick_table.column("kNotAField")
+
+
+def test_table_rejects_unsorted_records() -> None:
+    """Records out of codepoint order raise instead of breaking lookups."""
+    records = [
+        {"ucn": "U+3401", "char": "㐁"},
+        {"ucn": "U+3400", "char": "㐀"},
+    ]
+    with pytest.raises(ValueError, match="not in codepoint order at U\\+3400"):
+        UnihanTable.from_records(records, fields=["ucn", "char"])
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import dataclasses
+import json
 import logging
 import pathlib
 import shutil
@@ -11,27 +12,34 @@ from http.client import HTTPMessage
 
 import pytest
 
-from unihan_etl import constants, core
+from unihan_etl import constants, core, expansion
 from unihan_etl.__about__ import __version__
 from unihan_etl.constants import UNIHAN_ZIP_PATH
 from unihan_etl.core import (
     DEFAULT_OPTIONS,
+    BlockNotFound,
     FieldNotFound,
     FileNotSupported,
+    InvalidWorkers,
     Packager,
     zip_has_files,
 )
 from unihan_etl.options import Options
 from unihan_etl.pytest_plugin import QUICK_FIXTURE_PATH
 from unihan_etl.test import assert_dict_contains_subset
-from unihan_etl.util import get_fields
+from unihan_etl.util import get_fields, json_default
 
 if t.TYPE_CHECKING:
     import zipfile
     from collections.abc import Callable
     from urllib.request import _DataType
 
-    from unihan_etl.types import ColumnData, StrPath, UntypedNormalizedData
+    from unihan_etl.types import (
+        ColumnData,
+        StrPath,
+        UnihanFormats,
+        UntypedNormalizedData,
+    )
 
 
 log = logging.getLogger(__name__)
@@ -97,6 +105,314 @@ def test_get_files() -> None:
     result = core.get_files(fields)
 
     assert set(result) == set(expected)
+    assert result == [f for f in constants.UNIHAN_FILES if f in expected]
+
+
+class PlanProjectionCase(t.NamedTuple):
+    """Case for :func:`test_plan_projection`."""
+
+    test_id: str
+    fields: list[str]
+    files: list[str]
+    expected_files: tuple[str, ...]
+
+
+PLAN_PROJECTION_CASES: list[PlanProjectionCase] = [
+    PlanProjectionCase(
+        test_id="one_field",
+        fields=["ucn", "char", "kDefinition"],
+        files=constants.UNIHAN_FILES,
+        expected_files=("Unihan_Readings.txt",),
+    ),
+    PlanProjectionCase(
+        test_id="fields_across_files",
+        fields=["kZVariant", "kIRG_GSource"],
+        files=["Unihan_Variants.txt", "Unihan_Readings.txt", "Unihan_IRGSources.txt"],
+        expected_files=("Unihan_Variants.txt", "Unihan_IRGSources.txt"),
+    ),
+    PlanProjectionCase(
+        test_id="unknown_file_kept",
+        fields=["kDefinition"],
+        files=["Unihan_Variants.txt", "Unihan_Extra.txt"],
+        expected_files=("Unihan_Extra.txt",),
+    ),
+    PlanProjectionCase(
+        test_id="index_fields_only",
+        fields=["ucn", "char"],
+        files=constants.UNIHAN_FILES,
+        expected_files=(),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(PlanProjectionCase._fields),
+    PLAN_PROJECTION_CASES,
+    ids=[case.test_id for case in PLAN_PROJECTION_CASES],
+)
+def test_plan_projection(
+    test_id: str,
+    fields: list[str],
+    files: list[str],
+    expected_files: tuple[str, ...],
+) -> None:
+    """Only the files holding a requested field are planned to be read."""
+    plan = core.plan_projection(fields, files)
+
+    assert plan.files == expected_files
+    assert plan.fields == tuple(fields)
+    assert plan.wanted == set(fields) - set(constants.INDEX_FIELDS)
+    for field in plan.wanted:
+        assert constants.UNIHAN_FIELD_FILES[field] in constants.UNIHAN_FILES
+
+
+def test_iter_records_reads_planned_files(
+    unihan_quick_options: Options,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Input files without a requested field are never opened."""
+    opened: list[str] = []
+    iter_file_lines = core._iter_file_lines
+
+    def spy(path: pathlib.Path | str) -> t.Iterator[str]:
+        opened.append(pathlib.Path(path).name)
+        return iter_file_lines(path)
+
+    monkeypatch.setattr(core, "_iter_file_lines", spy)
+    options = dataclasses.replace(
+        unihan_quick_options,
+        fields=["kDefinition"],
+        input_files=["Unihan_Readings.txt", "Unihan_Variants.txt"],
+        format="python",
+    )
+    packager = Packager(options)
+    packager.download()
+    records = list(packager.iter_records())
+
+    assert opened == ["Unihan_Readings.txt"]
+    assert records
+    assert all(set(record) <= {"ucn", "char", "kDefinition"} for record in records)
+
+
+def _in_uro(raw: dict[str, t.Any]) -> bool:
+    return 0x4E00 <= ord(raw["char"]) <= 0x9FFF
+
+
+class RowPredicateCase(t.NamedTuple):
+    """Case for :func:`test_iter_records_row_predicates`."""
+
+    test_id: str
+    options: dict[str, t.Any]
+    predicate: t.Callable[[dict[str, t.Any]], bool]
+
+
+ROW_PREDICATE_CASES: list[RowPredicateCase] = [
+    RowPredicateCase(
+        test_id="block",
+        options={"blocks": ["uro"]},
+        predicate=_in_uro,
+    ),
+    RowPredicateCase(
+        test_id="codepoint_ranges",
+        options={"codepoint_ranges": [(0x4E00, 0x4E2F), (0x3400, 0x340F)]},
+        predicate=lambda raw: (
+            0x4E00 <= ord(raw["char"]) <= 0x4E2F or 0x3400 <= ord(raw["char"]) <= 0x340F
+        ),
+    ),
+    RowPredicateCase(
+        test_id="where_field_present",
+        options={"where": [("kIICore", None)]},
+        predicate=lambda raw: "kIICore" in raw,
+    ),
+    RowPredicateCase(
+        test_id="where_value_item",
+        options={"where": [("kMandarin", "bì")]},
+        predicate=lambda raw: "bì" in raw.get("kMandarin", "").split(" "),
+    ),
+    RowPredicateCase(
+        test_id="where_and_block_parallel",
+        options={"where": [("kIICore", None)], "blocks": ["uro"], "workers": 2},
+        predicate=lambda raw: "kIICore" in raw and _in_uro(raw),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(RowPredicateCase._fields),
+    ROW_PREDICATE_CASES,
+    ids=[case.test_id for case in ROW_PREDICATE_CASES],
+)
+def test_iter_records_row_predicates(
+    unihan_quick_options: Options,
+    test_id: str,
+    options: dict[str, t.Any],
+    predicate: t.Callable[[dict[str, t.Any]], bool],
+) -> None:
+    """Rows are filtered before expansion, matching an unfiltered export's."""
+    fields = ["kDefinition", "kMandarin", "kSemanticVariant"]
+    packager = Packager(
+        dataclasses.replace(unihan_quick_options, fields=fields, format="python"),
+    )
+    packager.download()
+    unfiltered = {record["char"]: record for record in packager.iter_records()}
+    work_dir = pathlib.Path(unihan_quick_options.work_dir)
+    raw = core.stream_normalize(
+        core.load_data_streams([work_dir / f for f in constants.UNIHAN_FILES]),
+        ["ucn", "char", *constants.UNIHAN_FIELDS],
+        sparse=True,
+    )
+    expected = [
+        unfiltered[record["char"]]
+        for record in raw
+        if predicate(record) and record["char"] in unfiltered
+    ]
+
+    filtered = dataclasses.replace(
+        unihan_quick_options,
+        fields=fields,
+        format="python",
+        **options,
+    )
+    records = list(Packager(filtered).iter_records())
+
+    assert expected
+    assert records == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_packager_memoize_expansion(
+    unihan_quick_options: Options,
+    workers: int,
+) -> None:
+    """Memoized exports hold the same values, frozen and shared."""
+    options = dataclasses.replace(unihan_quick_options, format="python")
+    packager = Packager(options)
+    packager.download()
+    expected = packager.export()
+    memoized = Packager(
+        dataclasses.replace(options, memoize_expansion=True, workers=workers),
+    )
+    records = memoized.export()
+
+    assert records is not None and expected is not None
+    assert json.dumps(records, default=json_default) == json.dumps(
+        expected,
+        default=json_default,
+    )
+    strokes = [r["kTotalStrokes"] for r in records if r.get("kTotalStrokes")]
+    assert len({id(value) for value in strokes}) < len(strokes)
+    assert memoized.expansion_memo is not None
+    assert memoized.expansion_memo.stats()["kTotalStrokes"].hits > 0
+
+
+def test_export_yaml_memoized(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """YAML exports dump memoized values, frozen or enums, as plain YAML."""
+    import yaml
+
+    options = dataclasses.replace(
+        unihan_quick_options,
+        fields=["kMandarin", "kTotalStrokes"],
+        destination=tmp_path / "unihan.{ext}",
+        format="yaml",
+        memoize_expansion=True,
+    )
+    packager = Packager(options)
+    packager.download()
+    packager.export()
+    expected = Packager(dataclasses.replace(options, format="python")).export()
+
+    with (tmp_path / "unihan.yaml").open(encoding="utf-8") as f:
+        assert yaml.safe_load(f) == expected
+
+    rs_unicode = expansion.freeze(
+        expansion.expand_field("kRSUnicode", "210'.0 67.2"),
+    )
+    core.export_yaml(
+        [{"ucn": "U+9F50", "char": "齐", "kRSUnicode": rs_unicode}],
+        tmp_path / "enums.yaml",
+    )
+    with (tmp_path / "enums.yaml").open(encoding="utf-8") as f:
+        assert yaml.safe_load(f)[0]["kRSUnicode"] == [
+            {"radical": 210, "strokes": 0, "simplified": "Chinese"},
+            {"radical": 67, "strokes": 2, "simplified": False},
+        ]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"memoize_expansion": True}, {"intern_values": True}],
+    ids=["plain", "memoized", "interned"],
+)
+def test_packager_lazy_expansion(
+    unihan_quick_options: Options,
+    options: dict[str, t.Any],
+) -> None:
+    """Lazy exports expand fields on access, to the values of eager ones."""
+    eager = dataclasses.replace(unihan_quick_options, format="python")
+    packager = Packager(eager)
+    packager.download()
+    expected = packager.export()
+    records = Packager(
+        dataclasses.replace(eager, lazy_expansion=True, **options),
+    ).export()
+
+    assert records is not None and expected is not None
+    lazy = [r for r in records if isinstance(r, expansion.LazyRecord)]
+    assert len(lazy) == len(records)
+    assert any(record.pending for record in lazy)
+    assert json.dumps(records, default=json_default) == json.dumps(
+        expected,
+        default=json_default,
+    )
+    assert not any(record.pending for record in lazy)
+
+
+def test_parse_lines_stops_past_last_range() -> None:
+    """Lines past the last codepoint range are never read."""
+    lines = iter(
+        [
+            "U+3400\tkDefinition\tone\n",
+            "U+4E00\tkDefinition\ttwo\n",
+            "U+4E01\tkDefinition\tthree\n",
+            "U+9FA5\tkDefinition\tfour\n",
+        ],
+    )
+    parsed = core._parse_lines(lines, frozenset(["kDefinition"]), [(0x4E00, 0x4E00)])
+
+    assert [value for *_, value in parsed] == ["two"]
+    assert next(lines) == "U+9FA5\tkDefinition\tfour\n"
+
+
+def test_where_fields_pick_files() -> None:
+    """Files holding condition fields are read, even if not exported."""
+    options = Options(fields=["kDefinition"], where=[("kIICore", None)])
+
+    assert Packager(options).options.input_files == [
+        "Unihan_IRGSources.txt",
+        "Unihan_Readings.txt",
+    ]
+
+
+def test_raise_error_unknown_where_field_or_block() -> None:
+    """Conditions on unknown fields and unknown blocks are rejected."""
+    with pytest.raises(FieldNotFound):
+        Packager(Options(where=[("kNope", None)]))
+    with pytest.raises(FieldNotFound):
+        Packager(
+            Options(input_files=["Unihan_Readings.txt"], where=[("kIICore", None)]),
+        )
+    with pytest.raises(BlockNotFound):
+        Packager(Options(blocks=["ext-z"]))
+
+
+@pytest.mark.parametrize("workers", [-1, -8])
+def test_raise_error_negative_workers(workers: int) -> None:
+    """A negative number of workers is rejected before anything is parsed."""
+    with pytest.raises(InvalidWorkers, match=str(workers)):
+        Packager(Options(workers=workers))
 
 
 def test_download(
@@ -428,6 +744,23 @@ def test_cli_plus_defaults(unihan_mock_zip_path: pathlib.Path) -> None:
         msg="format argument works",
     )
 
+    pkgr = Packager.from_cli(
+        [
+            *("--where", "kMandarin=hǎo", "--where", "kIICore"),
+            *("--block", "uro", "--codepoint-range", "U+3400-U+4DBF"),
+        ],
+    )
+    option_subset_predicates = {
+        "where": [("kMandarin", "hǎo"), ("kIICore", None)],
+        "blocks": ["uro"],
+        "codepoint_ranges": [(0x3400, 0x4DBF)],
+    }
+    assert_dict_contains_subset(
+        option_subset_predicates,
+        dataclasses.asdict(pkgr.options),
+        msg="row predicates parse to conditions and ranges",
+    )
+
 
 def test_cli_exit_emessage_to_stderr() -> None:
     """Sends exception .message to stderr on exit."""
@@ -597,3 +930,340 @@ def test_download_returns_usable_path(
     assert core.has_valid_zip(result)
     extracted = core.extract_zip(result, tmp_path / "work")
     assert "Unihan_Readings.txt" in extracted.namelist()
+
+
+def test_stream_normalize_matches_normalize(
+    unihan_quick_columns: ColumnData,
+    unihan_quick_fixture_files: list[pathlib.Path],
+) -> None:
+    """stream_normalize yields normalize's records, one at a time, sorted."""
+    normalized = core.normalize(
+        core.load_data(files=unihan_quick_fixture_files),
+        unihan_quick_columns,
+    )
+    streamed = core.stream_normalize(
+        core.load_data_streams(files=unihan_quick_fixture_files),
+        unihan_quick_columns,
+    )
+
+    assert not isinstance(streamed, list)
+    streamed_data = list(streamed)
+    assert streamed_data == sorted(normalized, key=lambda r: ord(r["char"]))
+    assert [list(r) for r in streamed_data] == [list(r) for r in normalized]
+
+
+def test_stream_normalize_merges_files_by_codepoint() -> None:
+    """Lines for one character spread over several files merge into one record."""
+    readings = [
+        "# Unihan_Readings.txt\n",
+        "U+3400\tkCantonese\tjau1\n",
+        "U+3401\tkCantonese\ttim2\n",
+        "\n",
+    ]
+    variants = ["U+3400\tkZVariant\tU+4E18\n", "U+3402\tkZVariant\tU+4E19\n"]
+    fields = ("ucn", "char", "kCantonese", "kZVariant")
+
+    records = list(core.stream_normalize([readings, variants], fields))
+
+    assert records == [
+        {"ucn": "U+3400", "char": "㐀", "kCantonese": "jau1", "kZVariant": "U+4E18"},
+        {"ucn": "U+3401", "char": "㐁", "kCantonese": "tim2", "kZVariant": None},
+        {"ucn": "U+3402", "char": "㐂", "kCantonese": None, "kZVariant": "U+4E19"},
+    ]
+
+
+def test_stream_normalize_rejects_unsorted_file() -> None:
+    """A file out of codepoint order raises rather than splitting a record."""
+    lines = ["U+3401\tkCantonese\ttim2\n", "U+3400\tkCantonese\tjau1\n"]
+
+    with pytest.raises(ValueError, match="not sorted by codepoint at U\\+3400"):
+        list(core.stream_normalize([lines], ("ucn", "char", "kCantonese")))
+
+
+class ParallelNormalizeCase(t.NamedTuple):
+    """Case for :func:`test_parallel_normalize_matches_stream_normalize`."""
+
+    test_id: str
+    from_zip: bool
+    expand: bool
+
+
+PARALLEL_NORMALIZE_CASES: list[ParallelNormalizeCase] = [
+    ParallelNormalizeCase(test_id="files", from_zip=False, expand=False),
+    ParallelNormalizeCase(test_id="files_expanded", from_zip=False, expand=True),
+    ParallelNormalizeCase(test_id="zip_expanded", from_zip=True, expand=True),
+]
+
+
+@pytest.mark.parametrize(
+    ParallelNormalizeCase._fields,
+    PARALLEL_NORMALIZE_CASES,
+    ids=[c.test_id for c in PARALLEL_NORMALIZE_CASES],
+)
+def test_parallel_normalize_matches_stream_normalize(
+    test_id: str,
+    from_zip: bool,
+    expand: bool,
+    monkeypatch: pytest.MonkeyPatch,
+    unihan_quick_columns: ColumnData,
+    unihan_quick_fixture_files: list[pathlib.Path],
+    unihan_quick_options: Options,
+) -> None:
+    """Chunks parsed in worker processes merge into stream_normalize's records."""
+    # Small chunks split every file, so lines straddle chunk boundaries.
+    monkeypatch.setattr(core, "PARALLEL_CHUNK_BYTES", 4096)
+
+    expected = list(
+        core.stream_normalize(
+            core.load_data_streams(files=unihan_quick_fixture_files),
+            unihan_quick_columns,
+        ),
+    )
+    if expand:
+        expected = [core.expand_record(record) for record in expected]
+
+    if from_zip:
+        parallel = core.parallel_normalize(
+            [f.name for f in unihan_quick_fixture_files],
+            unihan_quick_columns,
+            workers=2,
+            expand=expand,
+            zip_path=unihan_quick_options.zip_path,
+        )
+    else:
+        parallel = core.parallel_normalize(
+            unihan_quick_fixture_files,
+            unihan_quick_columns,
+            workers=2,
+            expand=expand,
+        )
+
+    assert list(parallel) == expected
+
+
+def test_packager_workers_match_serial_export(
+    unihan_quick_options: Options,
+) -> None:
+    """A packager parsing in a process pool exports the serial records."""
+    serial = Packager(dataclasses.replace(unihan_quick_options, format="python"))
+    serial.download()
+    parallel = Packager(
+        dataclasses.replace(unihan_quick_options, format="python", workers=2),
+    )
+
+    assert parallel.export() == serial.export()
+
+
+def test_stream_normalize_sparse_matches_pruned_dense(
+    unihan_quick_columns: ColumnData,
+    unihan_quick_fixture_files: list[pathlib.Path],
+) -> None:
+    """Sparse records hold the fields of dense ones that have data, in order."""
+    dense = core.stream_normalize(
+        core.load_data_streams(files=unihan_quick_fixture_files),
+        unihan_quick_columns,
+    )
+    sparse = core.stream_normalize(
+        core.load_data_streams(files=unihan_quick_fixture_files),
+        unihan_quick_columns,
+        sparse=True,
+    )
+
+    for dense_record, sparse_record in zip(dense, sparse, strict=True):
+        pruned = {k: v for k, v in dense_record.items() if v is not None}
+        assert list(sparse_record.items()) == list(pruned.items())
+
+
+def test_listify_dense_view_of_sparse_records() -> None:
+    """Listify lays sparse records out on the columns, None where missing."""
+    fields = ("ucn", "char", "kCantonese", "kZVariant")
+    records = [
+        {"ucn": "U+3400", "char": "㐀", "kZVariant": "U+4E18"},
+        {"ucn": "U+3401", "char": "㐁", "kCantonese": "tim2"},
+    ]
+
+    assert core.listify(records, fields) == [
+        list(fields),
+        ["U+3400", "㐀", None, "U+4E18"],
+        ["U+3401", "㐁", "tim2", None],
+    ]
+
+
+class StreamedExportCase(t.NamedTuple):
+    """Case for :func:`test_export_streams_records`."""
+
+    test_id: str
+    export_format: UnihanFormats
+
+
+STREAMED_EXPORT_CASES: list[StreamedExportCase] = [
+    StreamedExportCase(test_id="csv", export_format="csv"),
+    StreamedExportCase(test_id="yaml", export_format="yaml"),
+]
+
+
+@pytest.mark.parametrize(
+    StreamedExportCase._fields,
+    STREAMED_EXPORT_CASES,
+    ids=[c.test_id for c in STREAMED_EXPORT_CASES],
+)
+def test_export_streams_records(
+    test_id: str,
+    export_format: UnihanFormats,
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """CSV and YAML exports hold the same records as a python export."""
+    import csv
+
+    import yaml
+
+    options = dataclasses.replace(
+        unihan_quick_options,
+        fields=["kDefinition", "kCantonese"],
+        destination=tmp_path / "unihan.{ext}",
+        format=export_format,
+    )
+    packager = Packager(options)
+    packager.download()
+    packager.export()
+
+    python_packager = Packager(
+        dataclasses.replace(
+            options,
+            format="python",
+            expand=export_format != "csv",
+        ),
+    )
+    expected = python_packager.export()
+    assert expected
+
+    if export_format == "csv":
+        with (tmp_path / "unihan.csv").open(encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["char", "ucn", "kDefinition", "kCantonese"]
+        assert [row[1] for row in rows[1:]] == [r["ucn"] for r in expected]
+    else:
+        with (tmp_path / "unihan.yaml").open(encoding="utf-8") as f:
+            assert yaml.safe_load(f) == expected
+
+
+class ExportJSONCase(t.NamedTuple):
+    """Case for :func:`test_export_json_incremental`."""
+
+    test_id: str
+    records: list[dict[str, t.Any]]
+    compact: bool
+
+
+EXPORT_JSON_CASES: list[ExportJSONCase] = [
+    ExportJSONCase(
+        test_id="indented",
+        records=[
+            {"ucn": "U+3400", "char": "㐀", "kCantonese": ["jau1"]},
+            {"ucn": "U+3401", "char": "㐁", "kMandarin": {"zh-Hans": "tiàn"}},
+        ],
+        compact=False,
+    ),
+    ExportJSONCase(
+        test_id="compact",
+        records=[
+            {"ucn": "U+3400", "char": "㐀", "kCantonese": ["jau1"]},
+            {"ucn": "U+3401", "char": "㐁", "kMandarin": {"zh-Hans": "tiàn"}},
+        ],
+        compact=True,
+    ),
+    ExportJSONCase(test_id="empty", records=[], compact=False),
+    ExportJSONCase(test_id="empty_compact", records=[], compact=True),
+]
+
+
+@pytest.mark.parametrize(
+    ExportJSONCase._fields,
+    EXPORT_JSON_CASES,
+    ids=[c.test_id for c in EXPORT_JSON_CASES],
+)
+def test_export_json_incremental(
+    test_id: str,
+    records: list[dict[str, t.Any]],
+    compact: bool,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Records written one by one form the document json.dump would write."""
+    import json
+
+    destination = tmp_path / "unihan.json"
+    core.export_json((r for r in records), destination, compact=compact)
+
+    if compact:
+        expected = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    else:
+        expected = json.dumps(records, ensure_ascii=False, indent=2)
+    assert destination.read_text(encoding="utf-8") == expected
+
+
+def test_export_json_encodes_enums(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """An export of every field, kRSUnicode's enums included, loads back."""
+    import json
+
+    options = dataclasses.replace(
+        unihan_quick_options,
+        destination=tmp_path / "unihan.{ext}",
+        format="json",
+    )
+    packager = Packager(options)
+    packager.download()
+    packager.export()
+
+    with (tmp_path / "unihan.json").open(encoding="utf-8") as f:
+        data = json.load(f)
+    expected = Packager(dataclasses.replace(options, format="python")).export()
+    assert expected is not None
+    assert len(data) == len(expected)
+    assert data[0] == json.loads(json.dumps(expected[0], default=json_default))
+
+
+def test_export_ndjson_one_record_per_line(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+) -> None:
+    """An NDJSON export holds one JSON record per line, as exported to python."""
+    import json
+
+    options = dataclasses.replace(
+        unihan_quick_options,
+        destination=tmp_path / "unihan.{ext}",
+        format="ndjson",
+    )
+    packager = Packager(options)
+    packager.download()
+    packager.export()
+
+    lines = (tmp_path / "unihan.ndjson").read_text(encoding="utf-8").splitlines()
+    expected = Packager(dataclasses.replace(options, format="python")).export()
+    assert expected is not None
+    assert [json.loads(line) for line in lines] == [
+        json.loads(json.dumps(record, default=json_default)) for record in expected
+    ]
+
+
+def test_export_ndjson_compact(tmp_path: pathlib.Path) -> None:
+    """Compact NDJSON drops the spaces after separators."""
+    records: list[dict[str, t.Any]] = [
+        {"char": "㐀", "kCantonese": ["jau1"]},
+        {"char": "㐁"},
+    ]
+    destination = tmp_path / "unihan.ndjson"
+
+    core.export_ndjson(iter(records), destination, compact=True)
+    assert destination.read_text(encoding="utf-8") == (
+        '{"char":"㐀","kCantonese":["jau1"]}\n{"char":"㐁"}\n'
+    )
+
+    core.export_ndjson(iter(records), destination)
+    assert destination.read_text(encoding="utf-8") == (
+        '{"char": "㐀", "kCantonese": ["jau1"]}\n{"char": "㐁"}\n'
+    )
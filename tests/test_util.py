@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from unihan_etl.util import ucn_to_unicode, ucnstring_to_unicode
+import typing as t
+
+import pytest
+
+from unihan_etl.util import split_pinyin_tone, ucn_to_unicode, ucnstring_to_unicode
 
 
 def test_conversion_ucn_to_unicode() -> None:
@@ -32,3 +36,46 @@ def test_conversion_ucn_to_unicode() -> None:
 
     assert result == expected
     assert isinstance(result, str)
+
+
+class SplitPinyinToneCase(t.NamedTuple):
+    """Case for :func:`test_split_pinyin_tone`."""
+
+    test_id: str
+    syllable: str
+    expected: tuple[str, int | None]
+
+
+SPLIT_PINYIN_TONE_CASES: list[SplitPinyinToneCase] = [
+    SplitPinyinToneCase("tone_mark", "hǎo", ("hao", 3)),
+    SplitPinyinToneCase("tone_number", "hao3", ("hao", 3)),
+    SplitPinyinToneCase("toneless", "hao", ("hao", None)),
+    SplitPinyinToneCase("neutral_zero", "ma0", ("ma", 5)),
+    SplitPinyinToneCase("neutral_five", "ma5", ("ma", 5)),
+    SplitPinyinToneCase("u_umlaut_mark", "lǘ", ("lü", 2)),
+    SplitPinyinToneCase("u_umlaut_v", "nv3", ("nü", 3)),
+    SplitPinyinToneCase("u_umlaut_colon", "lu:4", ("lü", 4)),
+    SplitPinyinToneCase("syllabic_n", "ň", ("n", 3)),
+    SplitPinyinToneCase("uppercase_whitespace", " Xià ", ("xia", 4)),
+]
+
+
+@pytest.mark.parametrize(
+    list(SplitPinyinToneCase._fields),
+    SPLIT_PINYIN_TONE_CASES,
+    ids=[case.test_id for case in SPLIT_PINYIN_TONE_CASES],
+)
+def test_split_pinyin_tone(
+    test_id: str,
+    syllable: str,
+    expected: tuple[str, int | None],
+) -> None:
+    """Tone marks and numbers split off into the same forms."""
+    assert split_pinyin_tone(syllable) == expected
+
+
+@pytest.mark.parametrize("syllable", ["", "3", "hao7"])
+def test_split_pinyin_tone_invalid(syllable: str) -> None:
+    """Empty syllables and tones past 5 raise ValueError."""
+    with pytest.raises(ValueError):
+        split_pinyin_tone(syllable)
@@ -0,0 +1,196 @@
+"""Tests for the variant graph."""
+
+from __future__ import annotations
+
+import dataclasses
+import pathlib
+import typing as t
+
+import pytest
+
+from unihan_etl import variants
+from unihan_etl.core import Packager, zip_fingerprint
+from unihan_etl.variants import (
+    VARIANT_FIELDS,
+    VariantEdge,
+    VariantGraph,
+    get_variants_path,
+    parse_variant,
+)
+
+if t.TYPE_CHECKING:
+    from unihan_etl.options import Options
+
+
+@pytest.fixture
+def quick_graph(quick_packager: Packager) -> VariantGraph:
+    """Return the variant graph of the quick dataset."""
+    return quick_packager.export_variants()
+
+
+def _closure(graph: VariantGraph, char: str, field: str | None) -> list[str]:
+    """Return the variants of ``char`` by walking the edges both ways."""
+    neighbors: dict[str, set[str]] = {}
+    for edge in graph:
+        if field is None or edge.field == field:
+            neighbors.setdefault(edge.char, set()).add(edge.variant)
+            neighbors.setdefault(edge.variant, set()).add(edge.char)
+    seen = {char}
+    stack = [char]
+    while stack:
+        for variant in neighbors.get(stack.pop(), ()):
+            if variant not in seen:
+                seen.add(variant)
+                stack.append(variant)
+    return sorted(seen - {char})
+
+
+class ParseVariantCase(t.NamedTuple):
+    """Case for :func:`test_parse_variant`."""
+
+    test_id: str
+    value: str
+    expected: tuple[str, tuple[str, ...]]
+
+
+PARSE_VARIANT_CASES: list[ParseVariantCase] = [
+    ParseVariantCase("bare", "U+4E18", ("丘", ())),
+    ParseVariantCase("one_source", "U+4E94<kMatthews", ("五", ("kMatthews",))),
+    ParseVariantCase(
+        "sources",
+        "U+8AAA<kMatthews,kMeyerWempe",
+        ("說", ("kMatthews", "kMeyerWempe")),
+    ),
+    ParseVariantCase("source_detail", "U+4E07<kFenn:T", ("万", ("kFenn:T",))),
+    ParseVariantCase("wide", "U+20B74", ("\U00020b74", ())),
+]
+
+
+@pytest.mark.parametrize(
+    list(ParseVariantCase._fields),
+    PARSE_VARIANT_CASES,
+    ids=[case.test_id for case in PARSE_VARIANT_CASES],
+)
+def test_parse_variant(
+    test_id: str,
+    value: str,
+    expected: tuple[str, tuple[str, ...]],
+) -> None:
+    """Variant values split into the variant and its sources."""
+    assert parse_variant(value) == expected
+
+
+def test_export_variants_edges(
+    quick_graph: VariantGraph,
+    unihan_quick_options: Options,
+) -> None:
+    """Every value of every variant field becomes an edge."""
+    packager = Packager(unihan_quick_options)
+    expected = []
+    for record in packager.iter_records():
+        for field in VARIANT_FIELDS:
+            values = record.get(field) or []
+            if isinstance(values, str):
+                values = values.split(" ")
+            for value in values:
+                variant, sources = parse_variant(value)
+                expected.append(VariantEdge(record["char"], variant, field, sources))
+
+    assert list(quick_graph) == expected
+    assert {edge.field for edge in quick_graph} <= set(VARIANT_FIELDS)
+    assert any(edge.sources for edge in quick_graph)
+
+
+@pytest.mark.parametrize("field", [None, *VARIANT_FIELDS])
+def test_variants_are_transitive_closure(
+    quick_graph: VariantGraph,
+    field: str | None,
+) -> None:
+    """Variants of a character are all characters reachable through edges."""
+    chars = {edge.char for edge in quick_graph} | {e.variant for e in quick_graph}
+    for char in sorted(chars):
+        expected = _closure(quick_graph, char, field)
+        assert quick_graph.variants(char, field=field) == expected
+        for variant in expected:
+            assert char in quick_graph.variants(variant, field=field)
+
+    components = quick_graph.components(field)
+    members = [char for component in components for char in component]
+    assert len(members) == len(set(members))
+    assert all(list(component) == sorted(component) for component in components)
+
+
+def test_variants_without_relations(quick_graph: VariantGraph) -> None:
+    """Characters or fields without relations have no variants."""
+    assert quick_graph.variants("A") == []
+    assert "A" not in quick_graph
+    assert quick_graph.variants("丘", field="kDefinition") == []
+    assert quick_graph.components("kDefinition") == []
+    assert quick_graph.edges("A") == []
+
+
+def test_variant_graph_dump_load(
+    quick_graph: VariantGraph,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A dumped graph loads back with the same edges and components."""
+    path = tmp_path / "variants.json"
+    quick_graph.dump(path)
+
+    def fail_components(edges: t.Any) -> t.NoReturn:
+        msg = "components should have been loaded"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(variants, "_components", fail_components)
+    loaded = VariantGraph.load(path)
+
+    assert list(loaded) == list(quick_graph)
+    assert len(loaded) == len(quick_graph)
+    assert loaded.components() == quick_graph.components()
+    for field in VARIANT_FIELDS:
+        assert loaded.components(field) == quick_graph.components(field)
+
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError, match="Not a variant graph"):
+        VariantGraph.load(path)
+
+
+def test_export_variants_kept_next_to_zip(
+    quick_packager: Packager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The graph is saved next to the zip and loaded back by later exports."""
+    zip_path = pathlib.Path(quick_packager.options.zip_path)
+    options = dataclasses.replace(quick_packager.options, blocks=["ext-a"])
+    graph = Packager(options).export_variants()
+    variants_path = get_variants_path(zip_path, zip_fingerprint(zip_path))
+    assert variants_path.exists()
+
+    def fail_iter_records(self: Packager) -> t.NoReturn:
+        msg = "graph should have been loaded"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(Packager, "iter_records", fail_iter_records)
+    loaded = Packager(options).export_variants()
+    assert list(loaded) == list(graph)
+    assert loaded.components() == graph.components()
+    # Filters don't narrow the graph, which serves every export of the zip
+    assert any(ord(edge.char) >= 0x4E00 for edge in loaded)
+
+
+def test_export_variants_downloads(
+    tmp_path: pathlib.Path,
+    unihan_quick_options: Options,
+    quick_graph: VariantGraph,
+) -> None:
+    """The zip is downloaded first, if missing."""
+    options = dataclasses.replace(
+        unihan_quick_options,
+        source=unihan_quick_options.zip_path,
+        zip_path=tmp_path / "fresh" / "Unihan.zip",
+        work_dir=tmp_path / "fresh" / "work",
+    )
+    graph = Packager(options).export_variants()
+    assert list(graph) == list(quick_graph)
+    assert (tmp_path / "fresh" / "Unihan.zip").exists()